@@ -1,16 +1,15 @@
+from core import startup_timing
 import gradio as gr
 import time
-import os
-import sys
-import importlib
 from core.config import (
     SERVER_PORT, ENABLE_LOGIN, LOGIN_CREDENTIALS, SHARE_GRADIO, 
-    COMFYUI_OUTPUT_PATH, AUTO_DOWNLOAD_MODELS, GRADIO_SERVER_NAME
+    COMFYUI_OUTPUT_PATH, AUTO_DOWNLOAD_MODELS, GRADIO_SERVER_NAME, ENABLE_REST_API, ENABLE_METRICS, LAZY_TAB_LOADING,
+    FRONTEND_WORKERS, FRONTEND_WORKER_ID
 )
 from core.ui_loader import discover_ui_modules, load_ui_layout, load_ui_list
 from core.ui_builder import build_gradio_ui
 
-from core import job_manager, node_info_manager, backend_manager
+from core import job_manager, node_info_manager, backend_manager, module_manifest
 
 
 js_shortcut_code = """
@@ -35,43 +34,53 @@ function() {
 }
 """
 
-def discover_and_register_mcp_modules(app: gr.Blocks):
+def discover_and_register_mcp_modules(app: gr.Blocks, manifest, module_files):
     print("="*50)
     print("Discovering and registering MCP modules...")
-    
-    if 'custom' not in sys.path:
-        sys.path.insert(0, 'custom')
 
-    ui_dirs_to_scan = ["module", "custom/module"]
-    for ui_dir in ui_dirs_to_scan:
-        if not os.path.isdir(ui_dir):
+    for module_name, path in module_files[module_manifest.MCP_SUFFIX]:
+        entry = manifest.get(module_name)
+        if entry is not None:
+            for spec in entry["functions"]:
+                gr.api(
+                    module_manifest.make_lazy_mcp_function(module_name, spec),
+                    concurrency_limit=spec.get("concurrency_limit", "default"),
+                )
+                print(f"  ✅ Registered MCP tool: '{spec['name']}' from {module_name} (import deferred)")
             continue
-        for root, _, files in os.walk(ui_dir):
-            for filename in files:
-                if filename.endswith("_mcp.py"):
-                    module_path_parts = os.path.normpath(os.path.join(root, filename[:-3])).split(os.sep)
-                    module_name = ".".join(module_path_parts)
-                    try:
-                        module = importlib.import_module(module_name)
-                        if hasattr(module, 'MCP_FUNCTIONS') and isinstance(module.MCP_FUNCTIONS, list):
-                            for func in module.MCP_FUNCTIONS:
-                                gr.api(func)
-                                print(f"  ✅ Registered MCP tool: '{func.__name__}' from {module_name}")
-                        else:
-                            print(f"  ⚠️  Skipping MCP module (no MCP_FUNCTIONS list): {module_name}")
-                    except Exception as e:
-                        import traceback
-                        traceback.print_exc()
-                        print(f"  ❌ Error loading MCP module {module_name}: {e}")
+        try:
+            module, imported_paths = module_manifest.import_module_recorded(module_name)
+            if hasattr(module, 'MCP_FUNCTIONS') and isinstance(module.MCP_FUNCTIONS, list):
+                # Gradio queues MCP calls too; demo.queue() allows one call per function unless a module says otherwise.
+                limits = getattr(module, 'MCP_CONCURRENCY_LIMITS', {})
+                for func in module.MCP_FUNCTIONS:
+                    gr.api(func, concurrency_limit=limits.get(func.__name__, "default"))
+                    print(f"  ✅ Registered MCP tool: '{func.__name__}' from {module_name}")
+                specs = [module_manifest.describe_mcp_function(func) for func in module.MCP_FUNCTIONS]
+                for spec in filter(None, specs):
+                    if spec["name"] in limits:
+                        spec["concurrency_limit"] = limits[spec["name"]]
+                if all(specs):
+                    imported_paths += [func.__code__.co_filename for func in module.MCP_FUNCTIONS]
+                    manifest.put(module_name, module_manifest.dependency_paths(path, imported_paths), functions=specs)
+            else:
+                print(f"  ⚠️  Skipping MCP module (no MCP_FUNCTIONS list): {module_name}")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            print(f"  ❌ Error loading MCP module {module_name}: {e}")
+    manifest.save()
     print("MCP module registration finished.")
     print("="*50)
 
 def main():
+    startup_timing.mark("imports")
     print("="*50)
     print("Initializing Backend Manager...")
     _ = backend_manager.backend_manager
     print("Backend Manager initialized.")
     print("="*50)
+    startup_timing.mark("backend manager")
 
     MAX_RETRIES = 18
     RETRY_DELAY = 10
@@ -99,51 +108,59 @@ def main():
 
     if not node_info_initialized:
         return
+    startup_timing.mark("node info")
 
-    if AUTO_DOWNLOAD_MODELS:
-        try:
-            print("="*50)
-            print("Starting model check and download process...")
-            from core.model_downloader import check_and_download_models
-            check_and_download_models()
-            print("Model check and download process finished.")
-            print("="*50)
-        except Exception as e:
-            print(f"An error occurred during the model download process: {e}")
-            print("Continuing with application startup...")
+    if FRONTEND_WORKER_ID:
+        # Every worker shares the model directories; the worker router checked them once before starting us.
+        print("Model check and download were run by the worker router.")
+    elif AUTO_DOWNLOAD_MODELS:
+        from core.model_downloader import run_startup_model_check
+        run_startup_model_check()
     else:
         print("="*50)
         print("Skipping automatic model check and download as per config.")
         print("="*50)
+    startup_timing.mark("model download")
 
+    manifest = module_manifest.Manifest()
+    module_files = module_manifest.find_module_files()
     ui_include_list = load_ui_list()
-    ui_tree, ui_modules = discover_ui_modules(ui_include_list)
+    ui_tree, ui_modules = discover_ui_modules(ui_include_list, manifest, module_files)
     layout_config = load_ui_layout()
+    startup_timing.mark("ui discovery")
     
     with gr.Blocks(js=js_shortcut_code, title="Comfy web UI") as demo:
         gr.Markdown("# Comfy web UI")
         
         all_components, module_component_map, modules_with_handlers = build_gradio_ui(
-            demo, ui_tree, ui_modules, layout_config, SHARE_GRADIO
+            demo, ui_tree, ui_modules, layout_config, SHARE_GRADIO, LAZY_TAB_LOADING
         )
+        startup_timing.mark("ui build")
 
         print("Binding custom event handlers...")
         for module in modules_with_handlers:
             try:
                 module_components = module_component_map.get(module.__name__, {})
-                module.create_event_handlers(module_components, all_components, demo)
+                with startup_timing.module_timer(module.__name__, "events"):
+                    module.create_event_handlers(module_components, all_components, demo)
                 print(f"  - Successfully bound events for: {module.__name__}")
             except Exception as e:
                 import traceback
                 traceback.print_exc()
                 print(f"  - Error binding events for {module.__name__}: {e}")
         
-        discover_and_register_mcp_modules(demo)
+        startup_timing.mark("event handlers")
+
+        discover_and_register_mcp_modules(demo, manifest, module_files)
+        startup_timing.mark("mcp registration")
     
     auth_credentials = None
     if ENABLE_LOGIN and LOGIN_CREDENTIALS:
         auth_credentials = [(cred['username'], cred['password']) for cred in LOGIN_CREDENTIALS]
 
+    if SHARE_GRADIO and FRONTEND_WORKER_ID:
+        print("Warning: share_gradio is not supported with multiple frontend workers and was ignored.")
+
     print("Launching Gradio interface...")
     demo.queue().launch(
         server_name=GRADIO_SERVER_NAME,
@@ -151,9 +168,26 @@ def main():
         mcp_server=True, 
         pwa=True,
         auth=auth_credentials,
-        share=SHARE_GRADIO,
-        allowed_paths=[COMFYUI_OUTPUT_PATH]
+        share=SHARE_GRADIO and not FRONTEND_WORKER_ID,
+        allowed_paths=[COMFYUI_OUTPUT_PATH],
+        prevent_thread_lock=True
     )
 
+    if ENABLE_REST_API:
+        from core.rest_api import create_router
+        demo.app.include_router(create_router(ui_modules, module_component_map))
+
+    if ENABLE_METRICS:
+        from core import metrics
+        demo.app.include_router(metrics.create_router())
+
+    startup_timing.mark("launch")
+    startup_timing.print_report()
+    demo.block_thread()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if FRONTEND_WORKERS > 1 and not FRONTEND_WORKER_ID:
+        from core import worker_router
+        worker_router.run()
+    else:
+        main()
\ No newline at end of file
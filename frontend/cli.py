@@ -0,0 +1,201 @@
+"""
+Headless batch runner for UI modules.
+
+    python -m cli module.image_gen.sdxl.sdxl_ui jobs.jsonl --concurrency 2 --output-dir out/
+    python -m cli module/tools/tagger/wd14_tagger/wd14_tagger_ui.py --list
+
+Every job is a dict of ui_values overrides on top of the module's component defaults.
+Jobs come from a JSONL file (one object per line) or a YAML file holding either a list of
+jobs or {"defaults": {...}, "jobs": [...]}. The optional "job_name" key names a job's outputs.
+Media inputs are given as file paths or data: URIs; ImageEditor inputs take a path or {"background": path, "mask": path}.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import yaml
+from PIL import Image
+
+from core.config import COMFYUI_OUTPUT_PATH
+from core import comfy_api, job_manager, node_info_manager, backend_manager
+from core.ingest import link_or_copy
+from core import module_inputs
+
+JOB_NAME_KEY = "job_name"
+
+_print_lock = threading.Lock()
+
+
+def _log(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+def load_module(module_ref):
+    if 'custom' not in sys.path:
+        sys.path.insert(0, 'custom')
+    if module_ref.endswith(".py"):
+        module_ref = ".".join(os.path.normpath(module_ref[:-3]).split(os.sep))
+    module = importlib.import_module(module_ref)
+    if not hasattr(module, "create_ui") or not hasattr(module, "run_generation"):
+        raise ValueError(f"'{module_ref}' is not a UI module (needs create_ui and run_generation).")
+    return module
+
+
+def load_job_specs(path):
+    if path is None:
+        return [{}]
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        data = yaml.safe_load(f)
+    if isinstance(data, dict):
+        defaults = data.get("defaults") or {}
+        return [{**defaults, **job} for job in data.get("jobs") or [{}]]
+    return data or []
+
+
+def _save_outputs(outputs, output_dir, job_name):
+    saved = []
+    for i, item in enumerate(outputs):
+        suffix = f"_{i + 1}" if len(outputs) > 1 else ""
+        if isinstance(item, str) and os.path.isfile(item):
+            target = os.path.join(output_dir, f"{job_name}{suffix}{os.path.splitext(item)[1]}")
+            link_or_copy(item, target)
+        elif isinstance(item, str):
+            target = os.path.join(output_dir, f"{job_name}{suffix}.txt")
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(item)
+        elif isinstance(item, Image.Image):
+            target = os.path.join(output_dir, f"{job_name}{suffix}.png")
+            item.save(target)
+        else:
+            continue
+        saved.append(target)
+    return saved
+
+
+def run_job(module, inputs, defaults, job, job_name, output_dir, context):
+    comfy_api.set_execution_context(context)
+    started = time.monotonic()
+    record = {"job_name": job_name, "status": job_manager.STATUS_FAILED, "message": "", "outputs": []}
+    final_files = []
+    generation = None
+    try:
+        ui_values = module_inputs.build_ui_values(inputs, defaults, job, extra_keys=(JOB_NAME_KEY,))
+        generation = module.run_generation(ui_values)
+        for updates in generation:
+            if context.is_cancelled():
+                break
+            if isinstance(updates[0], str):
+                record["message"] = updates[0]
+            current_files = job_manager.extract_result_files(updates)
+            if current_files:
+                final_files = current_files
+
+        if context.is_cancelled():
+            record["status"] = job_manager.STATUS_CANCELLED
+        elif record["message"].startswith("Error"):
+            record["status"] = job_manager.STATUS_FAILED
+        else:
+            record["outputs"] = _save_outputs(final_files, output_dir, job_name)
+            record["status"] = job_manager.STATUS_COMPLETED if record["outputs"] else job_manager.STATUS_FAILED
+            if not record["outputs"]:
+                record["message"] = record["message"] or "No outputs were produced."
+    except Exception as e:
+        record["message"] = f"Error: {e}"
+    finally:
+        if generation is not None:
+            generation.close()
+        comfy_api.set_execution_context(None)
+    record["seconds"] = round(time.monotonic() - started, 3)
+    return record
+
+
+def run_jobs(module, jobs, output_dir, concurrency=1):
+    inputs = module_inputs.build_module_inputs(module)
+    defaults = module_inputs.get_default_values(inputs)
+    prepared = []
+    for i, job in enumerate(jobs):
+        module_inputs.validate_params(inputs, job, extra_keys=(JOB_NAME_KEY,))
+        prepared.append((str(job.get(JOB_NAME_KEY) or f"job_{i + 1:04d}"), job))
+
+    os.makedirs(output_dir, exist_ok=True)
+    contexts = [comfy_api.ExecutionContext() for _ in prepared]
+    records = []
+    started = time.monotonic()
+    _log(f"[CLI] Running {len(prepared)} job(s) for {module.__name__} with concurrency {concurrency}.")
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        futures = {
+            executor.submit(run_job, module, inputs, defaults, job, job_name, output_dir, context): i
+            for i, ((job_name, job), context) in enumerate(zip(prepared, contexts))
+        }
+        for future in as_completed(futures):
+            record = future.result()
+            record["index"] = futures[future]
+            records.append(record)
+            _log(f"[CLI] {len(records)}/{len(prepared)} {record['job_name']}: {record['status']} "
+                 f"in {record['seconds']:.1f}s {record['message'] if record['status'] != job_manager.STATUS_COMPLETED else ''}".rstrip())
+    except KeyboardInterrupt:
+        _log("[CLI] Interrupted, cancelling running jobs...")
+        for context in contexts:
+            context.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.monotonic() - started
+    records.sort(key=lambda r: r.pop("index"))
+    completed = [r for r in records if r["status"] == job_manager.STATUS_COMPLETED]
+    report = {
+        "module": module.__name__,
+        "concurrency": concurrency,
+        "total_jobs": len(prepared),
+        "completed": len(completed),
+        "failed": len(records) - len(completed),
+        "wall_seconds": round(elapsed, 3),
+        "jobs_per_minute": round(len(completed) / elapsed * 60, 2) if elapsed > 0 else 0,
+        "mean_job_seconds": round(sum(r["seconds"] for r in completed) / len(completed), 3) if completed else 0,
+        "jobs": records,
+    }
+    report_path = os.path.join(output_dir, "report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    _log(f"[CLI] {report['completed']}/{report['total_jobs']} completed, {report['failed']} failed in {elapsed:.1f}s. Report: {report_path}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Run a UI module headlessly over a list of jobs.")
+    parser.add_argument("module", help="Dotted module path or file path of a *_ui.py module.")
+    parser.add_argument("jobs", nargs="?", help="JSONL or YAML job spec. Without it, one job runs with the defaults.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs in flight at once (default: 1).")
+    parser.add_argument("--output-dir", default=None, help="Where outputs and report.json are written.")
+    parser.add_argument("--list", action="store_true", help="Print the module's inputs and defaults, then exit.")
+    args = parser.parse_args(argv)
+
+    node_info_manager.fetch_and_cache_object_info()
+    module = load_module(args.module)
+
+    if args.list:
+        defaults = module_inputs.get_default_values(module_inputs.build_module_inputs(module))
+        print(json.dumps(defaults, indent=2, ensure_ascii=False, default=repr))
+        return 0
+
+    target_backend = getattr(module, "UI_INFO", {}).get("target_backend", "default")
+    backend_manager.backend_manager.switch_backend(target_backend)
+
+    output_dir = args.output_dir or os.path.join(COMFYUI_OUTPUT_PATH, "cli", time.strftime("%Y%m%d_%H%M%S"))
+    report = run_jobs(module, load_job_specs(args.jobs), output_dir, max(1, args.concurrency))
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+
+from core import node_info_manager
+from core.backend_manager import backend_manager
+from core.comfy_api import run_workflow_and_get_output, get_execution_context, set_execution_context
+
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+def get_capable_backend_urls(class_types):
+    backend_names = node_info_manager.get_backends_supporting(class_types)
+    urls = [backend_manager.backends[name] for name in backend_names if name in backend_manager.backends]
+    return urls or [backend_manager.get_active_backend_url()]
+
+
+def run_workflows_across_backends(workflow_packages, backend_urls):
+    """
+    Runs each workflow package on whichever backend is free. A part that fails is requeued for a
+    backend that has not tried it yet and only reported as failed (None) once every live backend has.
+    """
+    pending = queue.Queue()
+    for index, package in enumerate(workflow_packages):
+        pending.put((index, package, frozenset()))
+
+    events = queue.Queue()
+    parent_context = get_execution_context()
+    total = len(workflow_packages)
+    worker_urls = backend_urls[:total]
+    live_workers = set(worker_urls)
+    live_lock = threading.Lock()
+
+    def untried_backends(tried):
+        with live_lock:
+            return [url for url in live_workers if url not in tried]
+
+    def backend_worker(backend_url):
+        set_execution_context(parent_context)
+        consecutive_failures = 0
+        try:
+            while consecutive_failures < MAX_CONSECUTIVE_FAILURES and not (parent_context and parent_context.is_cancelled()):
+                try:
+                    index, package, tried = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if backend_url in tried:
+                    if untried_backends(tried):
+                        pending.put((index, package, tried))
+                        time.sleep(0.05)
+                    else:
+                        events.put(("done", index, None))
+                    continue
+
+                output_files = None
+                try:
+                    for status, files in run_workflow_and_get_output(package, backend_url):
+                        if files and isinstance(files, list):
+                            output_files = files
+                        events.put(("status", index, status))
+                    if not output_files:
+                        raise RuntimeError("no output received")
+                    consecutive_failures = 0
+                    events.put(("done", index, output_files))
+                except Exception as e:
+                    consecutive_failures += 1
+                    print(f"[BackendScheduler] Part {index + 1}/{total} failed on {backend_url}: {e}")
+                    tried = tried | {backend_url}
+                    if not (parent_context and parent_context.is_cancelled()) and untried_backends(tried):
+                        pending.put((index, package, tried))
+                    else:
+                        events.put(("done", index, None))
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                print(f"[BackendScheduler] Dropping backend {backend_url} after {consecutive_failures} consecutive failures.")
+        finally:
+            with live_lock:
+                live_workers.discard(backend_url)
+            set_execution_context(None)
+            events.put(("exit", backend_url, None))
+
+    workers = [threading.Thread(target=backend_worker, args=(url,), daemon=True) for url in worker_urls]
+    print(f"[BackendScheduler] Dispatching {total} part(s) across {len(workers)} backend(s).")
+    for worker in workers:
+        worker.start()
+
+    results = {}
+    active_workers = len(workers)
+    while active_workers:
+        kind, key, payload = events.get()
+        if kind == "exit":
+            active_workers -= 1
+        elif kind == "done":
+            results[key] = payload
+            yield f"Status: Finished part {len(results)}/{total}.", results
+        elif kind == "status":
+            yield f"Status: Part {key + 1}/{total}: {payload.replace('Status: ', '')}", results
+
+    # Parts left over when every backend was dropped or the job was cancelled.
+    while not pending.empty():
+        index, _, _ = pending.get_nowait()
+        results.setdefault(index, None)
@@ -0,0 +1,218 @@
+import glob
+import os
+import queue
+import re
+import threading
+import time
+
+from core.backend_scheduler import get_capable_backend_urls
+from core.config import BATCH_ROOT
+from core.comfy_api import (
+    run_workflow_and_get_output, run_workflow_and_get_text_output,
+    get_execution_context, set_execution_context
+)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+IN_FLIGHT_PER_BACKEND = 2
+MAX_CONSECUTIVE_FAILURES = 3
+STATUS_INTERVAL_SECONDS = 1.0
+
+
+def is_inside_batch_root(path):
+    real_path = os.path.realpath(path)
+    return os.path.commonpath([BATCH_ROOT, real_path]) == BATCH_ROOT
+
+
+def collect_batch_inputs(path_or_glob, extensions=IMAGE_EXTENSIONS):
+    """
+    Expands a directory (non-recursive) or glob pattern (** supported) below BATCH_ROOT into sorted,
+    symlink-resolved files. Relative paths are taken from BATCH_ROOT; anything resolving outside it is refused.
+    """
+    path_or_glob = os.path.join(BATCH_ROOT, os.path.expanduser(path_or_glob.strip().strip('"')))
+    magic = re.search(r"[*?[]", path_or_glob)
+    if not is_inside_batch_root(os.path.dirname(path_or_glob[:magic.start()]) if magic else path_or_glob):
+        raise ValueError(f"Batch paths must be inside {BATCH_ROOT}.")
+    if os.path.isdir(path_or_glob):
+        candidates = (entry.path for entry in os.scandir(path_or_glob) if entry.is_file())
+    else:
+        candidates = glob.iglob(path_or_glob, recursive=True)
+    inputs = set()
+    for path in candidates:
+        real_path = os.path.realpath(path)
+        if real_path.lower().endswith(extensions) and os.path.isfile(real_path) and is_inside_batch_root(real_path):
+            inputs.add(real_path)
+    return sorted(inputs)
+
+
+def sidecar_path(input_path, suffix):
+    """'dir/img.png' + '.txt' -> 'dir/img.txt'; '_mask.png' -> 'dir/img_mask.png'."""
+    return os.path.splitext(input_path)[0] + suffix
+
+
+def write_text_sidecar(path, text):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def run_directory_batch(path_or_glob, build_package, write_outputs, expected_outputs, output_kind="files",
+                        overwrite=False, backend_urls=None, possible_outputs=None):
+    """
+    Streams every image matching path_or_glob through a bounded pool of in-flight prompts.
+
+    build_package(input_path) -> (workflow, extra_data)
+    write_outputs(input_path, result) writes sidecars and returns items to display; result is text or a list of files.
+    expected_outputs(input_path) -> sidecar paths; inputs whose sidecars all exist are skipped (resume).
+    possible_outputs(input_path) -> every sidecar a run may write (defaults to expected_outputs); these are never
+    treated as inputs themselves.
+    Without backend_urls, every backend that has the workflow's nodes takes part.
+
+    Yields (status, recent_outputs) tuples; the last one carries the summary.
+    """
+    possible_outputs = possible_outputs or expected_outputs
+    inputs = collect_batch_inputs(path_or_glob)
+    sidecars = {os.path.normcase(p) for path in inputs for p in possible_outputs(path)}
+    inputs = [path for path in inputs if os.path.normcase(path) not in sidecars]
+    escaping = [path for path in inputs if not all(is_inside_batch_root(p) for p in possible_outputs(path))]
+    if escaping:
+        print(f"[Batch] Skipping {len(escaping)} image(s) whose outputs would resolve outside {BATCH_ROOT}.")
+        inputs = [path for path in inputs if path not in escaping]
+    if not inputs:
+        raise ValueError(f"No images found for '{path_or_glob}'.")
+
+    pending = [path for path in inputs if overwrite or not all(os.path.exists(p) for p in expected_outputs(path))]
+    skipped = len(inputs) - len(pending)
+    total = len(pending)
+    if not pending:
+        yield f"Status: Loaded successfully! All {len(inputs)} image(s) already processed.", []
+        return
+
+    run_workflow = run_workflow_and_get_text_output if output_kind == "text" else run_workflow_and_get_output
+    first_package = build_package(pending[0])
+    if not backend_urls:
+        class_types = {node.get("class_type") for node in first_package[0].values()}
+        backend_urls = get_capable_backend_urls(class_types)
+
+    work = queue.Queue()
+    work.put((pending[0], first_package, frozenset()))
+    for path in pending[1:]:
+        work.put((path, None, frozenset()))
+    events = queue.Queue()
+    parent_context = get_execution_context()
+    live_workers = {url: 0 for url in backend_urls}
+    live_lock = threading.Lock()
+
+    def untried_backends(tried):
+        with live_lock:
+            return [url for url, count in live_workers.items() if count > 0 and url not in tried]
+
+    def worker(backend_url):
+        set_execution_context(parent_context)
+        consecutive_failures = 0
+        try:
+            while consecutive_failures < MAX_CONSECUTIVE_FAILURES and not (parent_context and parent_context.is_cancelled()):
+                try:
+                    input_path, package, tried = work.get_nowait()
+                except queue.Empty:
+                    break
+                if backend_url in tried:
+                    if untried_backends(tried):
+                        work.put((input_path, package, tried))
+                        time.sleep(0.05)
+                    else:
+                        events.put(("failed", input_path, "failed on every backend"))
+                    continue
+
+                text_file_path = None
+                try:
+                    package = package or build_package(input_path)
+                    text_file_path = (package[1] or {}).get("expected_text_file_path")
+                    result = None
+                    for _, output in run_workflow(package, backend_url):
+                        if output:
+                            result = output
+                    if not result:
+                        raise RuntimeError("no output received")
+                    outputs = write_outputs(input_path, result)
+                    consecutive_failures = 0
+                    events.put(("done", input_path, outputs))
+                except Exception as e:
+                    consecutive_failures += 1
+                    print(f"[Batch] Failed on {input_path} via {backend_url}: {e}")
+                    tried = tried | {backend_url}
+                    if untried_backends(tried):
+                        work.put((input_path, None, tried))
+                    else:
+                        events.put(("failed", input_path, str(e)))
+                finally:
+                    if text_file_path and os.path.exists(text_file_path):
+                        os.remove(text_file_path)
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                print(f"[Batch] Dropping backend {backend_url} after {consecutive_failures} consecutive failures.")
+        finally:
+            with live_lock:
+                live_workers[backend_url] -= 1
+            set_execution_context(None)
+            events.put(("exit", backend_url, None))
+
+    worker_urls = [url for url in backend_urls for _ in range(IN_FLIGHT_PER_BACKEND)][:total]
+    for url in worker_urls:
+        live_workers[url] += 1
+    workers = [threading.Thread(target=worker, args=(url,), daemon=True) for url in worker_urls]
+    print(f"[Batch] {total} image(s) to process ({skipped} already done) with {len(workers)} prompt(s) in flight.")
+    for thread in workers:
+        thread.start()
+
+    started = time.monotonic()
+    done, failed = 0, 0
+    recent_outputs = []
+    last_status_time = 0.0
+    active_workers = len(workers)
+
+    def stats():
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = done / elapsed
+        remaining = (total - done - failed) / rate if rate > 0 else 0
+        return elapsed, rate, remaining
+
+    while active_workers:
+        kind, input_path, payload = events.get()
+        if kind == "exit":
+            active_workers -= 1
+            continue
+        if kind == "done":
+            done += 1
+            recent_outputs = (recent_outputs + list(payload or []))[-8:]
+        else:
+            failed += 1
+
+        now = time.monotonic()
+        if now - last_status_time >= STATUS_INTERVAL_SECONDS or done + failed == total:
+            last_status_time = now
+            _, rate, remaining = stats()
+            yield (
+                f"Status: Batch {done + failed}/{total} ({failed} failed) | {rate:.2f} img/s | "
+                f"ETA {_format_duration(remaining)} | {os.path.basename(input_path)}",
+                recent_outputs
+            )
+
+    while not work.empty():
+        work.get_nowait()
+        failed += 1
+
+    elapsed, rate, _ = stats()
+    summary = (
+        f"{done} processed, {skipped} skipped, {failed} failed in {_format_duration(elapsed)} ({rate:.2f} img/s)"
+    )
+    print(f"[Batch] {summary}")
+    if parent_context and parent_context.is_cancelled():
+        yield f"Status: Batch cancelled. {summary}", recent_outputs
+    else:
+        yield f"Status: Loaded successfully! Batch: {summary}", recent_outputs
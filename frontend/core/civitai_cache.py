@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+from core.config import CACHE_DIR, CIVITAI_API_KEY, HTTP_PROXY, HTTPS_PROXY
+
+CIVITAI_METADATA_FILE = os.path.join(CACHE_DIR, "civitai_metadata.json")
+METADATA_TTL_SECONDS = 7 * 24 * 3600
+MIN_REQUEST_INTERVAL_SECONDS = 1.0
+FAILURE_BACKOFF_SECONDS = 300
+REQUEST_TIMEOUT_SECONDS = 10
+
+def _get_proxies():
+    proxies = {}
+    if HTTP_PROXY: proxies['http'] = HTTP_PROXY
+    if HTTPS_PROXY: proxies['https'] = HTTPS_PROXY
+    return proxies or None
+
+def _select_model_file(files):
+    for file_data in files:
+        if file_data.get('type') == 'Model' and file_data.get('name', '').endswith(('.safetensors', '.pt')):
+            return file_data
+    return files[0] if files else None
+
+class CivitaiMetadataCache:
+    """Persistent Civitai model-version metadata, keyed by version ID."""
+
+    def __init__(self, path=CIVITAI_METADATA_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._request_lock = threading.Lock()
+        self._entries = None
+        self._failures = {}
+        self._last_request = 0.0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError) as e:
+            print(f"[CivitaiCache] Could not read {self.path}, starting empty: {e}")
+            self._entries = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def get(self, version_id):
+        with self._lock:
+            self._load()
+            entry = self._entries.get(str(version_id))
+            return dict(entry) if entry else None
+
+    def _fetch(self, version_id):
+        with self._request_lock:
+            wait = MIN_REQUEST_INTERVAL_SECONDS - (time.monotonic() - self._last_request)
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+
+            headers = {'Authorization': f'Bearer {CIVITAI_API_KEY}'} if CIVITAI_API_KEY else {}
+            api_url = f"https://civitai.com/api/v1/model-versions/{version_id}"
+            response = requests.get(api_url, timeout=REQUEST_TIMEOUT_SECONDS, proxies=_get_proxies(), headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+    def get_file_info(self, version_id, refresh=False):
+        """Returns the cached file info for a version, fetching it when missing or stale."""
+        version_id = str(version_id).strip()
+        entry = self.get(version_id)
+        is_fresh = entry and time.time() - entry.get('fetchedAt', 0) < METADATA_TTL_SECONDS
+        if entry and is_fresh and not refresh:
+            return entry
+
+        last_failure = self._failures.get(version_id)
+        if last_failure and time.monotonic() - last_failure < FAILURE_BACKOFF_SECONDS:
+            return entry
+
+        try:
+            data = self._fetch(version_id)
+        except Exception as e:
+            self._failures[version_id] = time.monotonic()
+            if entry:
+                print(f"[CivitaiCache] Refresh failed for version {version_id}, using cached metadata: {e}")
+            else:
+                print(f"Error getting Civitai info for version {version_id}: {e}")
+            return entry
+
+        file_data = _select_model_file(data.get('files', []))
+        if not file_data:
+            return entry
+
+        new_entry = {
+            'name': file_data.get('name'),
+            'type': file_data.get('type'),
+            'sizeKB': file_data.get('sizeKB'),
+            'hashes': file_data.get('hashes', {}),
+            'downloadUrl': file_data.get('downloadUrl'),
+            'baseModel': data.get('baseModel'),
+            'modelId': data.get('modelId'),
+            'fetchedAt': time.time(),
+        }
+        self._failures.pop(version_id, None)
+        with self._lock:
+            self._load()
+            self._entries[version_id] = new_entry
+            try:
+                self._save()
+            except OSError as e:
+                print(f"[CivitaiCache] Could not write {self.path}: {e}")
+        return dict(new_entry)
+
+civitai_cache = CivitaiMetadataCache()
@@ -7,110 +7,367 @@ import tempfile
 import shutil
 from pathlib import Path
 import gradio as gr
-import pyperclip
 import os
+import time
+import struct
+import threading
 
 from core.backend_manager import backend_manager
-from core.config import DEV_COPY_WORKFLOW_TO_CLIPBOARD, DEV_SAVE_WORKFLOW_TO_JSON, JSON_SAVE_PATH
-from core.workflow_utils import get_filename_prefix
+from core.config import DEV_COPY_WORKFLOW_TO_CLIPBOARD, PREVIEW_MAX_FPS
+from core import result_cache, metrics, node_profiler, workflow_journal
+
+PREVIEW_EVENT_IMAGE = 1
+PREVIEW_EVENT_IMAGE_WITH_METADATA = 4
+PREVIEW_IMAGE_TYPES = {1: ".jpg", 2: ".png"}
+PREVIEW_MIME_TYPES = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+_thread_context = threading.local()
+
+class ExecutionContext:
+    def __init__(self, on_preview=None, module_name=None):
+        self.on_preview = on_preview
+        self.timings = metrics.PhaseTimer(module_name)
+        self.last_preview_at = 0.0
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._prompts = []
+        self._websockets = set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def register_prompt(self, backend_url, prompt_id):
+        with self._lock:
+            self._prompts.append((backend_url, prompt_id))
+        if self.is_cancelled():
+            cancel_prompt(backend_url, prompt_id)
+
+    def register_websocket(self, ws):
+        with self._lock:
+            self._websockets.add(ws)
+        if self.is_cancelled():
+            ws.close()
+
+    def unregister_websocket(self, ws):
+        with self._lock:
+            self._websockets.discard(ws)
+
+    def cancel(self):
+        self.cancel_event.set()
+        with self._lock:
+            prompts = list(self._prompts)
+            websockets = list(self._websockets)
+        for backend_url, prompt_id in prompts:
+            cancel_prompt(backend_url, prompt_id)
+        for ws in websockets:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+def set_execution_context(context):
+    _thread_context.current = context
+
+def get_execution_context():
+    return getattr(_thread_context, "current", None)
+
+def decode_preview_frame(frame):
+    if len(frame) < 8:
+        return None
+    event_type = struct.unpack(">I", frame[:4])[0]
+    if event_type == PREVIEW_EVENT_IMAGE:
+        image_type = struct.unpack(">I", frame[4:8])[0]
+        return frame[8:], PREVIEW_IMAGE_TYPES.get(image_type, ".jpg"), None
+    if event_type == PREVIEW_EVENT_IMAGE_WITH_METADATA:
+        metadata_length = struct.unpack(">I", frame[4:8])[0]
+        try:
+            metadata = json.loads(frame[8:8 + metadata_length].decode("utf-8"))
+        except ValueError:
+            return None
+        extension = PREVIEW_MIME_TYPES.get(metadata.get("image_type"), ".jpg")
+        return frame[8 + metadata_length:], extension, metadata.get("prompt_id")
+    return None
+
+def _handle_preview_frame(frame, prompt_id):
+    context = get_execution_context()
+    if not context or not context.on_preview or PREVIEW_MAX_FPS <= 0:
+        return
+    now = time.monotonic()
+    if now - context.last_preview_at < 1.0 / PREVIEW_MAX_FPS:
+        return
+    decoded = decode_preview_frame(frame)
+    if not decoded:
+        return
+    image_bytes, extension, frame_prompt_id = decoded
+    if frame_prompt_id not in (None, prompt_id) or not image_bytes:
+        return
+    context.last_preview_at = now
+    try:
+        context.on_preview(image_bytes, extension)
+    except Exception as e:
+        print(f"Warning: Failed to handle preview frame: {e}")
+
+def cancel_prompt(backend_url, prompt_id):
+    try:
+        response = requests.get(f"{backend_url}/queue", timeout=10)
+        response.raise_for_status()
+        queue_info = response.json()
+
+        pending_ids = {item[1] for item in queue_info.get("queue_pending", []) if len(item) > 1}
+        running_ids = {item[1] for item in queue_info.get("queue_running", []) if len(item) > 1}
+
+        if prompt_id in pending_ids:
+            requests.post(f"{backend_url}/queue", json={"delete": [prompt_id]}, timeout=10).raise_for_status()
+            print(f"Deleted queued prompt {prompt_id} from {backend_url}.")
+        elif prompt_id in running_ids:
+            requests.post(f"{backend_url}/interrupt", json={"prompt_id": prompt_id}, timeout=10).raise_for_status()
+            print(f"Interrupted running prompt {prompt_id} on {backend_url}.")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error cancelling prompt {prompt_id} on {backend_url}: {e}")
+
+def queue_prompt(prompt_workflow, client_id, extra_data=None, backend_url=None):
+    context = get_execution_context()
+    if context and context.is_cancelled():
+        print("Skipping prompt submission because the job has been cancelled.")
+        return None
 
-def queue_prompt(prompt_workflow, client_id, extra_data=None):
     try:
         if DEV_COPY_WORKFLOW_TO_CLIPBOARD:
             try:
+                import pyperclip
                 workflow_str = json.dumps(prompt_workflow, indent=2)
                 pyperclip.copy(workflow_str)
                 print("[Dev Feature] Workflow JSON has been copied to the clipboard.")
             except Exception as e:
                 print(f"[Dev Feature] Warning: Failed to copy workflow to clipboard: {e}")
-        
-        if DEV_SAVE_WORKFLOW_TO_JSON:
-            try:
-                filename = f"{get_filename_prefix()}_workflow.json"
-                filepath = os.path.join(JSON_SAVE_PATH, filename)
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(prompt_workflow, f, indent=2)
-                print(f"[Dev Feature] Workflow saved to: {filepath}")
-            except Exception as e:
-                print(f"[Dev Feature] Warning: Failed to save workflow to JSON file: {e}")
 
 
         payload = {"prompt": prompt_workflow, "client_id": client_id}
         if extra_data:
             payload.update(extra_data)
         
-        active_url = backend_manager.get_active_backend_url()
+        active_url = backend_url or backend_manager.get_active_backend_url()
+        if context:
+            context.timings.end_preparation(active_url)
         response = requests.post(f"{active_url}/prompt", json=payload)
         response.raise_for_status()
-        return response.json()
+        queue_data = response.json()
+        if 'prompt_id' in queue_data:
+            metrics.prompt_queued(queue_data['prompt_id'], context.timings.module if context else None, active_url)
+            node_profiler.prompt_queued(queue_data['prompt_id'], prompt_workflow, context.timings.module if context else None)
+            workflow_journal.prompt_submitted(
+                queue_data['prompt_id'], prompt_workflow, extra_data, active_url,
+                metrics.backend_label(active_url), context.timings.module if context else None
+            )
+            if context:
+                context.register_prompt(active_url, queue_data['prompt_id'])
+        return queue_data
     except requests.exceptions.RequestException as e:
         print(f"Error queuing prompt: {e}")
         return None
 
-def get_output_data(prompt_id, client_id):
-    active_url = backend_manager.get_active_backend_url()
+def _iter_prompt_messages(prompt_id, client_id, backend_url=None):
+    active_url = backend_url or backend_manager.get_active_backend_url()
     ws_url = f"ws://{urllib.parse.urlparse(active_url).netloc}/ws?clientId={client_id}"
     ws = None
+    context = get_execution_context()
+    final_status = "incomplete"
     try:
         ws = websocket.create_connection(ws_url)
-        queue_remaining = -1
+        if context:
+            context.register_websocket(ws)
 
         while True:
             out = ws.recv()
             if not isinstance(out, str):
+                _handle_preview_frame(out, prompt_id)
                 continue
             
             message = json.loads(out)
             msg_type = message.get('type')
+            data = message.get('data', {})
 
             if msg_type == 'status':
-                data = message.get('data', {})
                 status_info = data.get('status', {})
                 queue_remaining = status_info.get('exec_info', {}).get('queue_remaining', -1)
+                if queue_remaining >= 0:
+                    metrics.backend_queue_remaining.set(queue_remaining, backend=metrics.backend_label(active_url))
                 if queue_remaining == 0:
                     break
+                continue
 
-            elif msg_type == 'executed':
-                data = message.get('data', {})
-                if data.get('prompt_id') == prompt_id:
-                    output_data = data.get('output', {})
-                    has_output = any(
-                        isinstance(v, list) and v and isinstance(v[0], dict) and 'filename' in v[0]
-                        for v in output_data.values()
-                    )
-                    if has_output:
-                        print(f"\nReceived node output for prompt {prompt_id}.")
-                        yield output_data
-            
-            elif msg_type == 'progress':
-                data = message.get('data', {})
-                progress = f"Progress: {data.get('value')}/{data.get('max')}"
-                print(progress, end='\r')
-                yield progress
+            if data.get('prompt_id') not in (None, prompt_id):
+                continue
+            if data.get('prompt_id') == prompt_id:
+                metrics.prompt_message(prompt_id)
+                node_profiler.on_message(prompt_id, msg_type, data)
+                workflow_journal.on_message(prompt_id, msg_type, data)
+
+            yield msg_type, data
+
+            if msg_type == 'executing' and data.get('node') is None and data.get('prompt_id') == prompt_id:
+                final_status = "success"
+                break
+            if msg_type in ('execution_success', 'execution_error', 'execution_interrupted'):
+                final_status = msg_type.replace("execution_", "")
+                break
         
         print("\nWebSocket stream finished.")
 
     except Exception as e:
-        print(f"WebSocket connection error: {e}")
+        if context and context.is_cancelled():
+            print(f"\nWebSocket stream closed: prompt {prompt_id} was cancelled.")
+        else:
+            print(f"WebSocket connection error: {e}")
     finally:
+        metrics.prompt_finished(prompt_id)
+        node_profiler.prompt_finished(prompt_id, final_status)
+        workflow_journal.prompt_finished(prompt_id, final_status)
+        if context:
+            context.timings.restart()
         if ws:
+            if context:
+                context.unregister_websocket(ws)
             ws.close()
 
-def download_file(filename, subfolder, file_type="output"):
-    active_url = backend_manager.get_active_backend_url()
+def get_output_data(prompt_id, client_id, backend_url=None):
+    for msg_type, data in _iter_prompt_messages(prompt_id, client_id, backend_url):
+        if msg_type == 'executed':
+            output_data = data.get('output', {})
+            has_output = any(
+                isinstance(v, list) and v and isinstance(v[0], dict) and 'filename' in v[0]
+                for v in output_data.values()
+            )
+            if has_output:
+                print(f"\nReceived node output for prompt {prompt_id}.")
+                yield output_data
+        
+        elif msg_type == 'progress':
+            progress = f"Progress: {data.get('value')}/{data.get('max')}"
+            print(progress, end='\r')
+            yield progress
+
+def get_history(prompt_id, backend_url=None):
+    active_url = backend_url or backend_manager.get_active_backend_url()
+    try:
+        response = requests.get(f"{active_url}/history/{urllib.parse.quote(prompt_id)}", timeout=20)
+        response.raise_for_status()
+        return response.json().get(prompt_id, {})
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Error fetching history for prompt {prompt_id}: {e}")
+        return {}
+
+def extract_text_outputs(output_data):
+    texts = []
+    for key, value in (output_data or {}).items():
+        values = value if isinstance(value, list) else [value]
+        texts.extend(v for v in values if isinstance(v, str))
+    return texts
+
+def get_text_output(prompt_id, client_id, backend_url=None):
+    node_texts = {}
+    for msg_type, data in _iter_prompt_messages(prompt_id, client_id, backend_url):
+        if msg_type == 'executed':
+            texts = extract_text_outputs(data.get('output', {}))
+            if texts:
+                print(f"\nReceived text output from node {data.get('node')} for prompt {prompt_id}.")
+                node_texts[data.get('node')] = "\n".join(texts)
+        elif msg_type == 'progress':
+            progress = f"Progress: {data.get('value')}/{data.get('max')}"
+            print(progress, end='\r')
+            yield progress
+
+    if not node_texts:
+        for node_id, output_data in get_history(prompt_id, backend_url).get('outputs', {}).items():
+            texts = extract_text_outputs(output_data)
+            if texts:
+                node_texts[node_id] = "\n".join(texts)
+
+    if node_texts:
+        yield {"text": "\n".join(node_texts.values())}
+
+def _wait_for_stable_file(path, timeout=10.0, interval=0.1):
+    deadline = time.monotonic() + timeout
+    last_size = -1
+    while time.monotonic() < deadline:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = -1
+        if size > 0 and size == last_size:
+            return True
+        last_size = size
+        time.sleep(interval)
+    return False
+
+def wait_for_named_outputs(prompt_id, client_id, expected_files, expected_nodes=None):
+    expected_nodes = expected_nodes or {}
+    names_by_node = {str(node_id): name for name, node_id in expected_nodes.items() if node_id}
+    ready_files = {}
+    checked_names = set()
+    running_node = None
+
+    def check_ready(name):
+        path = expected_files.get(name)
+        if path and _wait_for_stable_file(path):
+            ready_files[name] = path
+            print(f"\nOutput '{name}' is ready: {path}")
+
+    for msg_type, data in _iter_prompt_messages(prompt_id, client_id):
+        finished_nodes = []
+        if msg_type == 'executing':
+            if running_node is not None:
+                finished_nodes.append(running_node)
+            running_node = data.get('node')
+        elif msg_type == 'executed':
+            finished_nodes.append(data.get('node'))
+        elif msg_type == 'execution_cached':
+            finished_nodes.extend(data.get('nodes', []))
+        elif msg_type == 'progress':
+            progress = f"Progress: {data.get('value')}/{data.get('max')}"
+            print(progress, end='\r')
+            yield progress
+
+        for node_id in finished_nodes:
+            name = names_by_node.get(str(node_id))
+            if name and name not in checked_names:
+                checked_names.add(name)
+                check_ready(name)
+
+    # An output that was still being written when its node finished gets another look now.
+    for name in expected_files:
+        if name not in ready_files:
+            check_ready(name)
+
+    yield {name: ready_files.get(name) for name in expected_files}
+
+def download_file(filename, subfolder, file_type="output", backend_url=None):
+    active_url = backend_url or backend_manager.get_active_backend_url()
     url = f"{active_url}/view?filename={urllib.parse.quote_plus(filename)}&subfolder={urllib.parse.quote_plus(subfolder)}&type={file_type}"
+    context = get_execution_context()
+    module_name = context.timings.module if context else None
+    started = time.perf_counter()
     try:
         with requests.get(url, stream=True) as r:
             r.raise_for_status()
-            suffix = Path(filename).suffix
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{Path(filename).name}") as tmp_file:
                 shutil.copyfileobj(r.raw, tmp_file)
+                metrics.observe_download(module_name, active_url, time.perf_counter() - started, tmp_file.tell())
                 return tmp_file.name
     except requests.exceptions.RequestException as e:
         print(f"Error downloading file: {e}")
+        metrics.observe_download(module_name, active_url, time.perf_counter() - started)
         return None
 
-def run_workflow_and_get_output(workflow_data):
+def _pop_result_cache_key(prompt_workflow, extra_data):
+    if not extra_data or "result_cache" not in extra_data:
+        return extra_data, None
+    extra_data = dict(extra_data)
+    if not extra_data.pop("result_cache") or not result_cache.is_enabled():
+        return extra_data, None
+    return extra_data, result_cache.compute_cache_key(prompt_workflow)
+
+def run_workflow_and_get_output(workflow_data, backend_url=None):
     client_id = uuid.uuid4().hex
     
     prompt_workflow, extra_data = None, None
@@ -119,11 +376,24 @@ def run_workflow_and_get_output(workflow_data):
     else:
         prompt_workflow = workflow_data
 
+    postprocess_outputs = None
+    if extra_data and "postprocess_outputs" in extra_data:
+        extra_data = dict(extra_data)
+        postprocess_outputs = extra_data.pop("postprocess_outputs")
+
+    extra_data, cache_key = _pop_result_cache_key(prompt_workflow, extra_data)
+    if cache_key:
+        cached = result_cache.lookup(cache_key)
+        if cached and cached.get("files"):
+            print(f"[ResultCache] Hit for {cache_key[:12]}, skipping ComfyUI.")
+            yield result_cache.CACHE_HIT_STATUS, cached["files"]
+            return
+
     yield "Status: Sending to ComfyUI...", None
     
-    queue_data = queue_prompt(prompt_workflow, client_id, extra_data)
+    queue_data = queue_prompt(prompt_workflow, client_id, extra_data, backend_url)
     if not queue_data or 'prompt_id' not in queue_data:
-        active_url = backend_manager.get_active_backend_url()
+        active_url = backend_url or backend_manager.get_active_backend_url()
         yield f"Error: Failed to send to ComfyUI backend at {active_url}. Please check if the service is running.", None
         return
         
@@ -132,7 +402,7 @@ def run_workflow_and_get_output(workflow_data):
     
     all_local_file_paths = []
     
-    for update in get_output_data(prompt_id, client_id):
+    for update in get_output_data(prompt_id, client_id, backend_url):
         if isinstance(update, str):
             yield f"Status: {update}", None
         elif isinstance(update, dict):
@@ -146,7 +416,7 @@ def run_workflow_and_get_output(workflow_data):
 
             for i, output_info in enumerate(output_files_info):
                 yield f"Status: Downloading file {i+1}/{len(output_files_info)}...", None
-                local_file_path = download_file(output_info['filename'], output_info['subfolder'], output_info['type'])
+                local_file_path = download_file(output_info['filename'], output_info['subfolder'], output_info['type'], backend_url)
                 if local_file_path:
                     all_local_file_paths.append(local_file_path)
 
@@ -155,5 +425,101 @@ def run_workflow_and_get_output(workflow_data):
     if not all_local_file_paths:
         yield f"Error: Failed to receive any final output files from ComfyUI.", None
         return
+
+    if postprocess_outputs:
+        yield "Status: Post-processing outputs...", None
+        all_local_file_paths = postprocess_outputs(all_local_file_paths)
+
+    if cache_key:
+        result_cache.store(cache_key, files=all_local_file_paths)
+    
+    yield "Status: Loaded successfully!", all_local_file_paths
+
+def run_workflow_and_get_text_output(workflow_data, backend_url=None):
+    client_id = uuid.uuid4().hex
+    
+    prompt_workflow, extra_data = None, None
+    if isinstance(workflow_data, tuple) and len(workflow_data) == 2:
+        prompt_workflow, extra_data = workflow_data
+    else:
+        prompt_workflow = workflow_data
+
+    extra_data, cache_key = _pop_result_cache_key(prompt_workflow, extra_data)
+    if cache_key:
+        cached = result_cache.lookup(cache_key)
+        if cached and cached.get("text") is not None:
+            print(f"[ResultCache] Hit for {cache_key[:12]}, skipping ComfyUI.")
+            yield result_cache.CACHE_HIT_STATUS, cached["text"]
+            return
+
+    yield "Status: Sending to ComfyUI...", None
+    
+    queue_data = queue_prompt(prompt_workflow, client_id, extra_data, backend_url)
+    if not queue_data or 'prompt_id' not in queue_data:
+        active_url = backend_url or backend_manager.get_active_backend_url()
+        yield f"Error: Failed to send to ComfyUI backend at {active_url}. Please check if the service is running.", None
+        return
+        
+    prompt_id = queue_data['prompt_id']
+    yield f"Status: Workflow queued. Waiting for ComfyUI to process...", None
+
+    text_content = None
+    for update in get_text_output(prompt_id, client_id, backend_url):
+        if isinstance(update, str):
+            yield f"Status: {update}", None
+        elif isinstance(update, dict):
+            text_content = update.get("text")
+
+    expected_text_file_path = (extra_data or {}).get("expected_text_file_path")
+    if expected_text_file_path and os.path.exists(expected_text_file_path):
+        try:
+            if text_content is None:
+                with open(expected_text_file_path, 'r', encoding='utf-8') as file:
+                    text_content = file.read()
+            os.remove(expected_text_file_path)
+        except OSError as e:
+            print(f"Warning: Could not read or clean up text output file {expected_text_file_path}: {e}")
+
+    if text_content is None:
+        yield f"Error: Failed to receive any text output from ComfyUI.", None
+        return
+
+    if cache_key:
+        result_cache.store(cache_key, text=text_content)
+
+    yield "Status: Loaded successfully!", text_content
+
+def run_workflow_and_wait_for_outputs(workflow_data):
+    client_id = uuid.uuid4().hex
+    
+    prompt_workflow, extra_data = None, None
+    if isinstance(workflow_data, tuple) and len(workflow_data) == 2:
+        prompt_workflow, extra_data = workflow_data
+    else:
+        prompt_workflow = workflow_data
+    extra_data = extra_data or {}
+
+    yield "Status: Sending to ComfyUI...", None
     
-    yield "Status: Loaded successfully!", all_local_file_paths
\ No newline at end of file
+    queue_data = queue_prompt(prompt_workflow, client_id, extra_data)
+    if not queue_data or 'prompt_id' not in queue_data:
+        active_url = backend_manager.get_active_backend_url()
+        yield f"Error: Failed to send to ComfyUI backend at {active_url}. Please check if the service is running.", None
+        return
+        
+    prompt_id = queue_data['prompt_id']
+    yield f"Status: Workflow queued. Waiting for ComfyUI to process...", None
+
+    named_outputs = {}
+    for update in wait_for_named_outputs(prompt_id, client_id, extra_data.get("expected_files", {}), extra_data.get("expected_nodes")):
+        if isinstance(update, str):
+            yield f"Status: {update}", None
+        elif isinstance(update, dict):
+            named_outputs = update
+
+    missing = [name for name, path in named_outputs.items() if not path]
+    if missing:
+        yield f"Error: Output files not found after execution: {', '.join(missing)}.", None
+        return
+
+    yield "Status: Loaded successfully!", named_outputs
\ No newline at end of file
@@ -53,7 +53,10 @@ if not COMFYUI_PATH or not os.path.isdir(COMFYUI_PATH):
     )
 
 DEV_COPY_WORKFLOW_TO_CLIPBOARD = config.get("developer_copy_workflow_to_clipboard", False)
-DEV_SAVE_WORKFLOW_TO_JSON = config.get("developer_save_workflow_to_json", True)
+# developer_save_workflow_to_json used to dump every workflow into ComfyUI/JSON; it now turns on the journal.
+WORKFLOW_JOURNAL = config.get("workflow_journal", config.get("developer_save_workflow_to_json", False))
+WORKFLOW_JOURNAL_MAX_MB = float(config.get("workflow_journal_max_mb", 512))
+WORKFLOW_JOURNAL_SEGMENT_MB = float(config.get("workflow_journal_segment_mb", 16))
 
 
 HTTP_PROXY = os.getenv("HTTP_PROXY", config.get("http_proxy", None))
@@ -85,6 +88,11 @@ GRADIO_SERVER_NAME = os.getenv("GRADIO_SERVER_NAME", config.get("gradio_server_n
 ENABLE_LOGIN = config.get("enable_login", False)
 LOGIN_CREDENTIALS = config.get("login_credentials", [])
 SHARE_GRADIO = config.get("share_gradio", False)
+ENABLE_REST_API = config.get("enable_rest_api", False)
+ENABLE_METRICS = config.get("enable_metrics", False)
+# Hosts that MCP callback_url may name even though they resolve to loopback or private addresses.
+MCP_CALLBACK_ALLOWED_HOSTS = [str(host).lower() for host in config.get("mcp_callback_allowed_hosts") or []]
+LAZY_TAB_LOADING = config.get("lazy_tab_loading", True)
 
 if ENABLE_LOGIN:
     if not LOGIN_CREDENTIALS or not isinstance(LOGIN_CREDENTIALS, list):
@@ -102,13 +110,32 @@ if ENABLE_LOGIN:
 
 AUTO_DOWNLOAD_MODELS = config.get("auto_download_models", True)
 
+PREVIEW_MAX_FPS = float(os.getenv("PREVIEW_MAX_FPS", config.get("preview_max_fps", 1.0)))
+
+VIDEO_SEGMENT_SECONDS = float(config.get("video_segment_seconds", 10))
+
+RESULT_CACHE_MAX_MB = float(config.get("result_cache_max_mb", 1024))
+
+MAX_CONCURRENT_JOBS = max(1, int(config.get("max_concurrent_jobs", 8)))
+JOB_TTL_SECONDS = float(config.get("job_ttl_minutes", 60)) * 60
+
+FRONTEND_WORKERS = max(1, int(os.getenv("FRONTEND_WORKERS", config.get("frontend_workers", 1))))
+# Set by the worker router for each worker process it starts; empty in a single-process deployment.
+FRONTEND_WORKER_ID = os.getenv("FRONTEND_WORKER_ID", "")
+# Where clients reach this frontend, for URLs handed out to them; in worker mode that is the router, not the worker.
+PUBLIC_SERVER_NAME = os.getenv("FRONTEND_PUBLIC_HOST", GRADIO_SERVER_NAME)
+PUBLIC_SERVER_PORT = int(os.getenv("FRONTEND_PUBLIC_PORT", SERVER_PORT))
+
 HF_CACHE_PATH = os.getenv("HF_CACHE_PATH", config.get("hf_cache_path", None))
 
 COMFYUI_INPUT_PATH = os.path.join(COMFYUI_PATH, "input")
 COMFYUI_OUTPUT_PATH = os.path.join(COMFYUI_PATH, "output")
 LORA_DIR = os.path.join(COMFYUI_PATH, "models", "loras")
 EMBEDDING_DIR = os.path.join(COMFYUI_PATH, "models", "embeddings")
-JSON_SAVE_PATH = os.path.join(COMFYUI_PATH, "JSON")
+CACHE_DIR = os.getenv("FRONTEND_CACHE_DIR", config.get("cache_dir") or os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache"))
+WORKFLOW_JOURNAL_DIR = config.get("workflow_journal_dir") or os.path.join(CACHE_DIR, "journal")
+# Server-side batch mode only reads images and writes sidecars below this directory.
+BATCH_ROOT = os.path.realpath(os.path.expanduser(config.get("batch_root") or COMFYUI_INPUT_PATH))
 
 print("="*50)
 print("Configuration Loaded:")
@@ -121,16 +148,27 @@ print(f"  Input Directory: {COMFYUI_INPUT_PATH}")
 print(f"  Output Directory: {COMFYUI_OUTPUT_PATH}")
 print(f"  LoRA Directory: {LORA_DIR}")
 print(f"  Embedding Directory: {EMBEDDING_DIR}")
-print(f"  JSON Save Directory: {JSON_SAVE_PATH}")
+print(f"  Cache Directory: {CACHE_DIR}")
 print(f"  Server Port: {SERVER_PORT}")
 print(f"  Server Name: {GRADIO_SERVER_NAME}")
 print(f"  Share Gradio: {SHARE_GRADIO}")
+print(f"  REST Job API: {('Enabled (/jobs)' if ENABLE_LOGIN else 'Enabled (/jobs, WITHOUT authentication)') if ENABLE_REST_API else 'Disabled'}")
+print(f"  Metrics Endpoint: {('Enabled (/metrics)' if ENABLE_LOGIN else 'Enabled (/metrics, WITHOUT authentication)') if ENABLE_METRICS else 'Disabled'}")
+print(f"  MCP Callback Private Hosts: {', '.join(MCP_CALLBACK_ALLOWED_HOSTS) if MCP_CALLBACK_ALLOWED_HOSTS else 'None (public hosts only)'}")
+print(f"  Lazy Tab Loading: {LAZY_TAB_LOADING}")
 print(f"  Login Enabled: {ENABLE_LOGIN}")
 if ENABLE_LOGIN:
     print(f"  Login Users Found: {len(LOGIN_CREDENTIALS)}")
 print(f"  Dev: Copy Workflow to Clipboard: {DEV_COPY_WORKFLOW_TO_CLIPBOARD}")
-print(f"  Dev: Save Workflow to JSON: {DEV_SAVE_WORKFLOW_TO_JSON}")
+print(f"  Workflow Journal: {f'{WORKFLOW_JOURNAL_DIR} (max {WORKFLOW_JOURNAL_MAX_MB:g} MB)' if WORKFLOW_JOURNAL else 'Disabled'}")
 print(f"  Auto Download Models: {AUTO_DOWNLOAD_MODELS}")
+print(f"  Live Preview Max FPS: {PREVIEW_MAX_FPS if PREVIEW_MAX_FPS > 0 else 'Disabled'}")
+print(f"  Video Segment Length: {VIDEO_SEGMENT_SECONDS}s")
+print(f"  Batch Mode Root: {BATCH_ROOT}")
+print(f"  Analysis Result Cache: {f'{RESULT_CACHE_MAX_MB:g} MB' if RESULT_CACHE_MAX_MB > 0 else 'Disabled'}")
+print(f"  Max Concurrent Jobs: {MAX_CONCURRENT_JOBS}")
+print(f"  Frontend Workers: {FRONTEND_WORKERS}" + (f" (this is worker {FRONTEND_WORKER_ID})" if FRONTEND_WORKER_ID else ""))
+print(f"  Finished Job Retention: {JOB_TTL_SECONDS / 60:g} min")
 print(f"  HTTP Proxy: {HTTP_PROXY if HTTP_PROXY else 'Not set'}")
 print(f"  HTTPS Proxy: {HTTPS_PROXY if HTTPS_PROXY else 'Not set'}")
 if proxy_set_message:
@@ -144,4 +182,4 @@ print("="*50)
 os.makedirs(COMFYUI_INPUT_PATH, exist_ok=True)
 os.makedirs(LORA_DIR, exist_ok=True)
 os.makedirs(EMBEDDING_DIR, exist_ok=True)
-os.makedirs(JSON_SAVE_PATH, exist_ok=True)
\ No newline at end of file
+os.makedirs(CACHE_DIR, exist_ok=True)
\ No newline at end of file
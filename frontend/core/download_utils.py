@@ -1,12 +1,22 @@
 import os
+import threading
 import requests
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import gradio as gr
-from core.config import LORA_DIR, EMBEDDING_DIR, HTTP_PROXY, HTTPS_PROXY
+from core.config import LORA_DIR, EMBEDDING_DIR, HTTP_PROXY, HTTPS_PROXY, CIVITAI_API_KEY
+from core.civitai_cache import civitai_cache
 
 os.makedirs(LORA_DIR, exist_ok=True)
 os.makedirs(EMBEDDING_DIR, exist_ok=True)
 
+PREFETCH_MAX_WORKERS = 4
+
+_inflight_lock = threading.Lock()
+_inflight_downloads = {}
+_inflight_prefetches = {}
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="asset-prefetch")
+
 def _get_proxies():
     proxies = {}
     if HTTP_PROXY:
@@ -16,29 +26,20 @@ def _get_proxies():
     return proxies if proxies else None
 
 def get_civitai_file_info(version_id):
-    api_url = f"https://civitai.com/api/v1/model-versions/{version_id}"
-    try:
-        response = requests.get(api_url, timeout=10, proxies=_get_proxies())
-        response.raise_for_status()
-        data = response.json()
-        
-        for file_data in data.get('files', []):
-            if file_data.get('type') == 'Model' and file_data['name'].endswith(('.safetensors', '.pt')):
-                return file_data
-        
-        if data.get('files'):
-            return data['files'][0]
-            
-    except Exception as e:
-        print(f"Error getting Civitai info for version {version_id}: {e}")
-        return None
+    return civitai_cache.get_file_info(version_id)
 
-def download_file(url, save_path, api_key=None, progress=None, desc=""):
-    if os.path.exists(save_path):
-        return f"File already exists: {os.path.basename(save_path)}"
-    
+def find_local_civitai_file(base_dir, version_id, extensions=('.safetensors', '.pt')):
+    """Returns the relative path of an already downloaded Civitai file, or None."""
+    for ext in extensions:
+        relative_path = os.path.join("civitai", f"{version_id}{ext}")
+        if os.path.exists(os.path.join(base_dir, relative_path)):
+            return relative_path
+    return None
+
+def _download_to_path(url, save_path, api_key=None, progress=None, desc=""):
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    
+    temp_path = f"{save_path}.{os.getpid()}.{threading.get_ident()}.part"
+
     headers = {'Authorization': f'Bearer {api_key}'} if api_key and api_key.strip() else {}
     try:
         if progress: progress(0, desc=desc)
@@ -46,20 +47,49 @@ def download_file(url, save_path, api_key=None, progress=None, desc=""):
         response.raise_for_status()
         total_size = int(response.headers.get('content-length', 0))
         
-        with open(save_path, "wb") as f:
+        with open(temp_path, "wb") as f:
             downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
                 f.write(chunk)
                 if progress and total_size > 0:
                     downloaded += len(chunk)
                     progress(downloaded / total_size, desc=desc)
-                    
+
+        os.replace(temp_path, save_path)
         return f"Successfully downloaded: {os.path.basename(save_path)}"
     except Exception as e:
-        if os.path.exists(save_path):
-            os.remove(save_path)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return f"Download failed for {os.path.basename(save_path)}: {e}"
 
+def download_file(url, save_path, api_key=None, progress=None, desc=""):
+    """Downloads url to save_path; concurrent calls for the same path share one download."""
+    if os.path.exists(save_path):
+        return f"File already exists: {os.path.basename(save_path)}"
+
+    save_path = os.path.abspath(save_path)
+    with _inflight_lock:
+        inflight = _inflight_downloads.get(save_path)
+        is_owner = inflight is None
+        if is_owner:
+            inflight = {'done': threading.Event(), 'status': None}
+            _inflight_downloads[save_path] = inflight
+
+    if not is_owner:
+        print(f"[Download] Waiting for in-flight download of {os.path.basename(save_path)}")
+        inflight['done'].wait()
+        if os.path.exists(save_path):
+            return f"File already exists: {os.path.basename(save_path)}"
+        return inflight['status']
+
+    try:
+        inflight['status'] = _download_to_path(url, save_path, api_key, progress, desc)
+        return inflight['status']
+    finally:
+        with _inflight_lock:
+            _inflight_downloads.pop(save_path, None)
+        inflight['done'].set()
+
 def get_lora_path(source, id_or_url, civitai_key, progress=None):
     if not id_or_url or not id_or_url.strip():
         return None, "No ID or URL provided."
@@ -78,6 +108,9 @@ def get_lora_path(source, id_or_url, civitai_key, progress=None):
         
     if source == "Civitai":
         subdir = "civitai"
+        existing_path = find_local_civitai_file(LORA_DIR, id_or_url)
+        if existing_path:
+            return existing_path, "File already exists."
         file_info = get_civitai_file_info(id_or_url)
         if file_info and file_info['name'].lower().endswith('.pt'):
             file_ext = ".pt"
@@ -129,6 +162,9 @@ def get_embedding_path(source, id_or_url, civitai_key, progress=None):
 
     if source == "Civitai":
         subdir = "civitai"
+        existing_path = find_local_civitai_file(EMBEDDING_DIR, id_or_url)
+        if existing_path:
+            return existing_path, "File already exists."
         file_info = get_civitai_file_info(id_or_url)
         if file_info and file_info['name'].lower().endswith('.pt'):
             file_ext = ".pt"
@@ -160,4 +196,39 @@ def get_embedding_path(source, id_or_url, civitai_key, progress=None):
     if "Successfully" in status or "already exists" in status:
         return relative_path, status
     else:
-        return None, status
\ No newline at end of file
+        return None, status
+
+
+ASSET_RESOLVERS = {
+    "lora": get_lora_path,
+    "embedding": get_embedding_path,
+}
+
+def is_prefetchable(source, id_or_url):
+    if not id_or_url or not id_or_url.strip():
+        return False
+    if source == "Civitai":
+        return id_or_url.strip().isdigit()
+    if source == "Custom URL":
+        return id_or_url.strip().lower().startswith(("http://", "https://"))
+    return False
+
+def prefetch_asset(kind, source, id_or_url, civitai_key=CIVITAI_API_KEY):
+    """
+    Starts resolving a remote asset in the background and returns a Future of (path, status).
+    Requests for the same asset share one Future while it is in flight.
+    """
+    prefetch_key = (kind, source, id_or_url.strip())
+    with _inflight_lock:
+        future = _inflight_prefetches.get(prefetch_key)
+        if future is not None:
+            return future
+        future = _prefetch_executor.submit(ASSET_RESOLVERS[kind], source, id_or_url, civitai_key)
+        _inflight_prefetches[prefetch_key] = future
+    future.add_done_callback(lambda f, k=prefetch_key: _forget_prefetch(k, f))
+    return future
+
+def _forget_prefetch(prefetch_key, future):
+    with _inflight_lock:
+        if _inflight_prefetches.get(prefetch_key) is future:
+            del _inflight_prefetches[prefetch_key]
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+MODEL_FILE_EXTENSIONS = ('.safetensors', '.pt', '.bin', '.ckpt', '.pth', '.gguf')
+REFRESH_INTERVAL_SECONDS = 2.0
+
+class FileIndex:
+    """Process-wide index of model files, refreshed by directory mtime."""
+
+    def __init__(self, refresh_interval=REFRESH_INTERVAL_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._dirs = {}
+        self._views = {}
+        self._last_checked = {}
+
+    def _scan_dir(self, path):
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=True):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=True):
+                    files.append(entry.name)
+        return files, subdirs
+
+    def _sync_root(self, root):
+        dirs = self._dirs.setdefault(root, {})
+        changed = False
+        seen = set()
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = dirs.get(path)
+            if not cached or cached[0] != mtime:
+                try:
+                    files, subdirs = self._scan_dir(path)
+                except OSError:
+                    continue
+                dirs[path] = (mtime, files, subdirs)
+                changed = True
+            stack.extend(dirs[path][2])
+
+        for stale_path in set(dirs) - seen:
+            del dirs[stale_path]
+            changed = True
+        return changed
+
+    def _refresh(self, root):
+        now = time.monotonic()
+        if root in self._dirs and now - self._last_checked.get(root, 0) < self.refresh_interval:
+            return
+        if self._sync_root(root):
+            self._views = {key: view for key, view in self._views.items() if key[0] != root}
+        self._last_checked[root] = now
+
+    def list_files(self, root, subdir="", extensions=MODEL_FILE_EXTENSIONS):
+        root = os.path.abspath(root)
+        with self._lock:
+            self._refresh(root)
+            key = (root, subdir, tuple(extensions))
+            view = self._views.get(key)
+            if view is None:
+                base = os.path.join(root, subdir) if subdir else root
+                view = sorted(
+                    os.path.relpath(os.path.join(path, filename), root).replace("\\", "/")
+                    for path, (_, files, _) in self._dirs.get(root, {}).items()
+                    if path == base or path.startswith(base + os.sep)
+                    for filename in files
+                    if filename.lower().endswith(extensions)
+                )
+                self._views[key] = view
+            return list(view)
+
+    def invalidate(self, root=None):
+        with self._lock:
+            if root is None:
+                self._last_checked.clear()
+            else:
+                self._last_checked.pop(os.path.abspath(root), None)
+
+file_index = FileIndex()
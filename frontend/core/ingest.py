@@ -0,0 +1,116 @@
+import hashlib
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+FICLONE = 0x40049409
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+HASH_NAME_LENGTH = 16
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src_path, dst_path):
+    import fcntl
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _copy_file_range(src_path, dst_path):
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+        if remaining > 0:
+            raise OSError(f"copy_file_range stopped with {remaining} bytes left")
+
+
+def link_or_copy(src_path, dst_path):
+    """
+    Materializes src_path at dst_path with the cheapest method the filesystem supports:
+    hardlink, then reflink, then in-kernel copy_file_range, then a regular copy.
+    The destination appears atomically. Returns the method that was used.
+    """
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    temp_path = f"{dst_path}.{os.getpid()}.{threading.get_ident()}.part"
+    methods = [("hardlink", os.link), ("reflink", _reflink)]
+    if hasattr(os, "copy_file_range"):
+        methods.append(("copy_file_range", _copy_file_range))
+    methods.append(("copy", shutil.copyfile))
+
+    for method_name, method in methods:
+        try:
+            method(src_path, temp_path)
+            os.replace(temp_path, dst_path)
+            return method_name
+        except (OSError, ImportError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    raise OSError(f"Could not copy {src_path} to {dst_path}")
+
+
+@contextmanager
+def _destination_lock(dst_path):
+    """Serializes ingests into one destination; ingests into other paths are not blocked."""
+    key = os.path.abspath(dst_path)
+    with _path_locks_guard:
+        entry = _path_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _path_locks_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _path_locks[key]
+
+
+def _is_same_file(path_a, path_b):
+    try:
+        if os.path.samefile(path_a, path_b):
+            return True
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return file_digest(path_a) == file_digest(path_b)
+
+
+def ingest_file(src_path, dst_path):
+    """Places src_path at dst_path, skipping the work when identical content is already there."""
+    # Hashing runs unlocked; the copy itself lands atomically, so a racing ingest only repeats work.
+    if os.path.exists(dst_path) and _is_same_file(src_path, dst_path):
+        print(f"[Ingest] Reusing existing {dst_path}")
+        return dst_path
+    with _destination_lock(dst_path):
+        method = link_or_copy(src_path, dst_path)
+    print(f"[Ingest] {os.path.basename(src_path)} -> {dst_path} ({method})")
+    return dst_path
+
+
+def ingest_by_content(src_path, dst_dir, prefix, default_ext=""):
+    """Places src_path in dst_dir under a content-addressed name; repeated uploads resolve to one file."""
+    ext = os.path.splitext(src_path)[1] or default_ext
+    filename = f"{prefix}_{file_digest(src_path)[:HASH_NAME_LENGTH]}{ext}"
+    dst_path = os.path.join(dst_dir, filename)
+    with _destination_lock(dst_path):
+        if os.path.exists(dst_path) and os.path.getsize(dst_path) == os.path.getsize(src_path):
+            print(f"[Ingest] Reusing existing {dst_path}")
+            return dst_path
+        method = link_or_copy(src_path, dst_path)
+    print(f"[Ingest] {os.path.basename(src_path)} -> {dst_path} ({method})")
+    return dst_path
@@ -0,0 +1,67 @@
+import math
+from functools import partial
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+CONTEXT_MARGIN_RATIO = 0.25
+MIN_CONTEXT_MARGIN = 32
+FEATHER_RADIUS = 16
+SD15_TARGET_PIXELS = 512 * 512
+DEFAULT_TARGET_PIXELS = 1024 * 1024
+
+
+def plan_inpaint_crop(image_size, mask_alpha_np, target_pixels, multiple=16):
+    width, height = image_size
+    if width * height <= target_pixels:
+        return None
+
+    ys, xs = np.nonzero(mask_alpha_np > 0)
+    if len(xs) == 0:
+        return None
+
+    x0, x1 = int(xs.min()), int(xs.max()) + 1
+    y0, y1 = int(ys.min()), int(ys.max()) + 1
+    margin = max(MIN_CONTEXT_MARGIN, int(max(x1 - x0, y1 - y0) * CONTEXT_MARGIN_RATIO))
+    x0, y0 = max(0, x0 - margin), max(0, y0 - margin)
+    x1, y1 = min(width, x1 + margin), min(height, y1 + margin)
+
+    crop_width, crop_height = x1 - x0, y1 - y0
+    scale = math.sqrt(target_pixels / (crop_width * crop_height))
+    target_width = max(multiple, round(crop_width * scale / multiple) * multiple)
+    target_height = max(multiple, round(crop_height * scale / multiple) * multiple)
+    return {"box": (x0, y0, x1, y1), "size": (target_width, target_height)}
+
+
+def stitch_inpaint_outputs(output_paths, original_image, mask_alpha_np, crop, feather=FEATHER_RADIUS):
+    x0, y0, x1, y1 = crop["box"]
+    region_mask = Image.fromarray(mask_alpha_np[y0:y1, x0:x1].astype(np.uint8), mode="L")
+    weight = np.asarray(region_mask.filter(ImageFilter.GaussianBlur(feather)), dtype=np.float32) / 255.0
+    weight = np.clip(weight * 2.0, 0.0, 1.0)[..., None]
+    base_region = np.asarray(original_image.crop(crop["box"]), dtype=np.float32)
+
+    for path in output_paths:
+        with Image.open(path) as result:
+            result_region = result.convert("RGB").resize((x1 - x0, y1 - y0), Image.LANCZOS)
+        blended = base_region * (1.0 - weight) + np.asarray(result_region, dtype=np.float32) * weight
+        stitched = original_image.copy()
+        stitched.paste(Image.fromarray(np.clip(blended + 0.5, 0, 255).astype(np.uint8), mode="RGB"), (x0, y0))
+        stitched.save(path)
+        print(f"[InpaintCrop] Stitched {x1 - x0}x{y1 - y0} region back into {stitched.width}x{stitched.height} image: {path}")
+    return output_paths
+
+
+def prepare_inpaint_crop(composite_image, mask_alpha_np, target_pixels=DEFAULT_TARGET_PIXELS, multiple=16):
+    crop = plan_inpaint_crop(composite_image.size, mask_alpha_np, target_pixels, multiple)
+    if not crop:
+        return composite_image, None
+
+    cropped_image = composite_image.crop(crop["box"]).resize(crop["size"], Image.LANCZOS)
+    print(f"[InpaintCrop] Inpainting region {crop['box']} of {composite_image.width}x{composite_image.height} at {crop['size'][0]}x{crop['size'][1]}.")
+    postprocess = partial(
+        stitch_inpaint_outputs,
+        original_image=composite_image.convert("RGB"),
+        mask_alpha_np=np.asarray(mask_alpha_np),
+        crop=crop
+    )
+    return cropped_image, postprocess
@@ -1,7 +1,7 @@
 import gradio as gr
 import os
 from .config import CIVITAI_API_KEY
-from .download_utils import get_lora_path, get_embedding_path
+from .download_utils import prefetch_asset
 from .utils import save_temp_image
 from .yaml_loader import load_and_merge_yaml
 
@@ -21,10 +21,10 @@ def process_lora_inputs(all_ui_values: dict, prefix: str):
     lora_ids_dd = all_ui_values.get(key('loras_file_dropdowns'), [])
     lora_scales = all_ui_values.get(key('loras_scales'), [])
     
+    rows = []
     for i in range(len(lora_sources)):
         scale = lora_scales[i] if i < len(lora_scales) else 1.0
         if scale is not None and scale != 0:
-            name = None
             src = lora_sources[i] if i < len(lora_sources) else None
 
             id_val = None
@@ -33,19 +33,26 @@ def process_lora_inputs(all_ui_values: dict, prefix: str):
             else:
                 id_val = lora_ids_txt[i] if i < len(lora_ids_txt) else None
 
-            if src == "Upload File" and id_val:
-                name = id_val
-            elif src == "File" and id_val:
-                os_specific_subpath = id_val.replace("/", os.sep)
-                name = os.path.join("file", os_specific_subpath)
-            elif src in ["Civitai", "Custom URL"] and id_val:
-                path, status_msg = get_lora_path(src, id_val, CIVITAI_API_KEY)
-                if path is None:
-                    raise gr.Error(f"LoRA '{id_val}' failed to download: {status_msg}")
-                name = path
-            
-            if name:
-                loras.append({"lora_name": name, "strength_model": scale, "strength_clip": scale})
+            download = None
+            if src in ["Civitai", "Custom URL"] and id_val and id_val.strip():
+                download = prefetch_asset("lora", src, id_val, CIVITAI_API_KEY)
+            rows.append((src, id_val, scale, download))
+
+    for src, id_val, scale, download in rows:
+        name = None
+        if src == "Upload File" and id_val:
+            name = id_val
+        elif src == "File" and id_val:
+            os_specific_subpath = id_val.replace("/", os.sep)
+            name = os.path.join("file", os_specific_subpath)
+        elif download is not None:
+            path, status_msg = download.result()
+            if path is None:
+                raise gr.Error(f"LoRA '{id_val}' failed to download: {status_msg}")
+            name = path
+        
+        if name:
+            loras.append({"lora_name": name, "strength_model": scale, "strength_clip": scale})
     return loras
 
 
@@ -58,15 +65,21 @@ def process_embedding_inputs(all_ui_values: dict, prefix: str):
         
     embedding_ids = all_ui_values.get(key('embeddings_ids'), [])
     
+    rows = []
     for i in range(len(embedding_sources)):
-        name = None
         src = embedding_sources[i] if i < len(embedding_sources) else None
         id_val = embedding_ids[i] if i < len(embedding_ids) else None
+        download = None
+        if src in ["Civitai", "Custom URL"] and id_val and id_val.strip():
+            download = prefetch_asset("embedding", src, id_val, CIVITAI_API_KEY)
+        rows.append((src, id_val, download))
 
+    for src, id_val, download in rows:
+        name = None
         if src == "File" and id_val:
             name = id_val
-        elif src in ["Civitai", "Custom URL"] and id_val:
-            path, status_msg = get_embedding_path(src, id_val, CIVITAI_API_KEY)
+        elif download is not None:
+            path, status_msg = download.result()
             if path is None:
                 raise gr.Error(f"Embedding '{id_val}' failed to download: {status_msg}")
             name = path
@@ -2,17 +2,116 @@ import uuid
 import time
 import threading
 import json
+import os
+import tempfile
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable
 import gradio as gr
 
+from core import comfy_api, metrics
+from core.config import MAX_CONCURRENT_JOBS, JOB_TTL_SECONDS, FRONTEND_WORKER_ID
+
 _jobs: Dict[str, Dict[str, Any]] = {}
+_job_contexts: Dict[str, comfy_api.ExecutionContext] = {}
 _jobs_lock = threading.Lock()
+_jobs_changed = threading.Condition(_jobs_lock)
+_job_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix="job")
 
 STATUS_QUEUED = "queued"
 STATUS_PROCESSING = "processing"
 STATUS_COMPLETED = "completed"
 STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = [STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED]
+
+PREVIEW_FILES_TO_KEEP = 2
+MAX_FINISHED_JOBS = 1000
+
+# With several frontend workers, every job change is mirrored to the shared job_store so other workers
+# can read and cancel it; jobs still run in, and are owned by, the worker they were submitted to.
+_store = None
+if FRONTEND_WORKER_ID:
+    from core import job_store as _store
+_publish_lock = threading.Lock()
+STORE_SYNC_INTERVAL_SECONDS = 1.0
+STORE_POLL_INTERVAL_SECONDS = 0.25
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+def _publish(job_id: str):
+    if _store is None:
+        return
+    with _publish_lock:
+        with _jobs_lock:
+            job = _jobs.get(job_id)
+            snapshot = dict(job, task=dict(job["task"]) if job.get("task") is not None else None) if job else None
+        if snapshot is None:
+            return
+        try:
+            _store.save_job(snapshot, FRONTEND_WORKER_ID)
+        except sqlite3.Error as e:
+            print(f"[JobManager] Warning: Could not write job {job_id} to the shared job store: {e}")
+
+
+def _load_shared_job(job_id: str) -> Optional[Dict[str, Any]]:
+    if _store is None:
+        return None
+    try:
+        return _store.load_job(job_id)
+    except sqlite3.Error as e:
+        print(f"[JobManager] Warning: Could not read job {job_id} from the shared job store: {e}")
+        return None
+
+
+def _sync_with_store():
+    """Heartbeats this worker, stops local jobs cancelled from other workers and expires shared rows."""
+    while True:
+        time.sleep(STORE_SYNC_INTERVAL_SECONDS)
+        try:
+            _store.heartbeat(FRONTEND_WORKER_ID)
+            with _jobs_lock:
+                running_ids = [job_id for job_id, job in _jobs.items() if job["status"] in [STATUS_QUEUED, STATUS_PROCESSING]]
+            for job_id in _store.cancelled_job_ids(running_ids):
+                print(f"[JobManager] Job {job_id} was cancelled from another worker.")
+                cancel_job(job_id)
+            _store.fail_orphaned_jobs()
+            _store.prune_finished_jobs(JOB_TTL_SECONDS)
+        except sqlite3.Error as e:
+            print(f"[JobManager] Warning: Shared job store sync failed: {e}")
+
+
+def _collect_metrics():
+    with _jobs_lock:
+        counts = {}
+        for job in _jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+    metrics.jobs.clear()
+    for status, count in counts.items():
+        metrics.jobs.set(count, status=status)
+    metrics.jobs_in_flight.set(counts.get(STATUS_PROCESSING, 0))
+    metrics.jobs_queued.set(counts.get(STATUS_QUEUED, 0))
+
+
+metrics.add_collector(_collect_metrics)
+
+
+def _prune_periodically():
+    """Expires finished jobs even while no new job arrives to trigger create_job's pruning."""
+    while True:
+        time.sleep(PRUNE_INTERVAL_SECONDS)
+        with _jobs_lock:
+            stale_paths = _prune_finished_jobs()
+        remove_files(stale_paths)
+
+
+threading.Thread(target=_prune_periodically, name="job-prune", daemon=True).start()
+
+if _store is not None:
+    _store.register_worker(FRONTEND_WORKER_ID)
+    threading.Thread(target=_sync_with_store, name="job-store-sync", daemon=True).start()
 
 def get_latest_running_job_for_module(module_name: str) -> Optional[Dict[str, Any]]:
     with _jobs_lock:
@@ -29,34 +128,73 @@ def get_latest_running_job_for_module(module_name: str) -> Optional[Dict[str, An
             job_copy = latest_job.copy()
             job_copy.pop('module', None)
             return job_copy
-        return None
 
+    if _store is not None:
+        try:
+            shared_job = _store.find_latest_running_job(module_name)
+        except sqlite3.Error as e:
+            print(f"[JobManager] Warning: Could not query the shared job store: {e}")
+            shared_job = None
+        if shared_job:
+            shared_job.pop('module', None)
+            return shared_job
+    return None
+
+
+def _prune_finished_jobs():
+    """Drops finished jobs older than JOB_TTL_SECONDS, and the oldest ones beyond MAX_FINISHED_JOBS. Caller holds _jobs_lock."""
+    now = time.time()
+    finished = sorted(
+        (job["updated_at"], job_id) for job_id, job in _jobs.items() if job["status"] in FINISHED_STATUSES
+    )
+    excess = len(finished) - MAX_FINISHED_JOBS
+    stale_paths = []
+    for i, (updated_at, job_id) in enumerate(finished):
+        if i >= excess and now - updated_at < JOB_TTL_SECONDS:
+            break
+        stale_paths.extend(_jobs.pop(job_id).get("preview_files", []))
+    return stale_paths
 
-def create_job(ui_values: Dict[str, Any], module: Any) -> str:
-    job_id = uuid.uuid4().hex
+def create_job(ui_values: Dict[str, Any], module: Any, job_id: Optional[str] = None, task: Optional[Dict[str, Any]] = None, **extra) -> str:
+    """
+    Registers a queued job. UI jobs carry ui_values and the module whose run_generation they run.
+    API tasks pass module=None, their own job_id and a public task dict kept up to date with update_task.
+    """
+    job_id = job_id or uuid.uuid4().hex
     with _jobs_lock:
+        stale_paths = _prune_finished_jobs()
         _jobs[job_id] = {
             "id": job_id,
             "status": STATUS_QUEUED,
             "progress_message": "Status: Queued...",
             "result_files": None,
             "error_message": None,
+            "preview_image": None,
             "created_at": time.time(),
             "updated_at": time.time(),
             "ui_values": ui_values, 
-            "module": module 
+            "module": module,
+            "task": task,
+            **extra
         }
+    remove_files(stale_paths)
+    _publish(job_id)
     print(f"[JobManager] Created job {job_id}")
     return job_id
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     with _jobs_lock:
-        return _jobs.get(job_id, {}).copy()
+        job = _jobs.get(job_id)
+        if job is not None:
+            return job.copy()
+    return _load_shared_job(job_id) or {}
 
 def update_job(job_id: str, status: str, progress_message: str = "", result_files: Optional[List[str]] = None, error_message: Optional[str] = None):
     with _jobs_lock:
         if job_id in _jobs:
             job = _jobs[job_id]
+            if job["status"] == STATUS_CANCELLED:
+                return
             job["status"] = status
             if progress_message:
                 job["progress_message"] = progress_message
@@ -65,8 +203,102 @@ def update_job(job_id: str, status: str, progress_message: str = "", result_file
             if error_message:
                 job["error_message"] = error_message
             job["updated_at"] = time.time()
+            _jobs_changed.notify_all()
             print(f"[JobManager] Updated job {job_id}: Status={status}, Message='{progress_message or error_message}'")
-    
+        else:
+            return
+    _publish(job_id)
+
+def remove_files(paths: List[str]):
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def update_job_preview(job_id: str, image_bytes: bytes, extension: str = ".jpg"):
+    with tempfile.NamedTemporaryFile(delete=False, prefix="preview_", suffix=extension) as tmp_file:
+        tmp_file.write(image_bytes)
+        preview_path = tmp_file.name
+
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            stale_paths = [preview_path]
+        else:
+            preview_files = job.setdefault("preview_files", [])
+            preview_files.append(preview_path)
+            stale_paths = preview_files[:-PREVIEW_FILES_TO_KEEP]
+            del preview_files[:-PREVIEW_FILES_TO_KEEP]
+            job["preview_image"] = preview_path
+
+    remove_files(stale_paths)
+    _publish(job_id)
+
+def clear_job_preview(job_id: str):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        stale_paths = job.pop("preview_files", []) if job else []
+        if job is not None:
+            job["preview_image"] = None
+
+    remove_files(stale_paths)
+    _publish(job_id)
+
+def cancel_job(job_id: str) -> bool:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        is_local = job is not None
+        if is_local and job["status"] not in [STATUS_QUEUED, STATUS_PROCESSING]:
+            return False
+    if not is_local:
+        if _store is None:
+            return False
+        try:
+            cancelled = _store.request_cancel(job_id)
+        except sqlite3.Error as e:
+            print(f"[JobManager] Warning: Could not cancel job {job_id} in the shared job store: {e}")
+            return False
+        if cancelled:
+            print(f"[JobManager] Requested cancellation of job {job_id} owned by another worker.")
+        return cancelled
+
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if not job or job["status"] not in [STATUS_QUEUED, STATUS_PROCESSING]:
+            return False
+        job["status"] = STATUS_CANCELLED
+        job["progress_message"] = "Status: Cancelled."
+        if job.get("task") is not None:
+            job["task"]["status"] = STATUS_CANCELLED
+        job["updated_at"] = time.time()
+        _jobs_changed.notify_all()
+        context = _job_contexts.get(job_id)
+
+    _publish(job_id)
+    print(f"[JobManager] Cancelling job {job_id}...")
+    if context:
+        context.cancel()
+    return True
+
+def extract_result_files(updates) -> List[Any]:
+    """Flattens the outputs of one run_generation yield (everything after the status) into a list."""
+    potential_outputs = updates[1:]
+
+    last_item = potential_outputs[-1] if potential_outputs else None
+    if isinstance(last_item, dict) and last_item.get("__type__") == "update":
+        potential_outputs = potential_outputs[:-1]
+
+    current_files = []
+    for item in potential_outputs:
+        if item is None or (isinstance(item, dict) and item.get("__type__") == "update"):
+            continue
+        if isinstance(item, list):
+            current_files.extend(f for f in item if f is not None)
+        else:
+            current_files.append(item)
+    return current_files
 
 def run_job_in_background(job_id: str):
     job_info = get_job(job_id)
@@ -76,53 +308,180 @@ def run_job_in_background(job_id: str):
 
     module = job_info["module"]
     ui_values = job_info["ui_values"]
+    module_name = metrics.module_label(module)
+    context = comfy_api.ExecutionContext(
+        on_preview=lambda image_bytes, extension: update_job_preview(job_id, image_bytes, extension),
+        module_name=module_name,
+    )
+    with _jobs_lock:
+        _job_contexts[job_id] = context
 
     def worker():
+        comfy_api.set_execution_context(context)
+        generation = None
+        started = time.perf_counter()
+        metrics.job_phase_seconds.observe(
+            max(0.0, time.time() - job_info["created_at"]), phase="pool_wait", module=module_name, backend=metrics.backend_label()
+        )
+        context.timings.restart()
         try:
+            if context.is_cancelled():
+                return
             update_job(job_id, STATUS_PROCESSING, "Status: Starting generation...")
             
             final_files = []
-            for updates in module.run_generation(ui_values):
+            generation = module.run_generation(ui_values)
+            for updates in generation:
+                if context.is_cancelled():
+                    break
                 status_message = updates[0]
-                
-                potential_outputs = updates[1:]
-                
-                last_item = potential_outputs[-1] if potential_outputs else None
-                if isinstance(last_item, dict) and last_item.get("__type__") == "update":
-                    potential_outputs = potential_outputs[:-1]
-
-                current_files = []
-                for item in potential_outputs:
-                    if item is None or (isinstance(item, dict) and item.get("__type__") == "update"):
-                        continue
-                    if isinstance(item, list):
-                        current_files.extend(f for f in item if f is not None)
-                    else: 
-                        current_files.append(item)
-                
+                current_files = extract_result_files(updates)
                 if current_files:
                     final_files = current_files
                 
                 update_job(job_id, STATUS_PROCESSING, progress_message=status_message, result_files=final_files)
 
+            if context.is_cancelled():
+                print(f"[JobManager] Job {job_id} stopped after cancellation.")
+                return
+
             last_job_state = get_job(job_id)
             final_files_from_last_state = last_job_state.get('result_files', [])
+            final_message = last_job_state.get('progress_message') or ""
+            if not final_message.startswith("Status: Loaded successfully!"):
+                final_message = "Status: Loaded successfully!"
             
-            update_job(job_id, STATUS_COMPLETED, progress_message="Status: Loaded successfully!", result_files=final_files_from_last_state)
+            update_job(job_id, STATUS_COMPLETED, progress_message=final_message, result_files=final_files_from_last_state)
 
         except Exception as e:
             import traceback
             traceback.print_exc()
             error_msg = f"Error: A critical error occurred: {e}"
             update_job(job_id, STATUS_FAILED, error_message=error_msg)
+        finally:
+            if generation is not None:
+                try:
+                    generation.close()
+                except RuntimeError as e:
+                    print(f"[JobManager] Warning: Generator for job {job_id} did not close cleanly: {e}")
+            comfy_api.set_execution_context(None)
+            with _jobs_lock:
+                _job_contexts.pop(job_id, None)
+                final_status = _jobs.get(job_id, {}).get("status", STATUS_FAILED)
+            metrics.job_duration_seconds.observe(time.perf_counter() - started, module=module_name, status=final_status)
+            metrics.jobs_finished_total.inc(module=module_name, status=final_status)
+            clear_job_preview(job_id)
+            remove_files(job_info.get("temp_files", []))
+
+    _job_executor.submit(worker)
 
-    thread = threading.Thread(target=worker)
-    thread.daemon = True
-    thread.start()
+def update_task(job_id: str, **fields) -> Optional[Dict[str, Any]]:
+    """Merges fields into an API task's public state; a 'status' field also becomes the job status."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None or job.get("task") is None:
+            return None
+        if job["status"] == STATUS_CANCELLED:
+            fields.pop("status", None)
+        job["task"].update(fields)
+        if "status" in fields:
+            job["status"] = fields["status"]
+        job["updated_at"] = time.time()
+        _jobs_changed.notify_all()
+        updated = dict(job, task=dict(job["task"]))
+    _publish(job_id)
+    return updated
+
+def get_task(job_id: str) -> Optional[Dict[str, Any]]:
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            return dict(job["task"]) if job.get("task") is not None else None
+    job = _load_shared_job(job_id)
+    return job["task"] if job else None
+
+def run_task_in_background(job_id: str, target: Callable, *args, on_preview: Optional[Callable] = None,
+                           on_error: Optional[Callable[[Exception], None]] = None, module_name: Optional[str] = None):
+    """
+    Runs target(*args) for an API task on the same bounded pool as UI jobs, inside an ExecutionContext
+    registered like a UI job's, so cancel_job stops the prompts the task queues. target is still called
+    when the task was cancelled while queued and should check get_execution_context().is_cancelled().
+    An exception escaping target goes to on_error(e), which should mark the task failed; without one the
+    task is failed here directly.
+    """
+    context = comfy_api.ExecutionContext(on_preview=on_preview, module_name=module_name)
+    with _jobs_lock:
+        _job_contexts[job_id] = context
+        job = _jobs.get(job_id, {})
+        if job.get("status") == STATUS_CANCELLED:
+            context.cancel_event.set()
+        created_at = job.get("created_at", time.time())
+
+    def worker():
+        comfy_api.set_execution_context(context)
+        metrics.job_phase_seconds.observe(
+            max(0.0, time.time() - created_at), phase="pool_wait", module=context.timings.module, backend=metrics.backend_label()
+        )
+        context.timings.restart()
+        try:
+            target(*args)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            if on_error is not None:
+                on_error(e)
+            else:
+                update_task(job_id, status=STATUS_FAILED, error={"code": "EXECUTION_ERROR", "message": str(e)})
+        finally:
+            comfy_api.set_execution_context(None)
+            with _jobs_lock:
+                _job_contexts.pop(job_id, None)
+    return _job_executor.submit(worker)
+
+def wait_for_job(job_id: str, changed: Callable[[Dict[str, Any]], bool], timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+    """
+    Blocks until changed(job) is true, the job finishes or timeout seconds pass, woken by job updates
+    rather than polling. Returns a copy of the job (None if it is unknown).
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with _jobs_lock:
+        is_local = job_id in _jobs
+    if not is_local:
+        return _poll_shared_job(job_id, changed, deadline)
+
+    with _jobs_lock:
+        while True:
+            job = _jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] in FINISHED_STATUSES or changed(job):
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            _jobs_changed.wait(remaining)
+        return dict(job, task=dict(job["task"]) if job.get("task") is not None else None)
+
+def _poll_shared_job(job_id: str, changed: Callable[[Dict[str, Any]], bool], deadline: Optional[float]) -> Optional[Dict[str, Any]]:
+    """wait_for_job for a job owned by another worker: there is no cross-process wakeup, so poll the store."""
+    while True:
+        job = _load_shared_job(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES or changed(job):
+            return job
+        if deadline is not None and time.monotonic() >= deadline:
+            return job
+        time.sleep(STORE_POLL_INTERVAL_SECONDS if deadline is None else max(0.0, min(STORE_POLL_INTERVAL_SECONDS, deadline - time.monotonic())))
 
 def get_completed_jobs(limit: int = 100) -> List[Dict[str, Any]]:
     with _jobs_lock:
         completed = [job.copy() for job in _jobs.values() if job["status"] == STATUS_COMPLETED and job.get("result_files")]
+
+    if _store is not None:
+        local_ids = {job["id"] for job in completed}
+        try:
+            completed.extend(job for job in _store.list_completed_jobs(limit) if job["id"] not in local_ids)
+        except sqlite3.Error as e:
+            print(f"[JobManager] Warning: Could not query the shared job store: {e}")
     
     completed.sort(key=lambda j: j.get("created_at", 0), reverse=True)
     
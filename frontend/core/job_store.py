@@ -0,0 +1,173 @@
+"""
+SQLite (WAL) job table shared by the frontend worker processes.
+
+Each worker keeps running its own jobs in job_manager's memory (they hold the module and the raw
+ui_values) and writes a JSON-friendly copy of every change here, so any worker can read, recover and
+cancel them. A cancel is recorded as the 'cancelled' status, which later writes from the owning worker
+never overwrite; the owner notices it on its next sync and stops the job. Workers heartbeat into the
+workers table; unfinished jobs of a worker that stopped heartbeating are marked failed.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from core.config import CACHE_DIR
+
+JOB_STORE_PATH = os.path.join(CACHE_DIR, "jobs.sqlite")
+WORKER_TIMEOUT_SECONDS = 15
+
+_RUNNING_STATUSES = ("queued", "processing")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    worker_id TEXT,
+    module TEXT,
+    status TEXT,
+    progress_message TEXT,
+    error_message TEXT,
+    result_files TEXT,
+    preview_image TEXT,
+    task TEXT,
+    created_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_module_status ON jobs(module, status);
+CREATE INDEX IF NOT EXISTS jobs_status_updated ON jobs(status, updated_at);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    pid INTEGER,
+    heartbeat_at REAL
+);
+"""
+
+_local = threading.local()
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(JOB_STORE_PATH, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _json_files(result_files):
+    # Only paths and text survive the trip to another process; in-memory images stay with the owner.
+    if result_files is None:
+        return None
+    return json.dumps([item for item in result_files if isinstance(item, str)])
+
+
+def _row_to_job(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["result_files"] = json.loads(job["result_files"]) if job["result_files"] else None
+    job["task"] = json.loads(job["task"]) if job["task"] else None
+    job["module_name"] = job.pop("module")
+    job["module"] = None
+    job["ui_values"] = None
+    return job
+
+
+def save_job(job, worker_id):
+    module = job.get("module")
+    _connect().execute(
+        """
+        INSERT INTO jobs (id, worker_id, module, status, progress_message, error_message, result_files, preview_image, task, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            status = excluded.status, progress_message = excluded.progress_message, error_message = excluded.error_message,
+            result_files = excluded.result_files, preview_image = excluded.preview_image, task = excluded.task,
+            updated_at = excluded.updated_at
+        WHERE jobs.status != 'cancelled'
+        """,
+        (
+            job["id"], worker_id, module.__name__ if module else None, job["status"], job.get("progress_message"),
+            job.get("error_message"), _json_files(job.get("result_files")), job.get("preview_image"),
+            json.dumps(job["task"], default=str) if job.get("task") is not None else None,
+            job.get("created_at"), job.get("updated_at"),
+        ),
+    )
+
+
+def load_job(job_id):
+    return _row_to_job(_connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+
+def find_latest_running_job(module_name):
+    row = _connect().execute(
+        "SELECT * FROM jobs WHERE module = ? AND status IN (?, ?) ORDER BY updated_at DESC LIMIT 1",
+        (module_name, *_RUNNING_STATUSES),
+    ).fetchone()
+    return _row_to_job(row)
+
+
+def list_completed_jobs(limit):
+    rows = _connect().execute(
+        "SELECT * FROM jobs WHERE status = 'completed' AND result_files IS NOT NULL AND result_files != '[]' "
+        "ORDER BY created_at DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+
+def request_cancel(job_id):
+    cursor = _connect().execute(
+        "UPDATE jobs SET status = 'cancelled', progress_message = 'Status: Cancelled.', updated_at = ? "
+        "WHERE id = ? AND status IN (?, ?)",
+        (time.time(), job_id, *_RUNNING_STATUSES),
+    )
+    return cursor.rowcount > 0
+
+
+def cancelled_job_ids(job_ids):
+    if not job_ids:
+        return []
+    placeholders = ",".join("?" * len(job_ids))
+    rows = _connect().execute(
+        f"SELECT id FROM jobs WHERE status = 'cancelled' AND id IN ({placeholders})", list(job_ids)
+    ).fetchall()
+    return [row["id"] for row in rows]
+
+
+def register_worker(worker_id):
+    """Marks the worker alive and fails the jobs an earlier process with the same id left unfinished."""
+    conn = _connect()
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error_message = 'Error: The worker running this job restarted.', updated_at = ? "
+        "WHERE worker_id = ? AND status IN (?, ?)",
+        (time.time(), worker_id, *_RUNNING_STATUSES),
+    )
+    heartbeat(worker_id)
+
+
+def heartbeat(worker_id):
+    _connect().execute(
+        "INSERT INTO workers (id, pid, heartbeat_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET pid = excluded.pid, heartbeat_at = excluded.heartbeat_at",
+        (worker_id, os.getpid(), time.time()),
+    )
+
+
+def fail_orphaned_jobs():
+    now = time.time()
+    _connect().execute(
+        "UPDATE jobs SET status = 'failed', error_message = 'Error: The worker running this job stopped responding.', updated_at = ? "
+        "WHERE status IN (?, ?) AND worker_id NOT IN (SELECT id FROM workers WHERE heartbeat_at > ?)",
+        (now, *_RUNNING_STATUSES, now - WORKER_TIMEOUT_SECONDS),
+    )
+
+
+def prune_finished_jobs(ttl_seconds):
+    _connect().execute(
+        "DELETE FROM jobs WHERE status NOT IN (?, ?) AND updated_at < ?",
+        (*_RUNNING_STATUSES, time.time() - ttl_seconds),
+    )
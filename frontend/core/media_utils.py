@@ -1,4 +1,3 @@
-import imageio.v2 as iio
 from PIL import Image
 
 def get_media_metadata(file_obj, is_video=False):
@@ -10,6 +9,7 @@ def get_media_metadata(file_obj, is_video=False):
 
     if is_video:
         try:
+            import imageio.v2 as iio
             with iio.get_reader(file_obj, format='ffmpeg') as reader:
                 meta = reader.get_meta_data()
                 size = meta.get('size', meta.get('source_size', (0, 0)))
@@ -0,0 +1,236 @@
+"""
+Prometheus text-format metrics for the job pipeline and the ComfyUI backends, served at /metrics.
+
+Phases of a job, all in comfy_webui_job_phase_seconds{phase, module, backend}:
+    pool_wait    job created -> a job pool thread picks it up
+    input_prep   module work before a prompt is submitted (uploads, preprocessing), minus assembly
+    assembly     WorkflowAssembler construction and assemble()
+    queue_wait   prompt submitted -> first message from ComfyUI about it
+    execution    first message -> prompt finished
+    download     one output file fetched from /view
+
+Metrics are kept per process; with several frontend workers the router's /metrics merges every
+worker's metrics, each sample labelled with its worker index.
+"""
+import threading
+import time
+
+from core.backend_manager import backend_manager
+
+PREFIX = "comfy_webui_"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+UNKNOWN_LABEL = "unknown"
+MAX_TRACKED_PROMPTS = 1000
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, description, label_names=()):
+        self.name = PREFIX + name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    def _render_samples(self, items):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, description, label_names=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                le = 'le="%s"' % _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {count}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {total!r}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+_registry = []
+_collectors = []
+
+job_phase_seconds = Histogram("job_phase_seconds", "Time spent in each phase of a job.", ["phase", "module", "backend"])
+job_duration_seconds = Histogram("job_duration_seconds", "Run time of finished jobs, excluding pool wait.", ["module", "status"])
+jobs_finished_total = Counter("jobs_finished_total", "Finished jobs by final status.", ["module", "status"])
+jobs = Gauge("jobs", "Jobs currently held by this process, by status.", ["status"])
+jobs_in_flight = Gauge("jobs_in_flight", "Jobs currently running in the job pool.")
+jobs_queued = Gauge("jobs_queued", "Jobs waiting for a free slot in the job pool.")
+backend_queue_remaining = Gauge("backend_queue_remaining", "Last queue_remaining reported by each backend.", ["backend"])
+download_bytes_total = Counter("download_bytes_total", "Bytes of output files downloaded from backends.", ["module", "backend"])
+downloads_total = Counter("downloads_total", "Output file downloads from backends, by result.", ["module", "backend", "result"])
+
+
+def add_collector(collector):
+    """Registers a callable run before every scrape, for gauges that are read from live state."""
+    _collectors.append(collector)
+
+
+def render():
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception as e:
+            print(f"[Metrics] Warning: Collector {getattr(collector, '__name__', collector)} failed: {e}")
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def backend_label(backend_url=None):
+    if backend_url is None:
+        return backend_manager.active_backend_name
+    for name, url in backend_manager.backends.items():
+        if url == backend_url:
+            return name
+    return backend_url
+
+
+def module_label(module):
+    name = getattr(module, "__name__", None) or module
+    return name.rsplit(".", 1)[-1] if isinstance(name, str) and name else UNKNOWN_LABEL
+
+
+class PhaseTimer:
+    """Per-job timing of the work between prompts; lives on the job's ExecutionContext."""
+
+    def __init__(self, module_name=None):
+        self.module = module_name or UNKNOWN_LABEL
+        self.segment_started = time.perf_counter()
+        self.assembly_seconds = 0.0
+
+    def add_assembly(self, seconds):
+        self.assembly_seconds += seconds
+
+    def end_preparation(self, backend_url=None):
+        """Called when a prompt is submitted: records the input prep and assembly time since the last prompt."""
+        elapsed = time.perf_counter() - self.segment_started
+        backend = backend_label(backend_url)
+        job_phase_seconds.observe(max(0.0, elapsed - self.assembly_seconds), phase="input_prep", module=self.module, backend=backend)
+        if self.assembly_seconds:
+            job_phase_seconds.observe(self.assembly_seconds, phase="assembly", module=self.module, backend=backend)
+        self.assembly_seconds = 0.0
+        self.segment_started = time.perf_counter()
+
+    def restart(self):
+        self.segment_started = time.perf_counter()
+
+
+_prompts = {}
+_prompts_lock = threading.Lock()
+
+
+def prompt_queued(prompt_id, module_name, backend_url):
+    with _prompts_lock:
+        if len(_prompts) >= MAX_TRACKED_PROMPTS:
+            _prompts.pop(next(iter(_prompts)))
+        _prompts[prompt_id] = {"module": module_name or UNKNOWN_LABEL, "backend": backend_label(backend_url), "queued_at": time.perf_counter(), "started_at": None}
+
+
+def prompt_message(prompt_id):
+    """The first message about a prompt ends its queue wait."""
+    with _prompts_lock:
+        prompt = _prompts.get(prompt_id)
+        if prompt is None or prompt["started_at"] is not None:
+            return
+        prompt["started_at"] = time.perf_counter()
+    job_phase_seconds.observe(prompt["started_at"] - prompt["queued_at"], phase="queue_wait", module=prompt["module"], backend=prompt["backend"])
+
+
+def prompt_finished(prompt_id):
+    with _prompts_lock:
+        prompt = _prompts.pop(prompt_id, None)
+    if prompt is not None and prompt["started_at"] is not None:
+        job_phase_seconds.observe(time.perf_counter() - prompt["started_at"], phase="execution", module=prompt["module"], backend=prompt["backend"])
+
+
+def observe_download(module_name, backend_url, seconds, size=None):
+    module_name = module_name or UNKNOWN_LABEL
+    backend = backend_label(backend_url)
+    downloads_total.inc(module=module_name, backend=backend, result="ok" if size is not None else "error")
+    if size is not None:
+        job_phase_seconds.observe(seconds, phase="download", module=module_name, backend=backend)
+        download_bytes_total.inc(size, module=module_name, backend=backend)
+
+
+def create_router():
+    from fastapi import APIRouter, Depends
+    from fastapi.responses import PlainTextResponse
+    from core.rest_api import check_credentials
+
+    router = APIRouter(dependencies=[Depends(check_credentials)])
+
+    @router.get("/metrics")
+    def get_metrics():
+        return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    print("[Metrics] Serving Prometheus metrics at /metrics.")
+    return router
@@ -2,6 +2,7 @@ import os
 import yaml
 import shutil
 import subprocess
+import threading
 import requests
 from tqdm import tqdm
 from huggingface_hub import hf_hub_download
@@ -10,6 +11,7 @@ from core.config import (
     HUGGINGFACE_TOKEN
 )
 from core.yaml_loader import load_and_merge_yaml
+from core.civitai_cache import civitai_cache
 
 def _get_proxies():
     proxies = {}
@@ -28,13 +30,8 @@ def _get_civitai_final_url(model_version_id: str):
             if r.status_code in [301, 302, 307] and 'Location' in r.headers:
                 return r.headers['Location']
             else:
-                api_url = f"https://civitai.com/api/v1/model-versions/{model_version_id}"
-                response = requests.get(api_url, timeout=10, proxies=_get_proxies(), headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                if data.get('files'):
-                    return data['files'][0].get('downloadUrl')
-                return None
+                file_info = civitai_cache.get_file_info(model_version_id)
+                return file_info.get('downloadUrl') if file_info else None
     except requests.RequestException as e:
         print(f"  ❌ Error resolving Civitai URL: {e}")
         return None
@@ -83,12 +80,13 @@ def _download_with_aria2(url, destination_path):
         return False
 
 def _download_with_requests(url, destination_path):
+    temp_path = f"{destination_path}.{os.getpid()}.{threading.get_ident()}.part"
     try:
         with requests.get(url, stream=True, proxies=_get_proxies(), timeout=20) as r:
             r.raise_for_status()
             total_size = int(r.headers.get('content-length', 0))
             
-            with open(destination_path, 'wb') as f, tqdm(
+            with open(temp_path, 'wb') as f, tqdm(
                 total=total_size, unit='iB', unit_scale=True,
                 desc=f"  Downloading {os.path.basename(destination_path)}",
                 leave=False
@@ -97,15 +95,16 @@ def _download_with_requests(url, destination_path):
                     pbar.update(len(chunk))
                     f.write(chunk)
 
-        if total_size != 0 and os.path.getsize(destination_path) != total_size:
+        if total_size != 0 and os.path.getsize(temp_path) != total_size:
             raise IOError("Downloaded file size does not match expected size.")
+        os.replace(temp_path, destination_path)
             
         tqdm.write(f"  ✔ Successfully downloaded with Requests.")
         return True
     except Exception as e:
         tqdm.write(f"  ❌ [Requests Download Error] {e}")
-        if os.path.exists(destination_path):
-            os.remove(destination_path)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
         return False
 
 def check_and_download_models():
@@ -210,4 +209,16 @@ def check_and_download_models():
                 download_successful = True
         
         if not download_successful:
-            tqdm.write(f"  ❌ All download methods failed for {filename}.")
\ No newline at end of file
+            tqdm.write(f"  ❌ All download methods failed for {filename}.")
+
+def run_startup_model_check():
+    """check_and_download_models framed for the startup log; a failure is reported and startup continues."""
+    try:
+        print("="*50)
+        print("Starting model check and download process...")
+        check_and_download_models()
+        print("Model check and download process finished.")
+        print("="*50)
+    except Exception as e:
+        print(f"An error occurred during the model download process: {e}")
+        print("Continuing with application startup...")
@@ -0,0 +1,144 @@
+import base64
+import io
+import mimetypes
+import os
+import tempfile
+import threading
+
+import gradio as gr
+from PIL import Image
+
+INPUT_COMPONENT_TYPES = (gr.State, gr.Textbox, gr.Slider, gr.Dropdown, gr.Number, gr.Checkbox, gr.Radio, gr.Image, gr.Video, gr.Audio, gr.UploadButton, gr.ImageEditor)
+INPUT_LIST_COMPONENT_TYPES = (gr.State, gr.Textbox, gr.Slider, gr.Dropdown, gr.Number, gr.Checkbox, gr.UploadButton, gr.Image)
+RESERVED_COMPONENT_KEYS = ['run_button', 'job_id_state', 'polling_trigger', 'status_bar', 'last_status_message_state', 'live_preview', 'last_preview_state']
+
+
+def is_module_input(key, comp):
+    is_input_type = isinstance(comp, INPUT_COMPONENT_TYPES)
+    is_input_list = isinstance(comp, list) and all(isinstance(c, INPUT_LIST_COMPONENT_TYPES) for c in comp)
+    return (is_input_type or is_input_list) and 'output_' not in key and not key.startswith('info_') and key not in RESERVED_COMPONENT_KEYS
+
+
+def get_module_inputs(components):
+    """Returns {key: component or [components]} for the inputs a module's run_generation receives."""
+    return {key: comp for key, comp in components.items() if is_module_input(key, comp)}
+
+
+_build_lock = threading.Lock()
+
+
+def build_module_inputs(module):
+    """
+    Builds a module's components outside the served UI and returns its inputs, selected the same way as
+    the UI builder. Gradio needs a render context to lay out components, so they are created in a detached
+    container that is never launched and has no events bound.
+    """
+    with _build_lock, gr.Blocks(analytics_enabled=False):
+        components = module.create_ui()
+    return get_module_inputs(components)
+
+
+def _default_value(component):
+    # The browser submits an empty textbox as "", not None.
+    if isinstance(component, gr.Textbox) and component.value is None:
+        return ""
+    return component.value
+
+
+def get_default_values(inputs):
+    return {
+        key: [_default_value(c) for c in comp] if isinstance(comp, list) else _default_value(comp)
+        for key, comp in inputs.items()
+    }
+
+
+def validate_params(inputs, params, extra_keys=()):
+    unknown = set(params) - set(inputs) - set(extra_keys)
+    if unknown:
+        raise ValueError(f"Unknown input(s): {', '.join(sorted(unknown))}.")
+
+
+def _decode_data_uri(value):
+    header, encoded = value.split(",", 1)
+    mime_type = header[len("data:"):].split(";", 1)[0]
+    return mime_type, base64.b64decode(encoded)
+
+
+def _media_to_path(value, allowed_roots=None, temp_files=None):
+    """
+    A data: URI is written to a temp file, which is appended to temp_files for the caller to remove.
+    A server path is used as is; with allowed_roots it must resolve inside one of them.
+    """
+    if value.startswith("data:"):
+        mime_type, data = _decode_data_uri(value)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=mimetypes.guess_extension(mime_type) or "") as tmp_file:
+            tmp_file.write(data)
+        if temp_files is not None:
+            temp_files.append(tmp_file.name)
+        return tmp_file.name
+    path = os.path.realpath(os.path.expanduser(value))
+    if allowed_roots is not None:
+        if not any(os.path.commonpath([root, path]) == root for root in map(os.path.realpath, allowed_roots)):
+            raise ValueError(f"Files must be inside {' or '.join(allowed_roots)}: {value}")
+    if not os.path.isfile(path):
+        raise ValueError(f"File not found: {value}")
+    return path
+
+
+def _load_image(value, component, allowed_roots=None):
+    if value.startswith("data:"):
+        image = Image.open(io.BytesIO(_decode_data_uri(value)[1]))
+    else:
+        image = Image.open(_media_to_path(value, allowed_roots))
+    image.load()
+    image_mode = getattr(component, "image_mode", None)
+    return image.convert(image_mode) if image_mode else image
+
+
+def convert_value(component, value, allowed_roots=None, temp_files=None):
+    """
+    Turns a JSON-friendly value (server path or data: URI for media) into what the component would deliver.
+    See _media_to_path for allowed_roots and temp_files.
+    """
+    if isinstance(component, gr.ImageEditor):
+        if isinstance(value, str):
+            value = {"background": value}
+        if not isinstance(value, dict) or not isinstance(value.get("background"), str):
+            return value
+        background = _load_image(value["background"], component, allowed_roots).convert("RGBA")
+        layers = []
+        if value.get("mask"):
+            mask = _load_image(value["mask"], None, allowed_roots).convert("L").resize(background.size)
+            layer = Image.new("RGBA", background.size, (255, 255, 255, 0))
+            layer.putalpha(mask)
+            layers.append(layer)
+        return {"background": background, "layers": layers, "composite": background}
+
+    if isinstance(component, gr.Image) and isinstance(value, str):
+        if component.type == "filepath":
+            return _media_to_path(value, allowed_roots, temp_files)
+        image = _load_image(value, component, allowed_roots)
+        if component.type == "numpy":
+            import numpy as np
+            return np.array(image)
+        return image
+
+    if isinstance(component, (gr.Video, gr.Audio)) and isinstance(value, str):
+        return _media_to_path(value, allowed_roots, temp_files)
+    return value
+
+
+def build_ui_values(inputs, defaults, overrides, extra_keys=(), allowed_roots=None, temp_files=None):
+    ui_values = {key: list(value) if isinstance(value, list) else value for key, value in defaults.items()}
+    for key, value in overrides.items():
+        if key in extra_keys:
+            continue
+        component = inputs[key]
+        if isinstance(component, list):
+            values = list(ui_values[key])
+            for i, item in enumerate(value[:len(component)]):
+                values[i] = convert_value(component[i], item, allowed_roots, temp_files)
+            ui_values[key] = values
+        else:
+            ui_values[key] = convert_value(component, value, allowed_roots, temp_files)
+    return ui_values
@@ -0,0 +1,268 @@
+"""
+Cached index of the *_ui.py and *_mcp.py modules under module/ and custom/module/.
+
+Each entry keeps what startup needs from a module (its UI_INFO, or its MCP functions' signatures and
+concurrency limits) together with the mtimes of the files it depends on: its own source, the .py and
+.yaml files next to it, and every frontend module first imported while importing it. While those
+files are unchanged the module is not imported at startup: UI modules are represented by a LazyModule
+and MCP functions by a stand-in with the same signature, and the real import happens on first use.
+
+A helper that another module imported first, or a file added after the entry was recorded, is not
+part of the signature; delete cache/module_manifest.json after changing UI_INFO through such a file.
+"""
+import builtins
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import traceback
+import types
+
+from core.config import CACHE_DIR, FRONTEND_WORKER_ID
+from core import startup_timing
+
+MODULE_DIRS = ["module", "custom/module"]
+MANIFEST_PATH = os.path.join(CACHE_DIR, "module_manifest.json")
+MANIFEST_VERSION = 3
+DEPENDENCY_EXTENSIONS = (".py", ".yaml", ".yml")
+
+UI_SUFFIX = "_ui.py"
+MCP_SUFFIX = "_mcp.py"
+
+
+def _ensure_custom_on_path():
+    if 'custom' not in sys.path:
+        sys.path.insert(0, 'custom')
+
+
+def find_module_files():
+    """Walks MODULE_DIRS once and returns {suffix: [(module_name, path), ...]} for UI and MCP modules."""
+    found = {UI_SUFFIX: [], MCP_SUFFIX: []}
+    for module_dir in MODULE_DIRS:
+        if not os.path.isdir(module_dir):
+            continue
+        for root, _, files in os.walk(module_dir):
+            for filename in files:
+                for suffix, modules in found.items():
+                    if filename.endswith(suffix):
+                        path = os.path.join(root, filename)
+                        module_name = ".".join(os.path.normpath(path[:-3]).split(os.sep))
+                        modules.append((module_name, path))
+    return found
+
+
+def find_module_path(module_name):
+    """Source file of a dotted module name as resolved from the frontend or custom/ directory, or None."""
+    relative_path = os.path.join(*module_name.split(".")) + ".py"
+    for base in ("", "custom"):
+        path = os.path.join(base, relative_path)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def dependency_paths(module_path, imported_paths=()):
+    """module_path, the .py/.yaml files in its directory and imported_paths, as sorted relative paths."""
+    paths = {os.path.relpath(module_path)}
+    directory = os.path.dirname(module_path) or "."
+    try:
+        paths.update(
+            os.path.relpath(os.path.join(directory, filename))
+            for filename in os.listdir(directory) if filename.endswith(DEPENDENCY_EXTENSIONS)
+        )
+    except OSError:
+        pass
+    paths.update(os.path.relpath(path) for path in imported_paths)
+    return sorted(paths)
+
+
+def _frontend_module_files(module_names):
+    files = []
+    for name in module_names:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if path and not os.path.relpath(path).startswith(os.pardir):
+            files.append(path)
+    return files
+
+
+def _file_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    return mtimes
+
+
+class Manifest:
+    def __init__(self):
+        self._entries = {}
+        self._dirty = False
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self._entries = data.get("modules", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, module_name):
+        """The cached entry for module_name if none of its source files changed since it was recorded."""
+        entry = self._entries.get(module_name)
+        if entry is None:
+            return None
+        if _file_mtimes(entry["files"]) != entry["files"]:
+            return None
+        return entry
+
+    def put(self, module_name, source_paths, **data):
+        mtimes = _file_mtimes(sorted(set(source_paths)))
+        if mtimes is None:
+            return
+        entry = {"files": mtimes, **data}
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            return
+        if self._entries.get(module_name) != entry:
+            self._entries[module_name] = entry
+            self._dirty = True
+
+    def save(self):
+        # With several frontend workers they all record the same entries; only the first one writes them.
+        if not self._dirty or FRONTEND_WORKER_ID not in ("", "0"):
+            return
+        temp_path = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "modules": self._entries}, f, indent=1)
+            os.replace(temp_path, MANIFEST_PATH)
+            self._dirty = False
+        except OSError as e:
+            print(f"[Manifest] Could not write {MANIFEST_PATH}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def import_module_timed(module_name, stage="import"):
+    _ensure_custom_on_path()
+    with startup_timing.module_timer(module_name, stage):
+        return importlib.import_module(module_name)
+
+
+def import_module_recorded(module_name):
+    """import_module_timed that also returns the source files of frontend modules the import loaded first."""
+    before = set(sys.modules)
+    module = import_module_timed(module_name)
+    return module, _frontend_module_files(set(sys.modules) - before)
+
+
+class LazyModule:
+    """
+    Stands in for a UI module known from the manifest. __name__ and UI_INFO are served from the manifest;
+    any other attribute imports the module. If that import fails the error is printed once and the
+    module behaves as if it had no such attribute.
+    """
+
+    def __init__(self, module_name, ui_info):
+        self.__name__ = module_name
+        self.UI_INFO = ui_info
+        self._module = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None and self._error is None:
+            with self._lock:
+                if self._module is None and self._error is None:
+                    try:
+                        self._module = import_module_timed(self.__name__)
+                    except Exception as e:
+                        traceback.print_exc()
+                        print(f"Error loading UI module {self.__name__}: {e}")
+                        self._error = e
+        return self._module
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        module = self.load()
+        if module is None:
+            raise AttributeError(f"UI module '{self.__name__}' failed to import: {self._error}")
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module else "not loaded"
+        return f"<LazyModule '{self.__name__}' ({state})>"
+
+
+def _annotation_to_str(annotation):
+    """Builtin types (and unions of them) as source text; None for anything that cannot be rebuilt from builtins."""
+    if annotation is inspect.Parameter.empty:
+        return ""
+    if annotation is None or annotation is type(None):
+        return "None"
+    if isinstance(annotation, str):
+        try:
+            eval(annotation, {"__builtins__": builtins})
+            return annotation
+        except Exception:
+            return None
+    if isinstance(annotation, type) and annotation.__module__ == "builtins":
+        return annotation.__name__
+    if isinstance(annotation, types.UnionType):
+        parts = [_annotation_to_str(arg) for arg in annotation.__args__]
+        return None if None in parts else " | ".join(parts)
+    return None
+
+
+def describe_mcp_function(func):
+    """A JSON-friendly description of func's signature, or None if a stand-in could not reproduce it."""
+    if inspect.isgeneratorfunction(func) or inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+        return None
+    params = []
+    for name, parameter in inspect.signature(func).parameters.items():
+        if parameter.kind not in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY):
+            return None
+        annotation = _annotation_to_str(parameter.annotation)
+        if not annotation:
+            return None
+        param = {"name": name, "annotation": annotation, "kind": parameter.kind.name}
+        if parameter.default is not inspect.Parameter.empty:
+            param["default"] = parameter.default
+        params.append(param)
+    return_annotation = _annotation_to_str(inspect.signature(func).return_annotation)
+    if return_annotation is None:
+        return None
+    return {"name": func.__name__, "doc": func.__doc__, "params": params, "return": return_annotation}
+
+
+def make_lazy_mcp_function(module_name, spec):
+    """A function with the recorded name, docstring and signature that imports module_name on first call."""
+    target = []
+    resolve = lambda annotation: eval(annotation, {"__builtins__": builtins})
+
+    def call(*args, **kwargs):
+        if not target:
+            module = import_module_timed(module_name)
+            target.append(next(f for f in module.MCP_FUNCTIONS if f.__name__ == spec["name"]))
+        return target[0](*args, **kwargs)
+
+    parameters = [
+        inspect.Parameter(
+            param["name"], getattr(inspect.Parameter, param["kind"]),
+            default=param.get("default", inspect.Parameter.empty), annotation=resolve(param["annotation"])
+        )
+        for param in spec["params"]
+    ]
+    call.__name__ = call.__qualname__ = spec["name"]
+    call.__doc__ = spec["doc"]
+    return_annotation = resolve(spec["return"]) if spec["return"] else inspect.Signature.empty
+    call.__annotations__ = {parameter.name: parameter.annotation for parameter in parameters}
+    if spec["return"]:
+        call.__annotations__["return"] = return_annotation
+    call.__signature__ = inspect.Signature(parameters, return_annotation=return_annotation)
+    return call
@@ -5,6 +5,7 @@ from core.backend_manager import backend_manager
 from core.config import WAIT_FOR_ALL_BACKENDS
 
 _node_info_cache = {}
+_backend_node_types = {}
 
 def _fetch_info_from_backend(backend_name, backend_url):
     api_url = f"{backend_url}/object_info"
@@ -70,6 +71,7 @@ def fetch_and_cache_object_info():
         info_dict = all_results.get(backend_name)
         if info_dict:
             merged_info.update(info_dict)
+            _backend_node_types[backend_name] = set(info_dict.keys())
             print(f"[NodeInfoManager] Merged {len(info_dict)} nodes from '{backend_name}'.")
 
     _node_info_cache = merged_info
@@ -81,6 +83,10 @@ def get_node_info(class_type: str):
 def get_all_node_info():
     return _node_info_cache
 
+def get_backends_supporting(class_types) -> list:
+    required = set(class_types)
+    return [name for name, node_types in _backend_node_types.items() if required.issubset(node_types)]
+
 def get_node_input_options(class_type: str, input_name: str) -> list:
     node_info = get_node_info(class_type)
     if not node_info:
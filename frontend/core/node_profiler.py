@@ -0,0 +1,209 @@
+"""
+Per-node execution profile of ComfyUI prompts, built from the websocket messages comfy_api already reads.
+
+A node's wall time runs from its `executing` message to the next one (or the end of the prompt);
+nodes listed in `execution_cached` are recorded as cache hits with no time. Nodes are named by the
+recipe node they came from (WorkflowAssembler stamps node_map names into _meta), falling back to the
+node title and class type for nodes added by injectors or hand-written workflows.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from core.config import CACHE_DIR
+
+EXPORT_PATH = os.path.join(CACHE_DIR, "node_profile.json")
+MAX_RECENT_PROMPTS = 200
+MAX_TRACKED_PROMPTS = 1000
+# Distinct (recipe, model, resolution) aggregates kept; the least recently run is dropped first.
+MAX_AGGREGATE_KEYS = 500
+
+MODEL_INPUTS = ("ckpt_name", "unet_name", "model_name", "diffusion_model", "model")
+
+# (category, substrings of class_type), first match wins.
+CATEGORY_RULES = [
+    ("input", ("LoadImage", "LoadVideo", "LoadAudio", "VHS_Load")),
+    ("model_load", ("Loader", "LoadModel", "ModelLoad")),
+    ("text_encode", ("TextEncode", "CLIPText", "Conditioning")),
+    ("sampling", ("Sampler", "KSampler", "SamplerCustom", "Guider", "Sigmas", "Scheduler")),
+    ("vae_decode", ("VAEDecode",)),
+    ("vae_encode", ("VAEEncode",)),
+    ("save", ("Save", "Preview", "VHS_VideoCombine")),
+]
+
+_lock = threading.Lock()
+_active = {}
+_recent = deque(maxlen=MAX_RECENT_PROMPTS)
+_aggregates = OrderedDict()
+
+
+def categorize(class_type):
+    for category, needles in CATEGORY_RULES:
+        if any(needle in class_type for needle in needles):
+            return category
+    return "other"
+
+
+def _describe_workflow(workflow):
+    """Node names, the recipe, the main model and the output resolution of an API-format workflow."""
+    nodes = {}
+    recipe, model, resolution = None, None, None
+    for node_id, node in workflow.items():
+        if not isinstance(node, dict):
+            continue
+        meta = node.get("_meta") or {}
+        class_type = node.get("class_type", "")
+        inputs = node.get("inputs") or {}
+        recipe = recipe or meta.get("recipe")
+        nodes[str(node_id)] = {
+            "name": meta.get("recipe_node") or meta.get("title") or class_type,
+            "class_type": class_type,
+            "category": categorize(class_type),
+        }
+        if model is None:
+            model = next((inputs[key] for key in MODEL_INPUTS if isinstance(inputs.get(key), str)), None)
+        if resolution is None and isinstance(inputs.get("width"), int) and isinstance(inputs.get("height"), int):
+            resolution = f"{inputs['width']}x{inputs['height']}"
+    return nodes, recipe, model, resolution
+
+
+def prompt_queued(prompt_id, workflow, module_name=None):
+    nodes, recipe, model, resolution = _describe_workflow(workflow or {})
+    with _lock:
+        if len(_active) >= MAX_TRACKED_PROMPTS:
+            _active.pop(next(iter(_active)))
+        _active[prompt_id] = {
+            "prompt_id": prompt_id,
+            "module": module_name,
+            "recipe": recipe or module_name or "unknown",
+            "model": model or "unknown",
+            "resolution": resolution or "unknown",
+            "nodes": nodes,
+            "queued_at": time.time(),
+            "started_at": None,
+            "timeline": [],
+            "running": None,
+        }
+
+
+def _close_running(prompt, now):
+    running = prompt["running"]
+    if running is not None:
+        running["seconds"] = now - running.pop("started")
+        prompt["running"] = None
+
+
+def _node_entry(prompt, node_id, cached):
+    info = prompt["nodes"].get(str(node_id), {"name": str(node_id), "class_type": "", "category": "other"})
+    return {"node_id": str(node_id), **info, "cached": cached, "seconds": 0.0}
+
+
+def on_message(prompt_id, msg_type, data):
+    """Feeds one websocket message about prompt_id into its profile."""
+    if msg_type not in ("execution_start", "execution_cached", "executing"):
+        return
+    now = time.perf_counter()
+    with _lock:
+        prompt = _active.get(prompt_id)
+        if prompt is None:
+            return
+        if prompt["started_at"] is None:
+            prompt["started_at"] = now
+        if msg_type == "execution_cached":
+            prompt["timeline"].extend(_node_entry(prompt, node_id, True) for node_id in data.get("nodes", []))
+        elif msg_type == "executing":
+            _close_running(prompt, now)
+            if data.get("node") is not None:
+                entry = _node_entry(prompt, data["node"], False)
+                entry["started"] = now
+                prompt["timeline"].append(entry)
+                prompt["running"] = entry
+
+
+def prompt_finished(prompt_id, status="finished"):
+    now = time.perf_counter()
+    with _lock:
+        prompt = _active.pop(prompt_id, None)
+        if prompt is None or prompt["started_at"] is None:
+            return
+        _close_running(prompt, now)
+        profile = {
+            "prompt_id": prompt_id,
+            "module": prompt["module"],
+            "recipe": prompt["recipe"],
+            "model": prompt["model"],
+            "resolution": prompt["resolution"],
+            "finished_at": time.time(),
+            "status": status,
+            "total_seconds": now - prompt["started_at"],
+            "nodes": prompt["timeline"],
+        }
+        _recent.append(profile)
+        _add_to_aggregate(profile)
+
+
+def _add_to_aggregate(profile):
+    key = (profile["recipe"], profile["model"], profile["resolution"])
+    aggregate = _aggregates.get(key)
+    if aggregate is None:
+        aggregate = _aggregates[key] = {"runs": 0, "total_seconds": 0.0, "categories": {}, "nodes": {}}
+        while len(_aggregates) > MAX_AGGREGATE_KEYS:
+            _aggregates.popitem(last=False)
+    else:
+        _aggregates.move_to_end(key)
+    aggregate["runs"] += 1
+    aggregate["total_seconds"] += profile["total_seconds"]
+    for node in profile["nodes"]:
+        aggregate["categories"][node["category"]] = aggregate["categories"].get(node["category"], 0.0) + node["seconds"]
+        stats = aggregate["nodes"].setdefault(node["name"], {
+            "class_type": node["class_type"], "category": node["category"], "runs": 0, "cached": 0, "seconds": 0.0,
+        })
+        stats["runs"] += 1
+        stats["cached"] += int(node["cached"])
+        stats["seconds"] += node["seconds"]
+
+
+def get_summary():
+    """Aggregates per (recipe, model, resolution), slowest total first, with mean times per run."""
+    with _lock:
+        items = [(key, json.loads(json.dumps(value))) for key, value in _aggregates.items()]
+    summary = []
+    for (recipe, model, resolution), aggregate in items:
+        runs = aggregate["runs"]
+        nodes = [
+            {"name": name, **stats, "mean_seconds": stats["seconds"] / stats["runs"], "cache_hit_rate": stats["cached"] / stats["runs"]}
+            for name, stats in aggregate["nodes"].items()
+        ]
+        nodes.sort(key=lambda node: node["seconds"], reverse=True)
+        summary.append({
+            "recipe": recipe,
+            "model": model,
+            "resolution": resolution,
+            "runs": runs,
+            "total_seconds": aggregate["total_seconds"],
+            "mean_seconds": aggregate["total_seconds"] / runs,
+            "category_seconds": dict(sorted(aggregate["categories"].items(), key=lambda item: item[1], reverse=True)),
+            "nodes": nodes,
+        })
+    summary.sort(key=lambda entry: entry["total_seconds"], reverse=True)
+    return summary
+
+
+def get_recent_profiles(limit=MAX_RECENT_PROMPTS):
+    with _lock:
+        return list(_recent)[-limit:][::-1]
+
+
+def export_json(path=EXPORT_PATH):
+    data = {"exported_at": time.time(), "summary": get_summary(), "recent": get_recent_profiles()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    return path
+
+
+def reset():
+    with _lock:
+        _recent.clear()
+        _aggregates.clear()
@@ -0,0 +1,194 @@
+"""
+Plain HTTP job API served next to the Gradio UI.
+
+    POST   /jobs                       {"module": "<sub tab or module name>", "params": {...}}
+    GET    /jobs/{id}                  status, progress message and result files
+    GET    /jobs/{id}/events           server-sent events until the job finishes
+    GET    /jobs/{id}/files            result files (text results are inlined)
+    GET    /jobs/{id}/files/{index}    download one result file
+    DELETE /jobs/{id}                  cancel
+    GET    /modules, /modules/{name}   available modules, their inputs and defaults
+
+Params are ui_values overrides on top of the module's component defaults; media inputs take
+data: URIs or paths inside ComfyUI's input or output directory. Jobs run through job_manager
+exactly like jobs started from the UI.
+"""
+import json
+import os
+import secrets
+import threading
+
+from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+
+from core import job_manager, module_inputs
+from core.backend_manager import backend_manager
+from core.config import ENABLE_LOGIN, LOGIN_CREDENTIALS, COMFYUI_INPUT_PATH, COMFYUI_OUTPUT_PATH
+
+EVENT_KEEPALIVE_SECONDS = 15
+MEDIA_ROOTS = (COMFYUI_INPUT_PATH, COMFYUI_OUTPUT_PATH)
+
+_basic_auth = HTTPBasic(auto_error=False)
+
+
+def check_credentials(credentials: HTTPBasicCredentials = Depends(_basic_auth)):
+    if not ENABLE_LOGIN:
+        return
+    if credentials:
+        for cred in LOGIN_CREDENTIALS:
+            if (secrets.compare_digest(credentials.username.encode(), str(cred['username']).encode())
+                    and secrets.compare_digest(credentials.password.encode(), str(cred['password']).encode())):
+                return
+    raise HTTPException(status_code=401, detail="Invalid credentials.", headers={"WWW-Authenticate": "Basic"})
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+def _describe_files(job_id, result_files):
+    files = []
+    for index, item in enumerate(result_files or []):
+        if isinstance(item, str) and os.path.isfile(item):
+            files.append({"index": index, "name": os.path.basename(item), "url": f"/jobs/{job_id}/files/{index}"})
+        elif isinstance(item, str):
+            files.append({"index": index, "text": item})
+    return files
+
+
+def _describe_job(job):
+    module = job.get("module")
+    return {
+        "id": job["id"],
+        "module": module.__name__ if module else job.get("module_name"),
+        "status": job["status"],
+        "progress_message": job.get("progress_message"),
+        "error_message": job.get("error_message"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "files": _describe_files(job["id"], job.get("result_files")),
+    }
+
+
+def _get_job_or_404(job_id):
+    job = job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+    return job
+
+
+def create_router(ui_modules, module_component_map):
+    """
+    ui_modules maps sub tab names to modules and module_component_map maps module names to the
+    components built for them; their constructor values are the defaults for omitted params.
+    Modules whose tab has not been built yet (lazy tab loading) get their components built
+    outside the UI on first use.
+    """
+    modules_by_name = {}
+    for sub_tab, module in ui_modules.items():
+        if not hasattr(module, "run_generation"):
+            continue
+        for name in (sub_tab, module.__name__, module.__name__.rsplit(".", 1)[-1]):
+            modules_by_name.setdefault(name, module)
+
+    resolved = {}
+    resolve_lock = threading.Lock()
+
+    def resolve_module(name):
+        if name not in modules_by_name:
+            raise HTTPException(status_code=404, detail=f"Module '{name}' not found. See GET /modules.")
+        module = modules_by_name[name]
+        with resolve_lock:
+            if module.__name__ not in resolved:
+                if module.__name__ in module_component_map:
+                    inputs = module_inputs.get_module_inputs(module_component_map[module.__name__])
+                else:
+                    inputs = module_inputs.build_module_inputs(module)
+                resolved[module.__name__] = (module, inputs, module_inputs.get_default_values(inputs))
+            return resolved[module.__name__]
+
+    router = APIRouter(dependencies=[Depends(check_credentials)])
+
+    @router.get("/modules")
+    def list_modules():
+        return [
+            {"name": sub_tab, "module": module.__name__, "main_tab": module.UI_INFO.get("main_tab")}
+            for sub_tab, module in ui_modules.items() if sub_tab in modules_by_name
+        ]
+
+    @router.get("/modules/{name}")
+    def describe_module(name: str):
+        module, inputs, defaults = resolve_module(name)
+        return {
+            "module": module.__name__,
+            "target_backend": module.UI_INFO.get("target_backend", "default"),
+            "defaults": _jsonable(defaults),
+        }
+
+    @router.post("/jobs", status_code=202)
+    def submit_job(payload: dict = Body(...)):
+        module, inputs, defaults = resolve_module(payload.get("module"))
+        params = payload.get("params") or {}
+        temp_files = []
+        try:
+            module_inputs.validate_params(inputs, params)
+            ui_values = module_inputs.build_ui_values(inputs, defaults, params, allowed_roots=MEDIA_ROOTS, temp_files=temp_files)
+        except (ValueError, OSError) as e:
+            job_manager.remove_files(temp_files)
+            raise HTTPException(status_code=400, detail=str(e))
+
+        backend_manager.switch_backend(module.UI_INFO.get("target_backend", "default"))
+        job_id = job_manager.create_job(ui_values, module, temp_files=temp_files)
+        job_manager.run_job_in_background(job_id)
+        return _describe_job(job_manager.get_job(job_id))
+
+    @router.get("/jobs/{job_id}")
+    def get_job(job_id: str):
+        return _describe_job(_get_job_or_404(job_id))
+
+    @router.delete("/jobs/{job_id}")
+    def cancel_job(job_id: str):
+        _get_job_or_404(job_id)
+        return {"id": job_id, "cancelled": job_manager.cancel_job(job_id)}
+
+    @router.get("/jobs/{job_id}/files")
+    def list_files(job_id: str):
+        job = _get_job_or_404(job_id)
+        return _describe_files(job_id, job.get("result_files"))
+
+    @router.get("/jobs/{job_id}/files/{index}")
+    def download_file(job_id: str, index: int):
+        result_files = _get_job_or_404(job_id).get("result_files") or []
+        if not 0 <= index < len(result_files) or not isinstance(result_files[index], str) or not os.path.isfile(result_files[index]):
+            raise HTTPException(status_code=404, detail=f"Job '{job_id}' has no file #{index}.")
+        return FileResponse(result_files[index], filename=os.path.basename(result_files[index]))
+
+    @router.get("/jobs/{job_id}/events")
+    async def stream_events(job_id: str):
+        job = _get_job_or_404(job_id)
+
+        async def events():
+            current = job
+            while True:
+                last_updated_at = current.get("updated_at")
+                yield f"event: status\ndata: {json.dumps(_describe_job(current), default=str)}\n\n"
+                if current["status"] in job_manager.FINISHED_STATUSES:
+                    yield "event: end\ndata: {}\n\n"
+                    return
+                while True:
+                    # wait_for_job blocks on the job Condition (or polls the shared store), so keep it off the event loop.
+                    current = await run_in_threadpool(
+                        job_manager.wait_for_job, job_id, lambda changed: changed.get("updated_at") != last_updated_at, EVENT_KEEPALIVE_SECONDS
+                    )
+                    if current is None:
+                        return
+                    if current.get("updated_at") != last_updated_at or current["status"] in job_manager.FINISHED_STATUSES:
+                        break
+                    yield ": keepalive\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    print(f"[RestAPI] Serving {len(set(m.__name__ for m in modules_by_name.values()))} module(s) under /jobs.")
+    return router
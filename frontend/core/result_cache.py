@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from core.config import CACHE_DIR, COMFYUI_INPUT_PATH, RESULT_CACHE_MAX_MB
+from core.ingest import file_digest
+
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "results")
+VOLATILE_INPUTS = {"filename_prefix", "file_name", "output_file_path"}
+META_FILENAME = "meta.json"
+CACHE_HIT_STATUS = "Status: Loaded successfully! (cached result)"
+MAX_DIGEST_CACHE_ENTRIES = 4096
+
+_cache_lock = threading.Lock()
+_digest_cache = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def is_enabled():
+    return RESULT_CACHE_MAX_MB > 0
+
+
+def _input_file_digest(path):
+    stat = os.stat(path)
+    signature = (path, stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        digest = _digest_cache.get(signature)
+        if digest is not None:
+            _digest_cache.move_to_end(signature)
+            return digest
+    digest = file_digest(path)
+    with _digest_lock:
+        _digest_cache[signature] = digest
+        while len(_digest_cache) > MAX_DIGEST_CACHE_ENTRIES:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def _normalize_value(value):
+    if isinstance(value, str) and value and not os.path.isabs(value):
+        input_path = os.path.join(COMFYUI_INPUT_PATH, value)
+        if os.path.isfile(input_path):
+            return f"sha256:{_input_file_digest(input_path)}"
+    return value
+
+
+def compute_cache_key(workflow):
+    """
+    Hashes a workflow by node class and parameters, with input files replaced by
+    their content hash and per-run output names dropped.
+    """
+    normalized = {}
+    for node_id, node in workflow.items():
+        inputs = {
+            name: _normalize_value(value)
+            for name, value in node.get("inputs", {}).items()
+            if name not in VOLATILE_INPUTS
+        }
+        normalized[node_id] = {"class_type": node.get("class_type"), "inputs": inputs}
+    encoded = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _entry_dir(key):
+    return os.path.join(RESULT_CACHE_DIR, key[:2], key)
+
+
+def lookup(key):
+    """Returns the cached result ({'text': ...} or {'files': [...]}) for key, or None."""
+    entry_dir = _entry_dir(key)
+    meta_path = os.path.join(entry_dir, META_FILENAME)
+    with _cache_lock:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(meta_path)
+
+        if "files" in meta:
+            files = []
+            for filename in meta["files"]:
+                cached_path = os.path.join(entry_dir, filename)
+                local_file = tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename.split('_', 1)[-1]}")
+                files.append(local_file.name)
+                try:
+                    with local_file, open(cached_path, "rb") as cached_file:
+                        shutil.copyfileobj(cached_file, local_file)
+                except OSError:
+                    # A partial hit is a miss; drop the copies made so far.
+                    for path in files:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    return None
+            return {"files": files}
+    return {"text": meta.get("text")}
+
+
+def store(key, text=None, files=None):
+    entry_dir = _entry_dir(key)
+    temp_dir = f"{entry_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+    meta = {"created": time.time()}
+    try:
+        os.makedirs(temp_dir, exist_ok=True)
+        if files is not None:
+            meta["files"] = []
+            for i, path in enumerate(files):
+                filename = f"{i}_{os.path.basename(path)}"
+                shutil.copyfile(path, os.path.join(temp_dir, filename))
+                meta["files"].append(filename)
+        else:
+            meta["text"] = text
+        with open(os.path.join(temp_dir, META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        with _cache_lock:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+    except OSError as e:
+        print(f"[ResultCache] Could not store result {key[:12]}: {e}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+    evict()
+
+
+def evict(max_bytes=None):
+    """Removes least recently used entries until the cache fits in max_bytes."""
+    max_bytes = RESULT_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    with _cache_lock:
+        for shard in os.scandir(RESULT_CACHE_DIR) if os.path.isdir(RESULT_CACHE_DIR) else []:
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                meta_path = os.path.join(entry.path, META_FILENAME)
+                if not entry.is_dir() or not os.path.exists(meta_path):
+                    continue
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                entries.append((os.stat(meta_path).st_mtime, size, entry.path))
+                total += size
+
+        if total <= max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            if total <= max_bytes:
+                break
+    print(f"[ResultCache] Evicted entries down to {total / (1024 * 1024):.1f} MB.")
@@ -1,8 +1,13 @@
 import gradio as gr
 import os
-import shutil
-from .config import LORA_DIR, EMBEDDING_DIR
+from .config import LORA_DIR, EMBEDDING_DIR, BATCH_ROOT
 from .yaml_loader import load_and_merge_yaml
+from .file_index import file_index
+from .download_utils import is_prefetchable, prefetch_asset
+from .ingest import ingest_file
+
+LORA_FILE_EXTENSIONS = ('.safetensors', '.pt', '.bin', '.ckpt')
+LORA_FILE_ROOT = os.path.join(LORA_DIR, "file")
 
 def get_ui_constants():
     """Loads constants for shared UI components."""
@@ -19,7 +24,8 @@ def on_lora_upload(file_obj):
     
     basename = os.path.basename(file_obj.name)
     new_path = os.path.join(lora_upload_dir, basename)
-    shutil.copy(file_obj.name, new_path)
+    ingest_file(file_obj.name, new_path)
+    file_index.invalidate(LORA_FILE_ROOT)
     
     relative_path = os.path.join(upload_subdir, basename)
     
@@ -35,12 +41,41 @@ def on_embedding_upload(file_obj):
     
     basename = os.path.basename(file_obj.name)
     new_path = os.path.join(embedding_upload_dir, basename)
-    shutil.copy(file_obj.name, new_path)
+    ingest_file(file_obj.name, new_path)
     
     relative_path = os.path.join(upload_subdir, basename)
     
     return relative_path, "File", relative_path
 
+def on_asset_id_entered(kind, source, id_or_url):
+    """Starts downloading a Civitai/URL asset as soon as its ID is entered, ahead of the job."""
+    if is_prefetchable(source, id_or_url):
+        prefetch_asset(kind, source, id_or_url)
+
+def get_loras_from_dirs(subdirs):
+    """Returns (label, value) choices for LoRA files under LORA_DIR/file/<subdir>."""
+    if not subdirs:
+        return []
+
+    all_files_with_labels = []
+    for subdir in subdirs:
+        for display_path in file_index.list_files(LORA_FILE_ROOT, subdir, LORA_FILE_EXTENSIONS):
+            value_path = display_path
+            display_name = display_path[len(subdir) + 1:] if display_path.startswith(f"{subdir}/") else display_path
+            all_files_with_labels.append((display_name, value_path))
+
+    return sorted(all_files_with_labels, key=lambda x: x[0])
+
+def create_batch_ui(components, outputs_hint):
+    """Adds the server-side directory batch inputs ('batch_input_path', 'batch_overwrite') to a tool."""
+    with gr.Accordion("Batch Mode (Server Directory)", open=False):
+        gr.Markdown(
+            f"💡 **Tip:** Enter a directory or glob below `{BATCH_ROOT}` on the server (e.g. `train` or `train/**/*.png`) to process every image in it "
+            f"instead of the uploaded one. {outputs_hint} Images that already have outputs are skipped, so a stopped batch resumes where it left off."
+        )
+        components['batch_input_path'] = gr.Textbox(label="Directory or Glob", placeholder="Leave empty to process the uploaded image")
+        components['batch_overwrite'] = gr.Checkbox(label="Overwrite Existing Outputs", value=False)
+
 def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=None, accordion_label="LoRA Settings"):
     """Creates the UI for LoRA settings and adds them to the components dict."""
     key = lambda name: f"{prefix}_{name}"
@@ -49,7 +84,7 @@ def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=
 
     if required_lora_dirs and isinstance(required_lora_dirs, list):
         for subdir in required_lora_dirs:
-            full_path = os.path.join(LORA_DIR, "file", subdir)
+            full_path = os.path.join(LORA_FILE_ROOT, subdir)
             os.makedirs(full_path, exist_ok=True)
             
     all_lora_dirs = []
@@ -61,32 +96,6 @@ def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=
     base_source_choices = ["Civitai", "Custom URL", "Upload File"]
     lora_source_choices = base_source_choices + ["File"] if all_lora_dirs else base_source_choices
 
-    def get_loras_from_dirs(subdirs):
-        if not subdirs:
-            return []
-        
-        all_files_with_labels = []
-        base_search_path = os.path.join(LORA_DIR, "file")
-
-        for subdir in subdirs:
-            lora_root_dir = os.path.join(base_search_path, subdir)
-            if not os.path.isdir(lora_root_dir):
-                continue
-
-            for root, _, files in os.walk(lora_root_dir):
-                for filename in files:
-                    if filename.lower().endswith(('.safetensors', '.pt', '.bin', '.ckpt')):
-                        full_path = os.path.join(root, filename)
-                        
-                        value_path = os.path.relpath(full_path, base_search_path).replace("\\", "/")
-                        display_path = os.path.relpath(full_path, lora_root_dir).replace("\\", "/")
-                        
-                        display_name = display_path if display_path != filename else filename
-                        
-                        all_files_with_labels.append((display_name, value_path))
-        
-        return sorted(all_files_with_labels, key=lambda x: x[0])
-
     with gr.Accordion(accordion_label, open=False) as lora_accordion:
         components[key('lora_accordion')] = lora_accordion
         lora_rows, sources, ids_txt, ids_dd, scales, files = [], [], [], [], [], []
@@ -99,12 +108,13 @@ def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=
             key('loras_files'): files
         })
         
+        lora_file_choices = get_loras_from_dirs(all_lora_dirs)
         for i in range(max_loras):
             with gr.Row(visible=(i < 1)) as row:
                 sources.append(gr.Dropdown(label=f"LoRA {i+1}", choices=lora_source_choices, value="Civitai", scale=1, interactive=True))
                 with gr.Column(scale=2, min_width=100):
                     ids_txt.append(gr.Textbox(label="ID/URL/File", placeholder="e.g., 133755", interactive=True, visible=True))
-                    ids_dd.append(gr.Dropdown(label="File", choices=get_loras_from_dirs(all_lora_dirs), interactive=True, visible=False))
+                    ids_dd.append(gr.Dropdown(label="File", choices=lora_file_choices, interactive=True, visible=False))
                 scales.append(gr.Slider(label="Weight", minimum=-1.0, maximum=2.0, step=0.05, value=1.0, scale=2, interactive=True))
                 upload_btn = gr.UploadButton("Upload", file_types=[".safetensors", ".pt", ".bin", ".ckpt"], scale=1)
                 files.append(gr.State(None))
@@ -113,7 +123,9 @@ def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=
 
         def update_lora_input_visibility(source_choice):
             is_file_dropdown = source_choice == "File"
-            return gr.update(visible=not is_file_dropdown), gr.update(visible=is_file_dropdown)
+            if is_file_dropdown:
+                return gr.update(visible=False), gr.update(visible=True, choices=get_loras_from_dirs(all_lora_dirs))
+            return gr.update(visible=True), gr.update(visible=False)
 
         for i in range(max_loras):
             sources[i].change(
@@ -122,6 +134,12 @@ def create_lora_ui(components, prefix, module_lora_dir=None, required_lora_dirs=
                 outputs=[ids_txt[i], ids_dd[i]],
                 show_api=False
             )
+            ids_txt[i].blur(
+                fn=lambda source, id_or_url: on_asset_id_entered("lora", source, id_or_url),
+                inputs=[sources[i], ids_txt[i]],
+                queue=False,
+                show_api=False
+            )
 
         with gr.Row():
             components[key('add_lora_button')] = gr.Button("✚ Add LoRA")
@@ -151,6 +169,12 @@ def create_embedding_ui(components, prefix):
                 files.append(gr.State(None))
                 embedding_rows.append(row)
                 upload_btn.upload(fn=on_embedding_upload, inputs=[upload_btn], outputs=[ids[i], sources[i], files[i]], show_api=False)
+                ids[i].blur(
+                    fn=lambda source, id_or_url: on_asset_id_entered("embedding", source, id_or_url),
+                    inputs=[sources[i], ids[i]],
+                    queue=False,
+                    show_api=False
+                )
         with gr.Row():
             components[key('add_embedding_button')] = gr.Button("✚ Add Embedding")
             components[key('delete_embedding_button')] = gr.Button("➖ Delete Embedding", visible=False)
@@ -0,0 +1,70 @@
+"""
+Startup timing: sequential phases marked from app.main and per-module import/build/event times.
+print_report() prints the slowest entries and writes the full report next to the other caches.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from core.config import CACHE_DIR
+
+REPORT_PATH = os.path.join(CACHE_DIR, "startup_report.json")
+REPORT_TOP_MODULES = 15
+
+_started = time.perf_counter()
+_last_mark = _started
+_phases = []
+_modules = {}
+_lock = threading.Lock()
+
+
+def mark(phase_name):
+    """Records the time since the previous mark (or process start) as phase_name."""
+    global _last_mark
+    now = time.perf_counter()
+    _phases.append((phase_name, now - _last_mark))
+    _last_mark = now
+
+
+def record_module(module_name, stage, seconds):
+    with _lock:
+        stages = _modules.setdefault(module_name, {})
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def module_timer(module_name, stage):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_module(module_name, stage, time.perf_counter() - started)
+
+
+def print_report():
+    total = time.perf_counter() - _started
+    module_totals = sorted(((sum(stages.values()), name, stages) for name, stages in _modules.items()), reverse=True)
+
+    print("=" * 50)
+    print(f"Startup timing ({total:.2f}s until the server was listening):")
+    for phase_name, seconds in _phases:
+        print(f"  {phase_name:<28} {seconds:7.2f}s")
+    if module_totals:
+        print(f"Slowest modules ({len(module_totals)} timed):")
+        for seconds, name, stages in module_totals[:REPORT_TOP_MODULES]:
+            detail = ", ".join(f"{stage} {value:.2f}s" for stage, value in stages.items())
+            print(f"  {seconds:6.2f}s  {name} ({detail})")
+    print("=" * 50)
+
+    report = {
+        "total_seconds": round(total, 3),
+        "phases": [{"phase": name, "seconds": round(seconds, 3)} for name, seconds in _phases],
+        "modules": {name: {stage: round(value, 4) for stage, value in stages.items()} for _, name, stages in module_totals},
+    }
+    try:
+        with open(REPORT_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        print(f"[StartupTiming] Could not write {REPORT_PATH}: {e}")
@@ -0,0 +1,69 @@
+import math
+
+import numpy as np
+from PIL import Image
+
+
+def _axis_positions(length, tile_size, overlap, multiple):
+    if length <= tile_size:
+        return [0]
+    stride = max(tile_size - overlap, multiple)
+    count = math.ceil((length - tile_size) / stride) + 1
+    last = length - tile_size
+    positions = []
+    for i in range(count):
+        position = round(i * last / (count - 1))
+        positions.append(min(last, (position // multiple) * multiple) if i < count - 1 else last)
+    return positions
+
+
+def plan_tiles(width, height, tile_size, overlap, multiple=8):
+    tile_width = min(tile_size, width)
+    tile_height = min(tile_size, height)
+    boxes = []
+    for y in _axis_positions(height, tile_height, overlap, multiple):
+        for x in _axis_positions(width, tile_width, overlap, multiple):
+            boxes.append((x, y, tile_width, tile_height))
+    return boxes
+
+
+def crop_tiles(image, boxes):
+    return [image.crop((x, y, x + w, y + h)) for x, y, w, h in boxes]
+
+
+def scale_boxes(boxes, scale_x, scale_y):
+    return [
+        (round(x * scale_x), round(y * scale_y), round(w * scale_x), round(h * scale_y))
+        for x, y, w, h in boxes
+    ]
+
+
+def _edge_ramp(size, feather, ramp_start, ramp_end):
+    ramp = np.ones(size, dtype=np.float32)
+    if feather <= 0:
+        return ramp
+    steps = (np.arange(size, dtype=np.float32) + 1.0) / (feather + 1.0)
+    if ramp_start:
+        ramp = np.minimum(ramp, steps)
+    if ramp_end:
+        ramp = np.minimum(ramp, steps[::-1])
+    return ramp
+
+
+def blend_tiles(canvas_size, tiles, feather):
+    width, height = canvas_size
+    accumulated = np.zeros((height, width, 3), dtype=np.float32)
+    weights = np.zeros((height, width), dtype=np.float32)
+
+    for (x, y, w, h), tile in tiles:
+        if tile.size != (w, h):
+            tile = tile.resize((w, h), Image.LANCZOS)
+        pixels = np.asarray(tile.convert("RGB"), dtype=np.float32)
+        ramp_x = _edge_ramp(w, feather, x > 0, x + w < width)
+        ramp_y = _edge_ramp(h, feather, y > 0, y + h < height)
+        weight = np.outer(ramp_y, ramp_x)
+        accumulated[y:y + h, x:x + w] += pixels * weight[..., None]
+        weights[y:y + h, x:x + w] += weight
+
+    blended = accumulated / np.maximum(weights, 1e-6)[..., None]
+    return Image.fromarray(np.clip(blended + 0.5, 0, 255).astype(np.uint8), mode="RGB")
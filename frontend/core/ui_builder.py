@@ -1,12 +1,21 @@
 import gradio as gr
 import os
 import time
-from core import job_manager
+from core import job_manager, startup_timing
 
 from core.backend_manager import backend_manager
+from core.module_inputs import is_module_input
 
-def build_gradio_ui(demo: gr.Blocks, ui_tree: dict, ui_modules: dict, layout_config: dict, share_mode: bool):
-    all_components = {}
+def build_gradio_ui(demo: gr.Blocks, ui_tree: dict, ui_modules: dict, layout_config: dict, share_mode: bool, lazy_tabs: bool = False):
+    """
+    With lazy_tabs, only the tab shown on page load is built here. Every other module tab is filled in by
+    a gr.render the first time it becomes visible in a browser session, and that module's events are bound
+    there too, so its components are not part of the returned maps. Modules whose event handlers use
+    another module's components from all_components set UI_INFO["build_eagerly"] = True, as must the
+    modules owning those components; eager modules are always built here.
+    """
+    builder = _LazyTabBuilder(demo) if lazy_tabs else None
+    all_components = _ComponentMap()
     modules_with_handlers = []
     module_component_map = {}
 
@@ -29,7 +38,7 @@ def build_gradio_ui(demo: gr.Blocks, ui_tree: dict, ui_modules: dict, layout_con
     final_tab_order.extend(sorted(discovered_tabs))
 
     with gr.Tabs():
-        for main_tab_name in final_tab_order:
+        for main_tab_index, main_tab_name in enumerate(final_tab_order):
             sub_tab_infos = ui_tree.get(main_tab_name, [])
             
             ordered_sub_tabs_structure = ordered_sub_tabs_map.get(main_tab_name, [])
@@ -57,13 +66,28 @@ def build_gradio_ui(demo: gr.Blocks, ui_tree: dict, ui_modules: dict, layout_con
             if not final_nested_infos:
                 continue
 
-            with gr.TabItem(main_tab_name):
-                build_ui_for_modules(final_nested_infos, ui_modules, all_components, module_component_map, modules_with_handlers)
+            with gr.TabItem(main_tab_name) as main_tab:
+                build_ui_for_modules(final_nested_infos, ui_modules, all_components, module_component_map, modules_with_handlers,
+                                     builder, [main_tab.select], main_tab_index == 0)
+
+    if builder:
+        print(f"[UI Builder] {len(module_component_map)} module(s) built now, {builder.deferred} deferred until their tab is first opened.")
     
     return all_components, module_component_map, modules_with_handlers
 
 
-def build_ui_for_modules(nested_infos, ui_modules, all_components, module_component_map, modules_with_handlers):
+def build_ui_for_modules(nested_infos, ui_modules, all_components, module_component_map, modules_with_handlers,
+                         builder=None, activators=(), shown_on_load=True):
+    """
+    activators are the tab select events that make this level visible; a tab's first child is also
+    shown by its parent's activators. shown_on_load marks the tabs visible before any selection.
+    """
+    def add_module(module, module_activators, module_shown_on_load):
+        if builder is None or module_shown_on_load or module.UI_INFO.get("build_eagerly"):
+            _create_and_bind_module_ui(module, all_components, module_component_map, modules_with_handlers)
+        else:
+            builder.add(module, module_activators, all_components)
+
     is_simple_module = (len(nested_infos) == 1 and 
                         isinstance(nested_infos[0], dict) and 
                         "sub_tab" in nested_infos[0] and 
@@ -72,21 +96,66 @@ def build_ui_for_modules(nested_infos, ui_modules, all_components, module_compon
     if is_simple_module:
         info = nested_infos[0]
         module = ui_modules[info["sub_tab"]]
-        _create_and_bind_module_ui(module, all_components, module_component_map, modules_with_handlers)
+        add_module(module, list(activators), shown_on_load)
     else:
         with gr.Tabs():
-            for item in nested_infos:
-                if "sub_tab" in item:
-                    with gr.TabItem(item["sub_tab"]):
+            for index, item in enumerate(nested_infos):
+                is_default_tab = index == 0
+                tab_name = item["sub_tab"] if "sub_tab" in item else next(iter(item))
+                with gr.TabItem(tab_name) as tab:
+                    tab_activators = [tab.select] + (list(activators) if is_default_tab else [])
+                    if "sub_tab" in item:
                         module = ui_modules[item["sub_tab"]]
-                        _create_and_bind_module_ui(module, all_components, module_component_map, modules_with_handlers)
-                else:
-                    group_name = next(iter(item))
-                    with gr.TabItem(group_name):
-                        build_ui_for_modules(item[group_name], ui_modules, all_components, module_component_map, modules_with_handlers)
+                        add_module(module, tab_activators, shown_on_load and is_default_tab)
+                    else:
+                        build_ui_for_modules(item[tab_name], ui_modules, all_components, module_component_map, modules_with_handlers,
+                                             builder, tab_activators, shown_on_load and is_default_tab)
+
+
+class _ComponentMap(dict):
+    """all_components as handed to create_event_handlers; a lookup of an unbuilt lazy tab's component says so."""
+
+    def __missing__(self, key):
+        raise KeyError(
+            f"Component '{key}' is not built: it belongs to a tab built on first open. "
+            f"Set UI_INFO['build_eagerly'] = True on the modules that share components."
+        )
+
+
+class _LazyTabBuilder:
+    def __init__(self, demo):
+        self.demo = demo
+        self.deferred = 0
+
+    def add(self, module, activators, all_components):
+        """Leaves an empty render in the current tab that builds module once one of activators fires in a session."""
+        is_opened = gr.State(False)
+        for activator in activators:
+            activator(fn=lambda: True, inputs=None, outputs=is_opened, queue=False, show_progress="hidden", show_api=False)
+
+        @gr.render(inputs=[is_opened], triggers=[is_opened.change], show_progress="minimal")
+        def render_module(opened):
+            if not opened:
+                return
+            session_components, session_map, session_handlers = {}, {}, []
+            _create_and_bind_module_ui(module, session_components, session_map, session_handlers)
+            for handler_module in session_handlers:
+                try:
+                    handler_module.create_event_handlers(session_components, _ComponentMap(all_components, **session_components), self.demo)
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    print(f"  - Error binding events for {handler_module.__name__}: {e}")
+
+        self.deferred += 1
 
 
 def _create_and_bind_module_ui(module, all_components, module_component_map, modules_with_handlers):
+    create_ui = getattr(module, "create_ui", None)
+    if create_ui is None:
+        gr.Markdown(f"Module `{module.__name__}` could not be loaded. See the server log for details.")
+        return
+
     recovered_job = job_manager.get_latest_running_job_for_module(module.__name__)
     initial_job_id = None
     initial_polling_val = None
@@ -102,14 +171,19 @@ def _create_and_bind_module_ui(module, all_components, module_component_map, mod
     polling_trigger = gr.Textbox(value=initial_polling_val, visible=False, label="Polling Trigger")
     status_bar = gr.Textbox(value=initial_status_msg, label="Status", interactive=False, show_label=False, container=False)
     last_status_message_state = gr.State(initial_status_msg)
+    live_preview = gr.Image(label="Live Preview", type="filepath", interactive=False, visible=False, height=256)
+    last_preview_state = gr.State(None)
 
-    components = module.create_ui()
+    with startup_timing.module_timer(module.__name__, "build"):
+        components = create_ui()
     
     components.update({
         'job_id_state': job_id_state,
         'polling_trigger': polling_trigger,
         'status_bar': status_bar,
-        'last_status_message_state': last_status_message_state
+        'last_status_message_state': last_status_message_state,
+        'live_preview': live_preview,
+        'last_preview_state': last_preview_state
     })
     
     all_components.update(components)
@@ -133,15 +207,15 @@ def _create_and_bind_module_ui(module, all_components, module_component_map, mod
         for btn in buttons_to_bind:
             btn.click(
                 fn=submit_job,
-                inputs=flat_inputs, 
+                inputs=[job_id_state] + flat_inputs, 
                 outputs=[job_id_state, polling_trigger, last_status_message_state, status_bar],
                 show_api=False
             )
 
         polling_trigger.change(
             fn=check_job_status,
-            inputs=[job_id_state, polling_trigger, last_status_message_state],
-            outputs=[status_bar] + main_outputs + [polling_trigger, last_status_message_state],
+            inputs=[job_id_state, polling_trigger, last_status_message_state, last_preview_state],
+            outputs=[status_bar] + main_outputs + [polling_trigger, last_status_message_state, live_preview, last_preview_state],
             show_progress="hidden",
             show_api=False
         )
@@ -150,19 +224,23 @@ def _collect_module_inputs(components):
     flat_inputs = []
     input_keys = []
     for key, comp in components.items():
-        is_input_type = isinstance(comp, (gr.State, gr.Textbox, gr.Slider, gr.Dropdown, gr.Number, gr.Checkbox, gr.Radio, gr.Image, gr.Video, gr.Audio, gr.UploadButton, gr.ImageEditor))
-        is_input_list = isinstance(comp, list) and all(isinstance(c, (gr.State, gr.Textbox, gr.Slider, gr.Dropdown, gr.Number, gr.Checkbox, gr.UploadButton, gr.Image)) for c in comp)
-        
-        if (is_input_type or is_input_list) and 'output_' not in key and not key.startswith('info_') and key not in ['run_button', 'job_id_state', 'polling_trigger', 'status_bar', 'last_status_message_state']:
+        if is_module_input(key, comp):
             input_keys.append(key)
-            if is_input_list:
+            if isinstance(comp, list):
                 flat_inputs.extend(comp)
             else:
                 flat_inputs.append(comp)
     return flat_inputs, input_keys
 
 def _define_job_functions(components, input_keys, main_outputs, module):
-    def submit_job(*args):
+    def submit_job(current_job_id, *args):
+        if current_job_id:
+            current_job = job_manager.get_job(current_job_id)
+            if current_job.get("status") in [job_manager.STATUS_QUEUED, job_manager.STATUS_PROCESSING]:
+                job_manager.cancel_job(current_job_id)
+                yield current_job_id, str(time.time()), gr.update(), "Status: Cancelling..."
+                return
+
         target_backend = module.UI_INFO.get("target_backend", "default")
         
         yield (gr.update(), gr.update(), gr.update(), f"Status: Switching to '{target_backend}' backend...")
@@ -186,9 +264,9 @@ def _define_job_functions(components, input_keys, main_outputs, module):
         
         yield job_id, str(time.time()), "Status: Ready", "Status: Task queued..."
 
-    def check_job_status(job_id, polling_val, last_status_message):
+    def check_job_status(job_id, polling_val, last_status_message, last_preview):
         if not job_id:
-            return (gr.update(),) * (1 + len(main_outputs)) + (gr.update(every=None), gr.update())
+            return (gr.update(),) * (1 + len(main_outputs)) + (gr.update(every=None), gr.update(), gr.update(), gr.update())
 
         job = job_manager.get_job(job_id)
         status_message = job.get("progress_message") or job.get("error_message", "Status: Unknown")
@@ -257,7 +335,7 @@ def _define_job_functions(components, input_keys, main_outputs, module):
 
         final_updates = [status_update] + output_updates
         
-        if job["status"] in [job_manager.STATUS_COMPLETED, job_manager.STATUS_FAILED]:
+        if job["status"] in job_manager.FINISHED_STATUSES:
             button_update = gr.update(value=module.UI_INFO.get("run_button_text", "Generate"), variant="primary")
             polling_update = gr.update(every=None)
         else:
@@ -268,7 +346,17 @@ def _define_job_functions(components, input_keys, main_outputs, module):
             if isinstance(comp, gr.Button):
                 final_updates[i + 1] = button_update
 
-        final_updates.extend([polling_update, status_message])
+        preview_path = job.get("preview_image")
+        if job["status"] in job_manager.FINISHED_STATUSES or not preview_path:
+            preview_update = gr.update(value=None, visible=False) if last_preview else gr.update()
+            preview_path = None
+        elif preview_path != last_preview and os.path.exists(preview_path):
+            preview_update = gr.update(value=preview_path, visible=True)
+        else:
+            preview_update = gr.update()
+            preview_path = last_preview
+
+        final_updates.extend([polling_update, status_message, preview_update, preview_path])
         return tuple(final_updates)
 
     return submit_job, check_job_status
\ No newline at end of file
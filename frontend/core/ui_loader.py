@@ -1,9 +1,8 @@
 import os
-import importlib
-import sys
 import yaml
 from collections import defaultdict
 from core.yaml_loader import load_and_merge_yaml
+from core import module_manifest
 
 def load_ui_list():
     config = load_and_merge_yaml("ui_list.yaml")
@@ -12,48 +11,54 @@ def load_ui_list():
         return []
     return include_list
 
-def discover_ui_modules(ui_list=None):
+def discover_ui_modules(ui_list=None, manifest=None, module_files=None):
+    """
+    Unchanged modules recorded in the manifest are registered as LazyModules without being imported;
+    the rest are imported and recorded. module_files is the result of module_manifest.find_module_files().
+    """
     ui_tree = defaultdict(list)
     ui_modules = {}
-    
-    if 'custom' not in sys.path:
-        sys.path.insert(0, 'custom')
-
-    ui_dirs_to_scan = ["module", "custom/module"]
+    manifest = manifest or module_manifest.Manifest()
     
     if not ui_list:
         print("UI include list is empty. Discovering all UI modules...")
-        for ui_dir in ui_dirs_to_scan:
-            if not os.path.isdir(ui_dir):
-                continue
-            for root, _, files in os.walk(ui_dir):
-                for filename in files:
-                    if filename.endswith("_ui.py") and filename != "__init__.py":
-                        module_path_parts = os.path.normpath(os.path.join(root, filename[:-3])).split(os.sep)
-                        module_name = ".".join(module_path_parts)
-                        _load_and_register_module(module_name, ui_tree, ui_modules)
+        module_files = module_files or module_manifest.find_module_files()
+        modules_to_load = module_files[module_manifest.UI_SUFFIX]
     else:
         print(f"Loading specified UI modules from ui_list.yaml: {ui_list}")
-        for module_name in ui_list:
-            _load_and_register_module(module_name, ui_tree, ui_modules)
+        modules_to_load = [(module_name, module_manifest.find_module_path(module_name)) for module_name in ui_list]
+
+    cached = 0
+    for module_name, path in modules_to_load:
+        entry = manifest.get(module_name) if path else None
+        if entry is not None:
+            cached += 1
+            if entry.get("ui_info") is not None:
+                _register_module_info(module_name, entry["ui_info"], module_manifest.LazyModule(module_name, entry["ui_info"]), ui_tree, ui_modules)
+        else:
+            _load_and_register_module(module_name, path, ui_tree, ui_modules, manifest)
 
+    manifest.save()
+    print(f"[Manifest] {cached} UI module(s) from the manifest, {len(modules_to_load) - cached} imported.")
     return ui_tree, ui_modules
 
 
-def _load_and_register_module(module_name, ui_tree, ui_modules):
+def _register_module_info(module_name, info, module, ui_tree, ui_modules):
+    if "main_tab" not in info or "sub_tab" not in info:
+        print(f"Skipping module {module_name}: UI_INFO missing 'main_tab' or 'sub_tab'.")
+        return False
+    ui_tree[info["main_tab"]].append(info)
+    ui_modules[info["sub_tab"]] = module
+    return True
+
+
+def _load_and_register_module(module_name, path, ui_tree, ui_modules, manifest):
     try:
-        module = importlib.import_module(module_name)
-        if hasattr(module, "UI_INFO"):
-            info = module.UI_INFO
-            if "main_tab" not in info or "sub_tab" not in info:
-                print(f"Skipping module {module_name}: UI_INFO missing 'main_tab' or 'sub_tab'.")
-                return
-            
-            main_tab_name = info["main_tab"]
-            sub_tab_name = info["sub_tab"]
-            
-            ui_tree[main_tab_name].append(info)
-            ui_modules[sub_tab_name] = module
+        module, imported_paths = module_manifest.import_module_recorded(module_name)
+        info = getattr(module, "UI_INFO", None)
+        if path:
+            manifest.put(module_name, module_manifest.dependency_paths(path, imported_paths), ui_info=info)
+        if info is not None and _register_module_info(module_name, info, module, ui_tree, ui_modules):
             print(f"Successfully loaded UI module: {module_name}")
     except ModuleNotFoundError:
         print(f"Error: UI module '{module_name}' specified in ui_list.yaml not found.")
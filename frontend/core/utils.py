@@ -1,17 +1,36 @@
 import os
 import random
-import shutil
 import traceback
 from PIL import Image
 import numpy as np
 from core.config import COMFYUI_INPUT_PATH
+from core.ingest import ingest_by_content
 from core.comfy_api import run_workflow_and_get_output
 
-def save_temp_image(img):
+EDIT_INPUT_MAX_PIXELS = 2048 * 2048
+
+def fit_image_to_target(img, target_size=None, max_pixels=None):
+    width, height = img.size
+    scale = 1.0
+    if target_size:
+        target_width, target_height = target_size
+        scale = min(scale, max(target_width / width, target_height / height))
+    if max_pixels:
+        scale = min(scale, (max_pixels / (width * height)) ** 0.5)
+    if scale >= 1.0:
+        return img
+
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    print(f"Pre-scaling input image from {width}x{height} to {new_size[0]}x{new_size[1]} before upload.")
+    return img.resize(new_size, Image.BICUBIC, reducing_gap=2.0)
+
+def save_temp_image(img, target_size=None, max_pixels=None):
     if not isinstance(img, Image.Image): return None
+    if target_size or max_pixels:
+        img = fit_image_to_target(img, target_size, max_pixels)
     filename = f"temp_image_{random.randint(10000, 99999)}.png"
     filepath = os.path.join(COMFYUI_INPUT_PATH, filename)
-    img.save(filepath, "PNG")
+    img.save(filepath, "PNG", compress_level=1)
     return os.path.basename(filepath)
 
 def save_temp_audio(audio_path):
@@ -19,24 +38,18 @@ def save_temp_audio(audio_path):
         print(f"Warning: Audio path '{audio_path}' is invalid or does not exist. Cannot save temp audio.")
         return None
     
-    ext = os.path.splitext(audio_path)[1] or ".wav"
-    filename = f"temp_audio_{random.randint(10000, 99999)}{ext}"
-    save_path = os.path.join(COMFYUI_INPUT_PATH, filename)
-    shutil.copy(audio_path, save_path)
+    save_path = ingest_by_content(audio_path, COMFYUI_INPUT_PATH, "temp_audio", default_ext=".wav")
     print(f"Saved temporary audio file to: {save_path}")
-    return os.path.basename(filename)
+    return os.path.basename(save_path)
 
 def save_temp_video(video_path):
     if not video_path or not os.path.exists(video_path):
         print(f"Warning: Video path '{video_path}' is invalid or does not exist. Cannot save temp video.")
         return None
     
-    ext = os.path.splitext(video_path)[1] or ".mp4"
-    filename = f"temp_video_{random.randint(10000, 99999)}{ext}"
-    save_path = os.path.join(COMFYUI_INPUT_PATH, filename)
-    shutil.copy(video_path, save_path)
+    save_path = ingest_by_content(video_path, COMFYUI_INPUT_PATH, "temp_video", default_ext=".mp4")
     print(f"Saved temporary video file to: {save_path}")
-    return os.path.basename(filename)
+    return os.path.basename(save_path)
 
 def create_mask_from_layer(image_editor_output):
     if not image_editor_output or image_editor_output.get('background') is None or not image_editor_output.get('layers'):
@@ -62,6 +75,7 @@ def handle_seed(seed_value: int, max_val: int = 2**32 - 1) -> int:
 def create_simple_run_generation(process_inputs_func, get_ui_updates_func):
     def run_generation(ui_values):
         final_files = []
+        final_status = "Status: Loaded successfully!"
         try:
             yield get_ui_updates_func("Status: Preparing...", final_files)
             
@@ -71,6 +85,7 @@ def create_simple_run_generation(process_inputs_func, get_ui_updates_func):
             for status, output_files in run_workflow_and_get_output(workflow_package):
                 if output_files and isinstance(output_files, list):
                     final_files = output_files
+                    final_status = status
                 
                 yield get_ui_updates_func(status, final_files)
 
@@ -79,7 +94,7 @@ def create_simple_run_generation(process_inputs_func, get_ui_updates_func):
             yield get_ui_updates_func(f"Error: {e}", final_files)
             return
 
-        yield get_ui_updates_func("Status: Loaded successfully!", final_files)
+        yield get_ui_updates_func(final_status, final_files)
     
     return run_generation
 
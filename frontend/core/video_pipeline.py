@@ -0,0 +1,81 @@
+import os
+import glob
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import COMFYUI_INPUT_PATH, VIDEO_SEGMENT_SECONDS
+from core.workflow_utils import get_filename_prefix
+
+MAX_SEGMENT_OUTPUT_FRAMES = 4096
+
+_background_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="video_pipeline")
+
+def start_background_task(func, *args):
+    return _background_executor.submit(func, *args)
+
+def plan_segment_seconds(fps, frames_per_input_frame=1):
+    segment_seconds = VIDEO_SEGMENT_SECONDS
+    if fps and fps > 0:
+        segment_seconds = min(segment_seconds, MAX_SEGMENT_OUTPUT_FRAMES / (fps * frames_per_input_frame))
+    return max(segment_seconds, 1.0)
+
+def should_segment(duration, backend_count, segment_seconds):
+    return backend_count > 1 and duration >= 2 * segment_seconds
+
+def split_video_segments(video_path, segment_seconds):
+    prefix = f"temp_segment_{get_filename_prefix()}"
+    ext = os.path.splitext(video_path)[1] or ".mp4"
+    output_pattern = os.path.join(COMFYUI_INPUT_PATH, f"{prefix}_%03d{ext}")
+    command = [
+        'ffmpeg', '-y', '-i', video_path, '-map', '0:v:0', '-c', 'copy',
+        '-f', 'segment', '-segment_time', f"{segment_seconds:.3f}", '-reset_timestamps', '1',
+        output_pattern
+    ]
+    print(f"Splitting {video_path} into ~{segment_seconds:.1f}s keyframe-aligned segments...")
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    segment_paths = sorted(glob.glob(os.path.join(COMFYUI_INPUT_PATH, f"{prefix}_*{ext}")))
+    print(f"Created {len(segment_paths)} segment(s).")
+    return segment_paths
+
+def count_video_frames(video_path):
+    command = [
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0', '-count_packets',
+        '-show_entries', 'stream=nb_read_packets', '-of', 'csv=p=0', video_path
+    ]
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    return int(result.stdout.strip().split(',')[0])
+
+def concat_video_segments(segment_paths, audio_path=None, audio_filter=None):
+    with tempfile.NamedTemporaryFile('w', delete=False, suffix=".txt", encoding='utf-8') as list_file:
+        for path in segment_paths:
+            escaped_path = os.path.abspath(path).replace("'", "'\\''")
+            list_file.write(f"file '{escaped_path}'\n")
+        list_path = list_file.name
+
+    output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
+    command = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_path]
+    if audio_path:
+        command.extend(['-i', audio_path, '-map', '0:v:0', '-map', '1:a:0'])
+        if audio_filter:
+            command.extend(['-filter:a', audio_filter])
+        command.extend(['-c:v', 'copy', '-c:a', 'aac', '-shortest', output_file])
+    else:
+        command.extend(['-c', 'copy', output_file])
+
+    try:
+        print(f"Concatenating {len(segment_paths)} segment(s). Command: {' '.join(command)}")
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"Final video saved to {output_file}")
+        return output_file
+    finally:
+        remove_files([list_path])
+
+def remove_files(paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+                print(f"Removed temp file: {path}")
+            except Exception as e:
+                print(f"Error removing temp file {path}: {e}")
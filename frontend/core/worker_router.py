@@ -0,0 +1,240 @@
+"""
+Runs FRONTEND_WORKERS copies of app.py on SERVER_PORT+1..N and a small reverse proxy on SERVER_PORT.
+
+Gradio keeps session state (gr.State, lazily built tabs, queued events) in the process that served the
+page, so a browser is pinned to one worker with a cookie and API clients by their session_hash. Job
+state is shared between the workers through core.job_store, so /jobs and MCP task ids work on any of them.
+"""
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from contextlib import asynccontextmanager
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from core.config import FRONTEND_WORKERS, SERVER_PORT, GRADIO_SERVER_NAME, AUTO_DOWNLOAD_MODELS, ENABLE_METRICS
+
+WORKER_COOKIE = "comfy_worker"
+WORKER_HOST = "127.0.0.1"
+RESTART_CHECK_INTERVAL_SECONDS = 2
+MAX_TRACKED_EVENTS = 10000
+
+_HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade",
+}
+_APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+class WorkerPool:
+    def __init__(self, count, base_port):
+        self.ports = [base_port + 1 + i for i in range(count)]
+        self._processes = [None] * count
+        self._stopping = False
+
+    def _start(self, index):
+        env = dict(
+            os.environ,
+            FRONTEND_WORKER_ID=str(index),
+            SERVER_PORT=str(self.ports[index]),
+            GRADIO_SERVER_NAME=WORKER_HOST,
+            FRONTEND_PUBLIC_HOST=GRADIO_SERVER_NAME,
+            FRONTEND_PUBLIC_PORT=str(SERVER_PORT),
+        )
+        self._processes[index] = subprocess.Popen([sys.executable, _APP_PATH], cwd=os.path.dirname(_APP_PATH), env=env)
+        print(f"[WorkerRouter] Started worker {index} (pid {self._processes[index].pid}) on port {self.ports[index]}.")
+
+    def start(self):
+        for index in range(len(self.ports)):
+            self._start(index)
+        threading.Thread(target=self._watch, name="worker-watchdog", daemon=True).start()
+
+    def _watch(self):
+        while not self._stopping:
+            time.sleep(RESTART_CHECK_INTERVAL_SECONDS)
+            for index, process in enumerate(self._processes):
+                if not self._stopping and process is not None and process.poll() is not None:
+                    print(f"[WorkerRouter] Worker {index} exited with code {process.returncode}, restarting.")
+                    self._start(index)
+
+    def stop(self):
+        self._stopping = True
+        for process in self._processes:
+            if process is not None and process.poll() is None:
+                process.terminate()
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                print(f"[WorkerRouter] Worker {index} did not stop, killing it.")
+                process.kill()
+
+
+def _session_hash_from_body(body):
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    return data.get("session_hash") if isinstance(data, dict) else None
+
+
+def _merge_metrics(texts):
+    """Joins each worker's /metrics text into one exposition, adding a worker label to every sample."""
+    families = {}
+    family = None
+    for index, text in texts:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith("#"):
+                parts = line.split(None, 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    headers, _ = families.setdefault(family, ([], []))
+                    if len(headers) < 2:
+                        headers.append(line)
+                continue
+            name, brace, rest = line.partition("{")
+            if brace:
+                separator = "" if rest.startswith("}") else ","
+                sample = f'{name}{{worker="{index}"{separator}{rest}'
+            else:
+                name, _, value = line.partition(" ")
+                sample = f'{name}{{worker="{index}"}} {value}'
+            families.setdefault(family or name, ([], []))[1].append(sample)
+    lines = []
+    for headers, samples in families.values():
+        lines.extend(headers)
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def create_app(pool):
+    worker_count = len(pool.ports)
+    round_robin = itertools.cycle(range(worker_count))
+    event_workers = {}
+    client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5.0))
+
+    def pick_worker(request, body):
+        """Index of the worker holding this request's session; round-robin for requests without one."""
+        cookie = request.cookies.get(WORKER_COOKIE, "")
+        if cookie.isdigit() and int(cookie) < worker_count:
+            return int(cookie)
+        path = request.url.path
+        if path.startswith("/gradio_api/mcp"):
+            return 0
+        if request.method == "GET" and path.startswith("/gradio_api/call/"):
+            event_id = path.rstrip("/").rsplit("/", 1)[-1]
+            if event_id in event_workers:
+                return event_workers[event_id]
+        session_hash = request.query_params.get("session_hash") or (_session_hash_from_body(body) if body else None)
+        if session_hash:
+            return zlib.crc32(session_hash.encode()) % worker_count
+        return next(round_robin)
+
+    async def proxy(request):
+        path = request.url.path
+        reads_body = path.endswith("/queue/join")
+        body = await request.body() if reads_body else None
+        index = pick_worker(request, body)
+
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS]
+        headers.append(("x-forwarded-for", request.client.host if request.client else ""))
+        candidates = [index] + [i for i in range(worker_count) if i != index]
+        upstream = None
+        for candidate in candidates:
+            url = httpx.URL(f"http://{WORKER_HOST}:{pool.ports[candidate]}{path}", query=request.url.query.encode())
+            content = body if reads_body else request.stream()
+            try:
+                upstream = await client.send(client.build_request(request.method, url, headers=headers, content=content), stream=True)
+                index = candidate
+                break
+            except httpx.ConnectError:
+                # A streamed request body cannot be sent twice, so only bodyless or buffered requests fail over.
+                if not reads_body and request.method not in ("GET", "HEAD", "OPTIONS"):
+                    break
+        if upstream is None:
+            return PlainTextResponse("No frontend worker is available yet, try again shortly.", status_code=503)
+
+        response_headers = [
+            (k.encode("latin-1"), v.encode("latin-1"))
+            for k, v in upstream.headers.multi_items() if k.lower() not in _HOP_BY_HOP_HEADERS
+        ]
+        if request.cookies.get(WORKER_COOKIE) != str(index):
+            response_headers.append((b"set-cookie", f"{WORKER_COOKIE}={index}; Path=/; HttpOnly; SameSite=Lax".encode("latin-1")))
+
+        if request.method == "POST" and path.startswith("/gradio_api/call/"):
+            content = await upstream.aread()
+            await upstream.aclose()
+            try:
+                event_id = json.loads(content).get("event_id")
+            except (ValueError, AttributeError):
+                event_id = None
+            if event_id:
+                if len(event_workers) >= MAX_TRACKED_EVENTS:
+                    event_workers.pop(next(iter(event_workers)))
+                event_workers[event_id] = index
+            response = Response(content, status_code=upstream.status_code)
+        else:
+            response = StreamingResponse(upstream.aiter_raw(), status_code=upstream.status_code, background=BackgroundTask(upstream.aclose))
+        response.raw_headers = response_headers
+        return response
+
+    async def metrics(request):
+        # Every worker keeps its own counters, so a proxied scrape would only see one of them.
+        headers = {k: v for k, v in request.headers.items() if k.lower() == "authorization"}
+        texts = []
+        for index, port in enumerate(pool.ports):
+            try:
+                upstream = await client.get(f"http://{WORKER_HOST}:{port}/metrics", headers=headers)
+            except httpx.HTTPError as e:
+                print(f"[WorkerRouter] Warning: Could not read metrics from worker {index}: {e}")
+                continue
+            if upstream.status_code != 200:
+                response = Response(upstream.content, status_code=upstream.status_code)
+                for key in ("content-type", "www-authenticate"):
+                    if key in upstream.headers:
+                        response.headers[key] = upstream.headers[key]
+                return response
+            texts.append((index, upstream.text))
+        if not texts:
+            return PlainTextResponse("No frontend worker is available yet, try again shortly.", status_code=503)
+        return PlainTextResponse(_merge_metrics(texts), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await client.aclose()
+
+    methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+    routes = [Route("/{path:path}", proxy, methods=methods)]
+    if ENABLE_METRICS:
+        routes.insert(0, Route("/metrics", metrics, methods=["GET"]))
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def run():
+    if AUTO_DOWNLOAD_MODELS:
+        # Once here rather than in each worker, so several processes never write the same model file.
+        from core.model_downloader import run_startup_model_check
+        run_startup_model_check()
+    pool = WorkerPool(FRONTEND_WORKERS, SERVER_PORT)
+    print(f"[WorkerRouter] Starting {FRONTEND_WORKERS} frontend workers behind http://{GRADIO_SERVER_NAME}:{SERVER_PORT}")
+    pool.start()
+    try:
+        uvicorn.run(create_app(pool), host=GRADIO_SERVER_NAME, port=SERVER_PORT, log_level="warning")
+    finally:
+        print("[WorkerRouter] Stopping workers...")
+        pool.stop()
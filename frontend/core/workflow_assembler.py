@@ -5,8 +5,10 @@ import importlib.util
 from copy import deepcopy
 import re
 import sys
+import time
 
 from . import node_info_manager
+from .comfy_api import get_execution_context
 from .yaml_loader import load_and_merge_yaml
 
 FRONTEND_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -14,8 +16,15 @@ BASE_RECIPE_DIR = os.path.join(FRONTEND_DIR, "module", "image_gen", "workflow_re
 CUSTOM_RECIPE_DIR = os.path.join(FRONTEND_DIR, "custom", "workflow_recipes")
 
 
+def _record_assembly_time(started):
+    context = get_execution_context()
+    if context:
+        context.timings.add_assembly(time.perf_counter() - started)
+
+
 class WorkflowAssembler:
     def __init__(self, recipe_path, dynamic_values=None, base_path=None):
+        started = time.perf_counter()
         self.base_path = base_path
         self.node_counter = 0
         self.workflow = {}
@@ -24,7 +33,9 @@ class WorkflowAssembler:
         
         self._load_injector_config()
 
+        self.recipe_name = os.path.splitext(os.path.basename(str(recipe_path)))[0]
         self.recipe = self._load_and_merge_recipe(recipe_path, dynamic_values or {})
+        _record_assembly_time(started)
     
     def _load_injector_config(self):
         try:
@@ -180,6 +191,13 @@ class WorkflowAssembler:
         return template
 
     def assemble(self, ui_values):
+        started = time.perf_counter()
+        try:
+            return self._assemble(ui_values)
+        finally:
+            _record_assembly_time(started)
+
+    def _assemble(self, ui_values):
         for name, details in self.recipe['nodes'].items():
             if 'class_type' not in details:
                 raise KeyError(f"Node '{name}' in recipe is missing the required 'class_type' field.")
@@ -196,6 +214,10 @@ class WorkflowAssembler:
             node_data = deepcopy(template)
             unique_id = self._get_unique_id()
             self.node_map[name] = unique_id
+            # Lets node_profiler report ComfyUI's per-node timings under recipe node names. ComfyUI and
+            # result_cache.compute_cache_key only look at class_type and inputs, so _meta never splits a cache key.
+            node_data['_meta']['recipe'] = self.recipe_name
+            node_data['_meta']['recipe_node'] = name
             if 'title' in details: node_data['_meta']['title'] = details['title']
             if 'params' in details:
                 for param, value in details['params'].items():
@@ -0,0 +1,218 @@
+"""
+Journal of every prompt submitted to ComfyUI, for replaying real load with replay.py.
+
+One JSON line per prompt, written when the prompt finishes: the API workflow and extra_data as
+submitted, the backend, the submit time, queue wait and execution time, final status and the
+outputs ComfyUI reported. Lines go through a background thread into gzip segments under
+WORKFLOW_JOURNAL_DIR; a segment is closed after WORKFLOW_JOURNAL_SEGMENT_MB and the oldest closed
+segments are deleted once all of them exceed WORKFLOW_JOURNAL_MAX_MB. Frontend workers each write to
+their own worker-<id> subdirectory under an equal share of that limit, so no worker deletes another's
+open segment. Only the workflow is serialized on the submitting thread, because callers may reuse and
+mutate it for the next prompt.
+"""
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+from core.config import (
+    WORKFLOW_JOURNAL, WORKFLOW_JOURNAL_DIR, WORKFLOW_JOURNAL_MAX_MB, WORKFLOW_JOURNAL_SEGMENT_MB,
+    FRONTEND_WORKER_ID, FRONTEND_WORKERS,
+)
+
+SEGMENT_PATTERN = "journal-*.jsonl.gz"
+FLUSH_INTERVAL_SECONDS = 2.0
+MAX_PENDING_RECORDS = 1000
+MAX_TRACKED_PROMPTS = 1000
+
+if FRONTEND_WORKER_ID:
+    SEGMENT_DIR = os.path.join(WORKFLOW_JOURNAL_DIR, f"worker-{FRONTEND_WORKER_ID}")
+    SEGMENT_DIR_MAX_MB = WORKFLOW_JOURNAL_MAX_MB / FRONTEND_WORKERS
+else:
+    SEGMENT_DIR = WORKFLOW_JOURNAL_DIR
+    SEGMENT_DIR_MAX_MB = WORKFLOW_JOURNAL_MAX_MB
+
+_active = {}
+_active_lock = threading.Lock()
+_records = queue.Queue(maxsize=MAX_PENDING_RECORDS)
+_writer_lock = threading.Lock()
+_writer = None
+_dropped = 0
+
+
+def list_segments(journal_dir=WORKFLOW_JOURNAL_DIR):
+    """Segment files of journal_dir and its worker subdirectories."""
+    return sorted(
+        glob.glob(os.path.join(journal_dir, SEGMENT_PATTERN)) + glob.glob(os.path.join(journal_dir, "worker-*", SEGMENT_PATTERN))
+    )
+
+
+def read_records(journal_dir=WORKFLOW_JOURNAL_DIR):
+    """
+    Yields journal records segment by segment, not in submit order across workers; a segment still
+    being written is read up to its last flush.
+    """
+    for path in list_segments(journal_dir):
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (EOFError, OSError, ValueError) as e:
+            if not isinstance(e, EOFError):
+                print(f"[Journal] Warning: Stopped reading {os.path.basename(path)}: {e}")
+
+
+class _SegmentWriter:
+    def __init__(self):
+        self._raw = None
+        self._gzip = None
+        self._path = None
+
+    def _open(self):
+        os.makedirs(SEGMENT_DIR, exist_ok=True)
+        self._path = os.path.join(SEGMENT_DIR, f"journal-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl.gz")
+        self._raw = open(self._path, "ab")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="ab")
+
+    def write(self, line):
+        if self._gzip is None:
+            self._open()
+        self._gzip.write(line)
+        if self._raw.tell() >= WORKFLOW_JOURNAL_SEGMENT_MB * 1024 * 1024:
+            self.close()
+            self._prune()
+
+    def flush(self):
+        if self._gzip is not None:
+            self._gzip.flush()
+            self._raw.flush()
+
+    def close(self):
+        if self._gzip is not None:
+            self._gzip.close()
+            self._raw.close()
+            print(f"[Journal] Closed segment {os.path.basename(self._path)}.")
+            self._gzip = self._raw = None
+
+    def _prune(self):
+        """Deletes this process's oldest segments; runs right after close, so all of them are closed."""
+        segments = [(path, os.path.getsize(path)) for path in sorted(glob.glob(os.path.join(SEGMENT_DIR, SEGMENT_PATTERN)))]
+        total = sum(size for _, size in segments)
+        limit = SEGMENT_DIR_MAX_MB * 1024 * 1024
+        for path, size in segments:
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                print(f"[Journal] Removed old segment {os.path.basename(path)} to stay under {SEGMENT_DIR_MAX_MB:g} MB.")
+            except OSError as e:
+                print(f"[Journal] Warning: Could not remove {path}: {e}")
+
+
+def _write_loop():
+    segment = _SegmentWriter()
+    while True:
+        try:
+            line = _records.get(timeout=FLUSH_INTERVAL_SECONDS)
+        except queue.Empty:
+            segment.flush()
+            continue
+        if line is None:
+            segment.close()
+            return
+        try:
+            segment.write(line)
+        except OSError as e:
+            print(f"[Journal] Warning: Could not write to the journal: {e}")
+
+
+def _stop_writer():
+    try:
+        _records.put(None, timeout=5)
+    except queue.Full:
+        return
+    _writer.join(timeout=5)
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="workflow-journal", daemon=True)
+                _writer.start()
+                atexit.register(_stop_writer)
+
+
+def prompt_submitted(prompt_id, workflow, extra_data, backend_url, backend_name, module_name=None):
+    if not WORKFLOW_JOURNAL:
+        return
+    try:
+        workflow_json = json.dumps(workflow, ensure_ascii=False, default=str)
+    except (TypeError, ValueError) as e:
+        print(f"[Journal] Warning: Could not record prompt {prompt_id}: {e}")
+        return
+    with _active_lock:
+        if len(_active) >= MAX_TRACKED_PROMPTS:
+            _active.pop(next(iter(_active)))
+        _active[prompt_id] = {
+            "meta": {
+                "prompt_id": prompt_id,
+                "submitted_at": time.time(),
+                "backend": backend_url,
+                "backend_name": backend_name,
+                "module": module_name,
+                "extra_data": extra_data or {},
+            },
+            "workflow_json": workflow_json,
+            "submitted": time.perf_counter(),
+            "started": None,
+            "outputs": {},
+        }
+
+
+def on_message(prompt_id, msg_type, data):
+    if not WORKFLOW_JOURNAL:
+        return
+    with _active_lock:
+        prompt = _active.get(prompt_id)
+        if prompt is None:
+            return
+        if prompt["started"] is None:
+            prompt["started"] = time.perf_counter()
+        if msg_type == "executed" and data.get("output"):
+            prompt["outputs"][str(data.get("node"))] = data["output"]
+
+
+def prompt_finished(prompt_id, status):
+    global _dropped
+    if not WORKFLOW_JOURNAL:
+        return
+    now = time.perf_counter()
+    with _active_lock:
+        prompt = _active.pop(prompt_id, None)
+    if prompt is None:
+        return
+    started = prompt["started"]
+    record = dict(
+        prompt["meta"],
+        status=status,
+        queue_wait_seconds=(started if started is not None else now) - prompt["submitted"],
+        execution_seconds=now - started if started is not None else None,
+        outputs=prompt["outputs"],
+    )
+    # The workflow was serialized at submit time; splice it in instead of parsing it again.
+    line = json.dumps(record, ensure_ascii=False, default=str)[:-1] + ', "workflow": ' + prompt["workflow_json"] + "}\n"
+    _ensure_writer()
+    try:
+        _records.put_nowait(line.encode("utf-8"))
+    except queue.Full:
+        _dropped += 1
+        if _dropped == 1 or _dropped % 100 == 0:
+            print(f"[Journal] Warning: Writer is falling behind, {_dropped} record(s) dropped so far.")
@@ -36,4 +36,9 @@ def process_inputs(params, seed_override=None):
         "textured": os.path.join(COMFYUI_OUTPUT_PATH, textured_relative_path.replace('/', os.sep))
     }
     
-    return workflow, {"expected_files": expected_files}
\ No newline at end of file
+    expected_nodes = {
+        "shape": assembler.node_map.get("save_shape_mesh"),
+        "textured": assembler.node_map.get("save_textured_mesh")
+    }
+    
+    return workflow, {"expected_files": expected_files, "expected_nodes": expected_nodes}
\ No newline at end of file
@@ -1,19 +1,14 @@
 import gradio as gr
-import uuid
-import json
 import urllib.parse
-import websocket
-import os
 import requests
 from PIL import Image
 from io import BytesIO
 import base64
-import time
 
 from .hunyuan3d2_img23d_logic import process_inputs
-from core.comfy_api import queue_prompt
+from core.comfy_api import run_workflow_and_wait_for_outputs
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 
 def _download_and_decode_image(image_url: str = None, image_data: str = None) -> Image.Image:
     try:
@@ -59,47 +54,22 @@ def ModelGen_img2model(
     backend_manager.switch_backend('3d_backend')
 
     workflow, extra_data = process_inputs(params)
-    expected_files = extra_data.get("expected_files", {})
     
-    client_id = uuid.uuid4().hex
-    
-    prompt_response = queue_prompt(workflow, client_id, extra_data)
-    if not prompt_response or 'prompt_id' not in prompt_response:
-        active_url = backend_manager.get_active_backend_url()
-        raise RuntimeError(f"Failed to queue prompt to ComfyUI backend at {active_url}.")
-        
-    prompt_id = prompt_response['prompt_id']
-
-    active_url = backend_manager.get_active_backend_url()
-    ws_url = f"ws://{urllib.parse.urlparse(active_url).netloc}/ws?clientId={client_id}"
-    ws = None
-    try:
-        ws = websocket.create_connection(ws_url)
-        while True:
-            out = ws.recv()
-            if not isinstance(out, str): continue
-            
-            message = json.loads(out)
-            if message.get('type') == 'status' and message.get('data', {}).get('status', {}).get('exec_info', {}).get('queue_remaining') == 0:
-                break
-    finally:
-        if ws: ws.close()
-
-    found_all = False
-    for _ in range(10):
-        if os.path.exists(expected_files.get("shape")) and os.path.exists(expected_files.get("textured")):
-            found_all = True
-            break
-        time.sleep(1)
+    expected_files = None
+    for status, outputs in run_workflow_and_wait_for_outputs((workflow, extra_data)):
+        if status.startswith("Error:"):
+            raise RuntimeError(f"3D model generation failed. {status}")
+        if outputs is not None:
+            expected_files = outputs
 
-    if not found_all:
+    if not expected_files:
         raise RuntimeError("3D model generation failed; output files were not found after execution.")
 
     if request and request.headers and "host" in request.headers:
         scheme = request.headers.get("x-forwarded-proto", "http")
         base_url = f"{scheme}://{request.headers['host']}"
     else:
-        base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+        base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
     
     shape_url = f"{base_url}/gradio_api/file={urllib.parse.quote(expected_files['shape'])}"
     textured_url = f"{base_url}/gradio_api/file={urllib.parse.quote(expected_files['textured'])}"
@@ -2,13 +2,12 @@ import gradio as gr
 import random
 import os
 import shutil
-import time
 import tempfile
 from PIL import Image
 import traceback
 
 from .hunyuan3d2_mv23d_logic import process_inputs
-from core.comfy_api import run_workflow_and_get_output
+from core.comfy_api import run_workflow_and_wait_for_outputs
 
 UI_INFO = {
     "main_tab": "3DGen",
@@ -49,6 +48,15 @@ def get_main_output_components(components: dict):
 def create_event_handlers(components: dict, all_components: dict, demo: gr.Blocks):
     pass
 
+def _copy_for_display(src_path, suffix):
+    if not src_path or not os.path.exists(src_path):
+        return None
+    temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=suffix).name
+    partial_path = f"{temp_path}.part"
+    shutil.copy(src_path, partial_path)
+    os.replace(partial_path, temp_path)
+    return temp_path
+
 def run_generation(ui_values):
     original_run_button_text = UI_INFO["run_button_text"]
     
@@ -60,15 +68,20 @@ def run_generation(ui_values):
     )
     
     shape_model_path, textured_model_path = None, None
-    expected_files = {}
+    named_outputs = None
     
     try:
         workflow, extra_data = process_inputs(ui_values)
-        expected_files = extra_data.get("expected_files", {})
         workflow_package = (workflow, extra_data)
         
-        for status, files in run_workflow_and_get_output(workflow_package):
-            yield (status, gr.update(), gr.update(), gr.update())
+        for status, outputs in run_workflow_and_wait_for_outputs(workflow_package):
+            if outputs is not None:
+                named_outputs = outputs
+            elif status.startswith("Error:"):
+                yield (status, None, None, gr.update())
+                return
+            else:
+                yield (status, gr.update(), gr.update(), gr.update())
 
     except Exception as e:
         traceback.print_exc()
@@ -80,50 +93,21 @@ def run_generation(ui_values):
         )
         return
 
-    finally:
-        print("Workflow finished. Manually checking for output files...")
-        
-        found_all = False
-        for _ in range(5):
-            if os.path.exists(expected_files.get("shape")) and os.path.exists(expected_files.get("textured")):
-                found_all = True
-                break
-            time.sleep(1)
-
-        if not found_all:
-            print("Error: Could not find generated files after workflow completion.")
-            yield (
-                "Error: Output files not found after execution.",
-                None,
-                None,
-                gr.update()
-            )
-            return
-
-        print("Output files found. Copying to temporary location for Gradio.")
-        try:
-            shape_src_path = expected_files.get("shape")
-            if shape_src_path and os.path.exists(shape_src_path):
-                temp_shape_path = tempfile.NamedTemporaryFile(delete=False, suffix="_shape.glb").name
-                shutil.copy(shape_src_path, temp_shape_path)
-                shape_model_path = temp_shape_path
-
-            textured_src_path = expected_files.get("textured")
-            if textured_src_path and os.path.exists(textured_src_path):
-                temp_textured_path = tempfile.NamedTemporaryFile(delete=False, suffix="_textured.glb").name
-                shutil.copy(textured_src_path, temp_textured_path)
-                textured_model_path = temp_textured_path
+    print("Output files are ready. Copying to temporary location for Gradio.")
+    try:
+        shape_model_path = _copy_for_display(named_outputs.get("shape"), "_shape.glb")
+        textured_model_path = _copy_for_display(named_outputs.get("textured"), "_textured.glb")
 
-            yield (
-                "Status: Loaded successfully!",
-                shape_model_path,
-                textured_model_path,
-                gr.update()
-            )
-        except Exception as e:
-            print(f"Error copying files for Gradio: {e}")
-            yield (
-                f"Error: Could not prepare files for display: {e}",
-                None, None,
-                gr.update()
-            )
\ No newline at end of file
+        yield (
+            "Status: Loaded successfully!",
+            shape_model_path,
+            textured_model_path,
+            gr.update()
+        )
+    except Exception as e:
+        print(f"Error copying files for Gradio: {e}")
+        yield (
+            f"Error: Could not prepare files for display: {e}",
+            None, None,
+            gr.update()
+        )
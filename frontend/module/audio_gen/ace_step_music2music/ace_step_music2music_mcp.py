@@ -12,7 +12,7 @@ import tempfile
 from .ace_step_music2music_logic import process_inputs
 from core.comfy_api import queue_prompt
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 
 def _download_and_save_audio(audio_url: str = None, audio_data: str = None) -> str:
     temp_file = None
@@ -111,7 +111,7 @@ def AudioGen_music2music(
                                 scheme = request.headers.get("x-forwarded-proto", "http")
                                 base_url = f"{scheme}://{request.headers['host']}"
                             else:
-                                base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+                                base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
                             final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
                             
                             print(f"[MCP Music2Music] Generation complete. Returning URL: {final_url}")
@@ -8,7 +8,7 @@ import os
 from .ace_step_txt2music_logic import process_inputs
 from core.comfy_api import queue_prompt
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 
 def AudioGen_txt2music(
     tags: str,
@@ -78,7 +78,7 @@ def AudioGen_txt2music(
                                 scheme = request.headers.get("x-forwarded-proto", "http")
                                 base_url = f"{scheme}://{request.headers['host']}"
                             else:
-                                base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+                                base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
                             final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
                             
                             print(f"[MCP Txt2Music] Generation complete. Returning URL: {final_url}")
@@ -6,6 +6,7 @@ from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.utils import create_mask_from_layer, save_temp_image, handle_seed
 from core.workflow_utils import get_filename_prefix
+from core.inpaint_crop import prepare_inpaint_crop
 
 WORKFLOW_RECIPE_PATH = "z_image_inpaint_recipe.yaml"
 PREFIX = "z_image_inpaint"
@@ -27,6 +28,7 @@ def process_inputs(ui_values, seed_override=None):
     
     r, g, b, _ = background_img.split()
     composite_image = Image.merge('RGBA', [r, g, b, new_alpha_pil])
+    composite_image, postprocess_outputs = prepare_inpaint_crop(composite_image, mask_alpha_np)
 
     vals['input_image'] = save_temp_image(composite_image)
 
@@ -44,4 +46,8 @@ def process_inputs(ui_values, seed_override=None):
     vals['filename_prefix'] = get_filename_prefix()
 
     workflow = assembler.assemble(vals)
-    return workflow, {"extra_pnginfo": {"workflow": ""}}
\ No newline at end of file
+
+    extra_data = {"extra_pnginfo": {"workflow": ""}}
+    if postprocess_outputs:
+        extra_data["postprocess_outputs"] = postprocess_outputs
+    return workflow, extra_data
\ No newline at end of file
@@ -1,7 +1,7 @@
 import os
 from core.workflow_assembler import WorkflowAssembler
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 
 ASPECT_RATIO_PRESETS = {
     "1:1 (Square)": (1024, 1024), 
@@ -30,7 +30,7 @@ def process_inputs(ui_values, seed_override=None):
         if i < len(ref_images_list) and ref_images_list[i] is not None:
             all_images.append(ref_images_list[i])
     
-    image_filenames = [save_temp_image(img) for i, img in enumerate(all_images)]
+    image_filenames = [save_temp_image(img, max_pixels=EDIT_INPUT_MAX_PIXELS) for i, img in enumerate(all_images)]
     local_params['image_stitch_chain'] = image_filenames
     local_params['input_image'] = None
 
@@ -2,7 +2,7 @@ import os
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 from core.input_processors import process_lora_inputs
 
 WORKFLOW_RECIPE_PATH = "flux-kontext-dev_recipe.yaml"
@@ -34,7 +34,7 @@ def process_inputs(ui_values, seed_override=None):
         if i < len(ref_images_list) and ref_images_list[i] is not None:
             all_images.append(ref_images_list[i])
     
-    image_filenames = [save_temp_image(img) for i, img in enumerate(all_images)]
+    image_filenames = [save_temp_image(img, max_pixels=EDIT_INPUT_MAX_PIXELS) for i, img in enumerate(all_images)]
     
     lora_chain = process_lora_inputs(local_ui_values, prefix=PREFIX)
     if lora_chain:
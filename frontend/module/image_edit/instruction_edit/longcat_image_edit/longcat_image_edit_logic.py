@@ -2,7 +2,7 @@ import os
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 
 WORKFLOW_RECIPE_PATH = "longcat_image_edit_recipe.yaml"
 TURBO_WORKFLOW_RECIPE_PATH = "longcat_image_edit_turbo_recipe.yaml"
@@ -24,7 +24,7 @@ def process_inputs(ui_values, seed_override=None):
     if main_img is None:
         raise ValueError("Please upload an image to edit.")
 
-    local_ui_values['input_image'] = save_temp_image(main_img)
+    local_ui_values['input_image'] = save_temp_image(main_img, max_pixels=EDIT_INPUT_MAX_PIXELS)
 
     selected_ratio = local_ui_values.get('aspect_ratio', "1:1 (Square)")
     width, height = ASPECT_RATIO_PRESETS.get(selected_ratio, (1024, 1024))
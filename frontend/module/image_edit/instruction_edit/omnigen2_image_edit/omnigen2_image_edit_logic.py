@@ -2,7 +2,7 @@ import os
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 
 WORKFLOW_RECIPE_PATH = "omnigen2-image-edit_recipe.yaml"
 
@@ -31,7 +31,7 @@ def process_inputs(ui_values, seed_override=None):
         if i < len(ref_images_list) and ref_images_list[i] is not None:
             all_images.append(ref_images_list[i])
     
-    image_filenames = [save_temp_image(img) for i, img in enumerate(all_images)]
+    image_filenames = [save_temp_image(img, max_pixels=EDIT_INPUT_MAX_PIXELS) for i, img in enumerate(all_images)]
     local_ui_values['image_stitch_chain'] = image_filenames
     local_ui_values['input_image'] = None
 
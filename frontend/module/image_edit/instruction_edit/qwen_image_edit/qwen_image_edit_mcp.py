@@ -13,7 +13,7 @@ import base64
 from .qwen_image_edit_logic import process_inputs_logic
 from core.comfy_api import queue_prompt
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 from core.workflow_utils import get_filename_prefix
 
 def _download_and_save_image(image_url: str) -> Image.Image:
@@ -159,7 +159,7 @@ def ImageEdit(
                                 scheme = request.headers.get("x-forwarded-proto", "http")
                                 base_url = f"{scheme}://{request.headers['host']}"
                             else:
-                                base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+                                base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
                             final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
                             
                             print(f"[MCP ImageEdit] Generation complete. Returning URL: {final_url}")
@@ -3,7 +3,7 @@ import math
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 from core.input_processors import process_lora_inputs
 from core.yaml_loader import load_and_merge_yaml_from_module
 
@@ -62,7 +62,7 @@ def process_inputs(ui_values, seed_override=None):
                 all_images.append(img)
     
     if all_images:
-        image_filenames = [save_temp_image(img) for i, img in enumerate(all_images)]
+        image_filenames = [save_temp_image(img, max_pixels=EDIT_INPUT_MAX_PIXELS) for i, img in enumerate(all_images)]
         local_ui_values['reference_latent_chain'] = image_filenames
     else:
         local_ui_values['reference_latent_chain'] = []
@@ -2,7 +2,7 @@ import os
 
 from core.workflow_assembler import WorkflowAssembler
 from core.workflow_utils import get_filename_prefix
-from core.utils import save_temp_image, handle_seed
+from core.utils import save_temp_image, handle_seed, EDIT_INPUT_MAX_PIXELS
 from core.input_processors import process_lora_inputs
 
 WORKFLOW_RECIPE_PATH = "bytedance_uso_recipe.yaml"
@@ -31,7 +31,7 @@ def process_uso_reference_inputs(vals):
         guidance = ref_guidances[i] if i < len(ref_guidances) else 3.5
 
         if image_pil is not None:
-            image_filename = save_temp_image(image_pil)
+            image_filename = save_temp_image(image_pil, max_pixels=EDIT_INPUT_MAX_PIXELS)
             references.append({
                 "image": image_filename,
                 "guidance": guidance,
@@ -47,7 +47,7 @@ def process_uso_style_reference_inputs(vals):
     for i in range(len(style_ref_images)):
         image_pil = style_ref_images[i]
         if image_pil is not None:
-            image_filename = save_temp_image(image_pil)
+            image_filename = save_temp_image(image_pil, max_pixels=EDIT_INPUT_MAX_PIXELS)
             references.append({"image": image_filename})
     return references
 
@@ -6,7 +6,7 @@ from .sd_shared import (
     create_anima_controlnet_lllite_ui, create_krea2_controlnet_ui,
     register_shared_events,
     create_model_architecture_filter_ui, create_sdxl_category_filter_ui,
-    create_run_generation_logic, create_style_ui,
+    create_tiled_run_generation_logic, create_style_ui,
     create_conditioning_ui, create_vae_override_ui,
     create_diffsynth_controlnet_ui, create_flux1_ipadapter_ui, create_sd3_ipadapter_ui,
     create_reference_latent_ui, create_hidream_o1_reference_ui, create_joyai_reference_ui,
@@ -61,6 +61,17 @@ def create_ui():
                     components[key('hires_scale_by')] = gr.Slider(
                         label="Upscale by", minimum=1.0, maximum=4.0, step=0.1, value=1.5
                     )
+                with gr.Row():
+                    components[key('tiled')] = gr.Checkbox(
+                        label="Tiled", value=False, scale=1,
+                        info="Upscale first, then refine overlapping tiles in parallel on all available backends."
+                    )
+                    components[key('tile_size')] = gr.Slider(
+                        label="Tile Size", minimum=512, maximum=2048, step=64, value=1024, scale=2
+                    )
+                    components[key('tile_overlap')] = gr.Slider(
+                        label="Tile Overlap", minimum=32, maximum=256, step=8, value=128, scale=2
+                    )
                 with gr.Row():
                      components[key('denoise')] = gr.Slider(
                         label="Denoise", minimum=0.0, maximum=1.0, step=0.05, value=0.55
@@ -118,4 +129,4 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
 def process_inputs(ui_values, seed_override=None):
     return process_inputs_logic('hires_fix', ui_values, seed_override)
 
-run_generation = create_run_generation_logic(process_inputs, UI_INFO, PREFIX)
\ No newline at end of file
+run_generation = create_tiled_run_generation_logic(process_inputs, UI_INFO, PREFIX)
\ No newline at end of file
@@ -6,6 +6,7 @@ from PIL import Image
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.utils import save_temp_image, create_mask_from_layer, handle_seed
+from core.inpaint_crop import prepare_inpaint_crop, SD15_TARGET_PIXELS, DEFAULT_TARGET_PIXELS
 from core.input_processors import (
     process_lora_inputs,
     process_controlnet_inputs,
@@ -44,6 +45,7 @@ def process_inputs(task_type: str, ui_values: dict, seed_override=None):
         raise gr.Error("Please select a base model.")
 
     model_type = vals.get('model_type_state', 'sdxl')
+    postprocess_outputs = None
 
     if task_type in ['img2img', 'hires_fix']:
         if vals.get('input_image') is None:
@@ -61,6 +63,8 @@ def process_inputs(task_type: str, ui_values: dict, seed_override=None):
         inverted_alpha_np = 255 - mask_alpha_np
         inverted_alpha_pil = Image.fromarray(inverted_alpha_np, mode='L')
         background_img.putalpha(inverted_alpha_pil)
+        target_pixels = SD15_TARGET_PIXELS if model_type == 'sd15' else DEFAULT_TARGET_PIXELS
+        background_img, postprocess_outputs = prepare_inpaint_crop(background_img, mask_alpha_np, target_pixels)
         vals['input_image'] = save_temp_image(background_img)
 
     elif task_type == 'outpaint':
@@ -157,5 +161,9 @@ def process_inputs(task_type: str, ui_values: dict, seed_override=None):
     final_values_for_assembler['seed'] = handle_seed(seed)
     
     workflow = assembler.assemble(final_values_for_assembler)
+
+    extra_data = {"extra_pnginfo": {"workflow": ""}}
+    if postprocess_outputs:
+        extra_data["postprocess_outputs"] = postprocess_outputs
     
-    return workflow, {"extra_pnginfo": {"workflow": ""}}
\ No newline at end of file
+    return workflow, extra_data
\ No newline at end of file
@@ -10,6 +10,7 @@ from .get_feature_list import ImageGen_get_feature_list
 from .get_model_features import ImageGen_get_model_features
 from .get_chain_schema import ImageGen_get_chain_schema
 from .run_imagegen import ImageGen_run_imagegen
+from .run_imagegen_batch import ImageGen_run_imagegen_batch
 from .get_task_status import ImageGen_get_task_status
 from .error_schema import make_error, make_validation_error, make_not_found_error
 from .mcp_gradio_integration import (
@@ -26,10 +27,20 @@ MCP_FUNCTIONS = [
     ImageGen_get_feature_list,
     ImageGen_get_model_features,
     ImageGen_run_imagegen,
+    ImageGen_run_imagegen_batch,
     ImageGen_get_task_status,
     ImageGen_get_chain_schema,
 ]
 
+# Per-function Gradio concurrency limits (None = unlimited); functions not listed get the queue default of 1.
+MCP_CONCURRENCY_LIMITS = {
+    # A synchronous call holds its slot until its job finishes; max_concurrent_jobs already bounds the work.
+    "ImageGen_run_imagegen": None,
+    "ImageGen_run_imagegen_batch": None,
+    # Long-polls for up to a minute with wait_ms; a single slot would queue every other caller behind it.
+    "ImageGen_get_task_status": None,
+}
+
 __all__ = [
     "ImageGen_get_task_list",
     "ImageGen_get_model_architecture_list",
@@ -38,6 +49,7 @@ __all__ = [
     "ImageGen_get_model_features",
     "ImageGen_get_chain_schema",
     "ImageGen_run_imagegen",
+    "ImageGen_run_imagegen_batch",
     "ImageGen_get_task_status",
     "make_error",
     "make_validation_error",
@@ -47,4 +59,5 @@ __all__ = [
     "patch_gradio_api_suppression",
     "HIGH_LEVEL_MCP_API_NAMES",
     "MCP_FUNCTIONS",
+    "MCP_CONCURRENCY_LIMITS",
 ]
@@ -1,26 +1,31 @@
 """
 MCP Common Utilities & Data Structures
-Contains YAML loading utilities, config file paths, task definitions, and async task database.
+Contains YAML loading utilities (model list and defaults come from the shared model catalog), config file paths, task definitions, and async task helpers backed by job_manager.
 """
 
+import ipaddress
 import os
+import socket
 import time
 import urllib.parse
 import urllib.request
 import uuid
-import json
 import base64
 import io
+import threading
+import requests
 import yaml
 from typing import Dict, Any
 from PIL import Image
 
+from core import job_manager
+from core.config import MCP_CALLBACK_ALLOWED_HOSTS
+from ..shared.model_catalog import model_catalog
+
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _YAML_DIR = os.path.join(_PROJECT_ROOT, "yaml")
 
 _MODEL_ARCHITECTURES_PATH = os.path.join(_YAML_DIR, "model_architectures.yaml")
-_MODEL_LIST_PATH = os.path.join(_YAML_DIR, "model_list.yaml")
-_MODEL_DEFAULTS_PATH = os.path.join(_YAML_DIR, "model_defaults.yaml")
 _IMAGE_GEN_FEATURES_PATH = os.path.join(_YAML_DIR, "image_gen_features.yaml")
 _CHAIN_FEATURES_PATH = os.path.join(_YAML_DIR, "chain_features.yaml")
 _CONSTANTS_PATH = os.path.join(_YAML_DIR, "constants.yaml")
@@ -65,18 +70,29 @@ def _parse_image_param(image_param: Any) -> Any:
     )
 
 
+_yaml_cache = {}
+
+
 def _load_yaml(filepath: str) -> dict:
-    """Safely load a YAML file, returning an empty dict if the file does not exist."""
-    if not os.path.exists(filepath):
+    """Load a YAML file, re-parsing only when its mtime changes. Returns an empty dict if the file does not exist.
+    The returned dict is shared between callers and must not be modified."""
+    try:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
         print(f"Warning: YAML file not found: {filepath}")
         return {}
+    cached = _yaml_cache.get(filepath)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
     with open(filepath, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        data = yaml.safe_load(f) or {}
+    _yaml_cache[filepath] = (mtime_ns, data)
+    return data
 
 
 _COMMON_OPTIONAL_INPUTS = [
     "steps", "cfg", "sampler", "scheduler", "seed",
-    "negative_prompt", "batch_size", "chain", "async_execution",
+    "negative_prompt", "batch_size", "chain", "async_execution", "callback_url",
 ]
 
 _TASK_DEFINITIONS = [
@@ -117,7 +133,110 @@ _TASK_DEFINITIONS = [
     },
 ]
 
-_TASKS_DB: Dict[str, Dict[str, Any]] = {}
+_FINISHED_TASK_STATUSES = (job_manager.STATUS_COMPLETED, job_manager.STATUS_FAILED, job_manager.STATUS_CANCELLED)
+MAX_WAIT_MS = 60000
+CALLBACK_ATTEMPTS = 3
+CALLBACK_TIMEOUT_SECONDS = 10
+
+
+def _create_task(task_id: str, params: dict, callback_url: str = None) -> Dict[str, Any]:
+    """Register a queued task in job_manager's job store; finished tasks expire with the other jobs."""
+    task = {
+        "task_id": task_id,
+        "status": job_manager.STATUS_QUEUED,
+        "progress": 0,
+        "created_at": int(time.time()),
+    }
+    job_manager.create_job(params, None, job_id=task_id, task=task, callback_url=callback_url)
+    return dict(task)
+
+
+def _get_task(task_id: str):
+    task = job_manager.get_task(task_id)
+    if task is not None and task.get("preview") is None:
+        task.pop("preview", None)
+    return task
+
+
+def _update_task(task_id: str, **fields):
+    """Apply a state change to a task and wake everyone waiting on it; finished tasks fire their callback."""
+    job = job_manager.update_task(task_id, **fields)
+    if job and fields.get("status") in _FINISHED_TASK_STATUSES and job.get("callback_url"):
+        threading.Thread(target=_post_task_callback, args=(task_id, job["callback_url"]), daemon=True).start()
+
+
+def _fail_task(task_id: str, error: Exception):
+    _update_task(
+        task_id,
+        status="failed",
+        progress=0,
+        failed_at=int(time.time()),
+        error={
+            "code": "EXECUTION_ERROR",
+            "message": str(error),
+        },
+    )
+
+
+def _wait_for_task_change(task_id: str, wait_ms: int) -> Dict[str, Any]:
+    """Block until the task's status or progress changes, it finishes, or wait_ms (capped at MAX_WAIT_MS) passes."""
+    task = job_manager.get_task(task_id) or {}
+    initial_state = (task.get("status"), task.get("progress"))
+    job_manager.wait_for_job(
+        task_id,
+        lambda job: (job["task"].get("status"), job["task"].get("progress")) != initial_state,
+        min(max(wait_ms, 0), MAX_WAIT_MS) / 1000,
+    )
+    return _get_task(task_id)
+
+
+def _check_callback_url(callback_url: str):
+    """
+    Returns why the server must not POST to callback_url, or None. Hosts listed in mcp_callback_allowed_hosts
+    are always allowed; any other host must resolve only to public addresses, so callers cannot point the
+    server at loopback, private networks or cloud metadata endpoints.
+    """
+    if not isinstance(callback_url, str) or not callback_url.startswith(("http://", "https://")):
+        return "Must be an http(s) URL"
+    parsed = urllib.parse.urlparse(callback_url)
+    host = parsed.hostname
+    if not host:
+        return "Missing host"
+    if host.lower() in MCP_CALLBACK_ALLOWED_HOSTS:
+        return None
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed.port or (443 if parsed.scheme == "https" else 80), proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError, ValueError) as e:
+        return f"Host could not be resolved: {e}"
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if getattr(ip, "ipv4_mapped", None):
+            ip = ip.ipv4_mapped
+        if not ip.is_global:
+            return f"Host resolves to a non-public address ({ip}); add it to mcp_callback_allowed_hosts to allow it"
+    return None
+
+
+def _post_task_callback(task_id: str, callback_url: str):
+    """POST the finished task to callback_url, retrying with backoff on connection errors and 5xx responses."""
+    payload = {k: v for k, v in (_get_task(task_id) or {}).items() if k != "preview"}
+    # Checked again at delivery time, in case the host's DNS changed since the task was submitted.
+    reason = _check_callback_url(callback_url)
+    if reason:
+        print(f"[MCP] Warning: Not delivering callback for {task_id} to {callback_url}: {reason}.")
+        return
+    for attempt in range(CALLBACK_ATTEMPTS):
+        try:
+            response = requests.post(callback_url, json=payload, timeout=CALLBACK_TIMEOUT_SECONDS, allow_redirects=False)
+            if response.status_code < 500:
+                print(f"[MCP] Callback for {task_id} delivered to {callback_url} (HTTP {response.status_code}).")
+                return
+            reason = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            reason = str(e)
+        if attempt < CALLBACK_ATTEMPTS - 1:
+            time.sleep(2 ** attempt)
+    print(f"[MCP] Warning: Callback for {task_id} to {callback_url} failed after {CALLBACK_ATTEMPTS} attempts: {reason}")
 
 
 class DummyProgress:
@@ -139,59 +258,53 @@ def _get_public_base_url() -> str:
             return f"https://{space_host}"
         return space_host.rstrip("/")
 
-    # 3. Local Gradio config fallback
-    try:
-        from core.config import GRADIO_SERVER_NAME, SERVER_PORT
-    except ImportError:
-        GRADIO_SERVER_NAME = "127.0.0.1"
-        SERVER_PORT = 7860
+    # 3. Local Gradio config fallback (the worker router's address in worker mode)
+    from core.config import PUBLIC_SERVER_NAME, PUBLIC_SERVER_PORT
 
-    server_name = os.getenv("GRADIO_SERVER_NAME", GRADIO_SERVER_NAME)
+    server_name = PUBLIC_SERVER_NAME
     if server_name == "0.0.0.0":
         server_name = "127.0.0.1"
-    port = os.getenv("GRADIO_SERVER_PORT", str(SERVER_PORT))
+    port = os.getenv("GRADIO_SERVER_PORT", str(PUBLIC_SERVER_PORT))
 
     return f"http://{server_name}:{port}"
 
 
+def _update_task_preview(task_id: str, image_bytes: bytes, extension: str):
+    """Store the latest in-progress sampling preview on the task as a Data URI."""
+    mime_type = "image/png" if extension == ".png" else "image/webp" if extension == ".webp" else "image/jpeg"
+    encoded = base64.b64encode(image_bytes).decode("ascii")
+    _update_task(task_id, preview={
+        "image": f"data:{mime_type};base64,{encoded}",
+        "updated_at": int(time.time()),
+    })
+
+
 def _execute_imagegen_pipeline(task_id: str, params: dict):
-    """Execute the image generation pipeline via ComfyUI backend and update _TASKS_DB."""
+    """
+    Execute the image generation pipeline via ComfyUI backend and update the task in job_manager.
+    Runs inside the ExecutionContext job_manager.run_task_in_background registers for the task.
+    """
+    from core.comfy_api import queue_prompt, get_output_data, get_execution_context
+
     start_time = time.time()
+    context = get_execution_context()
     try:
-        _TASKS_DB[task_id]["status"] = "processing"
-        _TASKS_DB[task_id]["progress"] = 10
-        _TASKS_DB[task_id]["updated_at"] = int(start_time)
+        if context is not None and context.is_cancelled():
+            raise RuntimeError("Task was cancelled before it started.")
+        _update_task(task_id, status="processing", progress=10, updated_at=int(start_time))
 
         from ..image_gen_logic import process_inputs
         from .get_model_list import ImageGen_get_model_list
         from .get_model_features import ImageGen_get_model_features
-        from core.comfy_api import queue_prompt
         from core.backend_manager import backend_manager
-        from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
-        import websocket
+        from core.config import COMFYUI_OUTPUT_PATH
 
         task_type = params["task_type"]
         model = params["model"]
         prompt = params["prompt"]
 
-        model_defaults = _load_yaml(_MODEL_DEFAULTS_PATH)
-        model_list = _load_yaml(_MODEL_LIST_PATH)
-        checkpoints = model_list.get("Checkpoint", {}) or model_list.get("Checkpoints", {})
-        found_arch = None
-        for arch_name, arch_data in checkpoints.items():
-            if isinstance(arch_data, dict):
-                for m in arch_data.get("models", []):
-                    if m.get("display_name") == model:
-                        found_arch = arch_name
-                        break
-            if found_arch:
-                break
-
-        arch_defaults_section = model_defaults.get(found_arch, {}) if found_arch else {}
-        arch_level_defaults = arch_defaults_section.get("_defaults", {})
-        model_specific_defaults = arch_defaults_section.get(model, {})
-        global_defaults = model_defaults.get("Default", {})
-        merged_defaults = {**global_defaults, **arch_level_defaults, **model_specific_defaults}
+        model_entry = model_catalog.get(model)
+        merged_defaults = model_entry["defaults"] if model_entry else {}
 
         steps = params.get("steps") if params.get("steps") is not None else merged_defaults.get("steps", 20)
         cfg = params.get("cfg") if params.get("cfg") is not None else merged_defaults.get("cfg", 1.0)
@@ -199,7 +312,7 @@ def _execute_imagegen_pipeline(task_id: str, params: dict):
         scheduler = params.get("scheduler") or merged_defaults.get("scheduler", "simple")
 
         prefix = task_type
-        model_type_state = found_arch.lower().replace(" ", "-").replace(".", "") if found_arch else "sdxl"
+        model_type_state = model_entry["model_type"] if model_entry else "sdxl"
 
         ui_values = {
             f"{prefix}_model_name": model,
@@ -277,11 +390,12 @@ def _execute_imagegen_pipeline(task_id: str, params: dict):
                         ui_values[f"{prefix}_style_images"] = ui_values.get(f"{prefix}_style_images", []) + [parsed_style_img]
                         ui_values[f"{prefix}_style_strengths"] = ui_values.get(f"{prefix}_style_strengths", []) + [item.get("strength", 1.0)]
 
-        _TASKS_DB[task_id]["progress"] = 30
+        _update_task(task_id, progress=30)
 
         workflow, extra_data = process_inputs(task_type, ui_values)
+        postprocess_outputs = extra_data.pop("postprocess_outputs", None) if extra_data else None
 
-        _TASKS_DB[task_id]["progress"] = 50
+        _update_task(task_id, progress=50)
 
         client_id = uuid.uuid4().hex
         prompt_response = queue_prompt(workflow, client_id, extra_data)
@@ -291,63 +405,50 @@ def _execute_imagegen_pipeline(task_id: str, params: dict):
 
         prompt_id = prompt_response['prompt_id']
 
-        active_url = backend_manager.get_active_backend_url()
-        ws_url = f"ws://{urllib.parse.urlparse(active_url).netloc}/ws?clientId={client_id}"
-        ws = None
         images = []
         base_url = _get_public_base_url()
 
         try:
-            ws = websocket.create_connection(ws_url)
-            while True:
-                out = ws.recv()
-                if not isinstance(out, str):
+            for update in get_output_data(prompt_id, client_id):
+                if not isinstance(update, dict):
                     continue
-
-                message = json.loads(out)
-                msg_type = message.get('type')
-
-                if msg_type == 'status' and message.get('data', {}).get('status', {}).get('exec_info', {}).get('queue_remaining') == 0:
+                for key, value in update.items():
+                    if isinstance(value, list) and value and isinstance(value[0], dict) and 'filename' in value[0]:
+                        for output_info in value:
+                            filename = output_info['filename']
+                            subfolder = output_info.get('subfolder', '')
+                            absolute_path = os.path.join(COMFYUI_OUTPUT_PATH, subfolder, filename)
+                            if postprocess_outputs:
+                                postprocess_outputs([absolute_path])
+                            final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
+                            images.append(final_url)
+                if images:
                     break
-
-                elif msg_type == 'executed':
-                    data = message.get('data', {})
-                    if data.get('prompt_id') == prompt_id:
-                        output_data = data.get('output', {})
-                        for key, value in output_data.items():
-                            if isinstance(value, list) and value and isinstance(value[0], dict) and 'filename' in value[0]:
-                                for output_info in value:
-                                    filename = output_info['filename']
-                                    subfolder = output_info.get('subfolder', '')
-                                    absolute_path = os.path.join(COMFYUI_OUTPUT_PATH, subfolder, filename)
-                                    final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
-                                    images.append(final_url)
-                        if images:
-                            break
         finally:
-            if ws:
-                ws.close()
+            _update_task(task_id, preview=None)
 
+        if context is not None and context.is_cancelled():
+            raise RuntimeError("Task was cancelled.")
         if not images:
             raise RuntimeError("Image generation failed; the backend did not report any output files.")
 
         execution_time = round(time.time() - start_time, 2)
-        _TASKS_DB[task_id]["status"] = "completed"
-        _TASKS_DB[task_id]["progress"] = 100
-        _TASKS_DB[task_id]["completed_at"] = int(time.time())
-        _TASKS_DB[task_id]["result"] = {
-            "images": images,
-            "seed": params.get("seed", -1),
-            "width": params.get("width", 1024),
-            "height": params.get("height", 1024),
-            "execution_time_seconds": execution_time,
-        }
+        _update_task(
+            task_id,
+            status="completed",
+            progress=100,
+            completed_at=int(time.time()),
+            result={
+                "images": images,
+                "seed": params.get("seed", -1),
+                "width": params.get("width", 1024),
+                "height": params.get("height", 1024),
+                "execution_time_seconds": execution_time,
+            },
+        )
 
     except Exception as e:
-        _TASKS_DB[task_id]["status"] = "failed"
-        _TASKS_DB[task_id]["progress"] = 0
-        _TASKS_DB[task_id]["failed_at"] = int(time.time())
-        _TASKS_DB[task_id]["error"] = {
-            "code": "EXECUTION_ERROR",
-            "message": str(e),
-        }
+        if context is not None and context.is_cancelled():
+            _update_task(task_id, status=job_manager.STATUS_CANCELLED, progress=0, cancelled_at=int(time.time()))
+            return
+        _fail_task(task_id, e)
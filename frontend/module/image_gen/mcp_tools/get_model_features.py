@@ -5,14 +5,13 @@ Query metadata for a specified model, including supported task types, extended f
 
 from .common import (
     _load_yaml,
-    _MODEL_LIST_PATH,
-    _MODEL_DEFAULTS_PATH,
     _IMAGE_GEN_FEATURES_PATH,
     _MODEL_ARCHITECTURES_PATH,
     _CHAIN_FEATURES_PATH,
     _TASK_DEFINITIONS,
 )
 from .error_schema import make_validation_error, make_not_found_error
+from ..shared.model_catalog import model_catalog
 
 
 def ImageGen_get_model_features(model: str) -> dict:
@@ -23,26 +22,14 @@ def ImageGen_get_model_features(model: str) -> dict:
             missing_fields=["model"],
         )
 
-    model_list = _load_yaml(_MODEL_LIST_PATH)
-    model_defaults = _load_yaml(_MODEL_DEFAULTS_PATH)
     features_config = _load_yaml(_IMAGE_GEN_FEATURES_PATH)
     arch_config = _load_yaml(_MODEL_ARCHITECTURES_PATH)
     chain_features = _load_yaml(_CHAIN_FEATURES_PATH)
 
-    found_arch = None
-    checkpoints = model_list.get("Checkpoint", {}) or model_list.get("Checkpoints", {})
-    for arch_name, arch_data in checkpoints.items():
-        if not isinstance(arch_data, dict):
-            continue
-        for m in arch_data.get("models", []):
-            if m.get("display_name") == model:
-                found_arch = arch_name
-                break
-        if found_arch:
-            break
-
-    if not found_arch:
+    model_entry = model_catalog.get(model)
+    if not model_entry:
         return make_not_found_error("model", model)
+    found_arch = model_entry["arch"]
 
     architectures = arch_config.get("architectures", {})
     arch_info = architectures.get(found_arch, {})
@@ -71,12 +58,9 @@ def ImageGen_get_model_features(model: str) -> dict:
                 if generic_name and generic_name not in supported_features:
                     supported_features.append(generic_name)
 
-    arch_defaults_section = model_defaults.get(found_arch, {})
-    arch_level_defaults = arch_defaults_section.get("_defaults", {})
-    model_specific_defaults = arch_defaults_section.get(model, {})
-    global_defaults = model_defaults.get("Default", {})
-
-    merged_defaults = {**global_defaults, **arch_level_defaults, **model_specific_defaults}
+    arch_level_defaults = model_entry["arch_defaults"]
+    model_specific_defaults = model_entry["model_defaults"]
+    merged_defaults = model_entry["defaults"]
 
     default_parameter = {
         "sampler": merged_defaults.get("sampler_name", "euler"),
@@ -3,19 +3,34 @@ MCP Tool: get_task_status
 Query the processing progress and final results of an async image generation task.
 """
 
-from .common import _TASKS_DB
+from .common import _get_task, _wait_for_task_change
 from .error_schema import make_validation_error, make_not_found_error
 
 
-def ImageGen_get_task_status(task_id: str) -> dict:
-    """Query the processing progress and final results of an async image generation task."""
+def ImageGen_get_task_status(task_id: str, wait_ms: int = 0) -> dict:
+    """
+    Query the processing progress, live sampling preview and final results of an async image generation task.
+    With wait_ms > 0 the call blocks until the task's status or progress changes (or wait_ms passes, max 60000)
+    and then returns the new state, so clients can wait instead of polling.
+    """
     if not task_id:
         return make_validation_error(
             "Parameter 'task_id' is required.",
             missing_fields=["task_id"],
         )
 
-    if task_id not in _TASKS_DB:
+    task = _get_task(task_id)
+    if task is None:
         return make_not_found_error("task", task_id)
 
-    return _TASKS_DB[task_id]
+    if wait_ms:
+        try:
+            wait_ms = int(wait_ms)
+        except (TypeError, ValueError):
+            return make_validation_error(
+                "Parameter 'wait_ms' must be an integer number of milliseconds.",
+                invalid_fields={"wait_ms": "Must be an integer"},
+            )
+        return _wait_for_task_change(task_id, wait_ms)
+
+    return task
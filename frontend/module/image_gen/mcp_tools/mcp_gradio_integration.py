@@ -2,7 +2,7 @@
 MCP & Gradio Integration Module
 
 Provides:
-1. register_high_level_mcp_apis: Expose only 8 high-level abstract API/MCP endpoints (using gr.api without polluting the visual UI structure)
+1. register_high_level_mcp_apis: Expose only 9 high-level abstract API/MCP endpoints (using gr.api without polluting the visual UI structure)
 2. cleanup_dependencies_api_names: Force cleanup of show_api attribute for non-high-level APIs in dependencies
 3. patch_gradio_api_suppression: No-op implementation retained for backward compatibility
 """
@@ -17,6 +17,7 @@ from .get_feature_list import ImageGen_get_feature_list
 from .get_model_features import ImageGen_get_model_features
 from .get_chain_schema import ImageGen_get_chain_schema
 from .run_imagegen import ImageGen_run_imagegen
+from .run_imagegen_batch import ImageGen_run_imagegen_batch
 from .get_task_status import ImageGen_get_task_status
 
 HIGH_LEVEL_MCP_API_NAMES = {
@@ -26,6 +27,7 @@ HIGH_LEVEL_MCP_API_NAMES = {
     "ImageGen_get_feature_list",
     "ImageGen_get_model_features",
     "ImageGen_run_imagegen",
+    "ImageGen_run_imagegen_batch",
     "ImageGen_get_task_status",
     "ImageGen_get_chain_schema",
 }
@@ -50,7 +52,7 @@ def patch_gradio_api_suppression():
 def cleanup_dependencies_api_names(demo):
     """
     Clean up residual auto-generated API names in demo.fns and demo.dependencies.
-    Force only the 8 high-level abstract MCP APIs to be exposed as public endpoints.
+    Force only the 9 high-level abstract MCP APIs to be exposed as public endpoints.
     """
     for fn in demo.fns.values():
         api_name = getattr(fn, "api_name", None)
@@ -73,7 +75,7 @@ def cleanup_dependencies_api_names(demo):
 
 def register_high_level_mcp_apis(demo):
     """
-    Explicitly register 8 high-level abstract MCP API endpoints on the Gradio demo using gr.api.
+    Explicitly register 9 high-level abstract MCP API endpoints on the Gradio demo using gr.api.
     Using gr.api() never adds any visual UI components (such as Row, Textbox, Button, etc.), avoiding duplicate interface rendering.
     """
     def get_task_list() -> list:
@@ -98,7 +100,7 @@ def register_high_level_mcp_apis(demo):
         return sanitize_keys(ImageGen_get_model_features(model.strip()))
 
     def run_imagegen(json_params: str = "{}") -> dict:
-        """[Recommended Discovery Flow Step 4] Unified image generation task execution interface. Supports txt2img, img2img, and other tasks with chainable extended features. [IMPORTANT PARAMETER RULES] Do NOT guess or fabricate inference hyperparameters such as steps, cfg, sampler, scheduler! Path 1 (Recommended): Pass only required parameters (task_type, model, prompt, width, height), leave optional hyperparams empty (server uses optimal defaults). Path 2: If explicit hyperparams are needed, you MUST first call get_model_features to obtain official defaults before passing them."""
+        """[Recommended Discovery Flow Step 4] Unified image generation task execution interface. Supports txt2img, img2img, and other tasks with chainable extended features. [IMPORTANT PARAMETER RULES] Do NOT guess or fabricate inference hyperparameters such as steps, cfg, sampler, scheduler! Path 1 (Recommended): Pass only required parameters (task_type, model, prompt, width, height), leave optional hyperparams empty (server uses optimal defaults). Path 2: If explicit hyperparams are needed, you MUST first call get_model_features to obtain official defaults before passing them. With async_execution, an optional callback_url receives the finished task as a JSON POST."""
         try:
             if isinstance(json_params, dict):
                 params = json_params
@@ -108,9 +110,18 @@ def register_high_level_mcp_apis(demo):
             return {"error": {"code": "INVALID_JSON", "message": f"Failed to parse JSON params: {e}"}}
         return sanitize_keys(ImageGen_run_imagegen(params))
 
-    def get_task_status(task_id: str = "") -> dict:
-        """Query the progress, status, and final generated results of an async image generation task."""
-        return sanitize_keys(ImageGen_get_task_status(task_id.strip()))
+    def run_imagegen_batch(json_params_list: str = "[]", json_shared_params: str = "{}") -> dict:
+        """Submit many image generation tasks in one call. json_params_list is a list of run_imagegen param objects; json_shared_params holds fields common to all of them (each entry overrides it). Returns one task_id per entry in order (or a validation error for that entry); all tasks run asynchronously, so use get_task_status with wait_ms or a callback_url to collect results."""
+        try:
+            params_list = json_params_list if isinstance(json_params_list, list) else json.loads(json_params_list or "[]")
+            shared_params = json_shared_params if isinstance(json_shared_params, dict) else json.loads(json_shared_params or "{}")
+        except Exception as e:
+            return {"error": {"code": "INVALID_JSON", "message": f"Failed to parse JSON params: {e}"}}
+        return sanitize_keys(ImageGen_run_imagegen_batch(params_list, shared_params))
+
+    def get_task_status(task_id: str = "", wait_ms: int = 0) -> dict:
+        """Query the progress, status, and final generated results of an async image generation task. Pass wait_ms (up to 60000) to block until the task's status or progress changes instead of polling repeatedly."""
+        return sanitize_keys(ImageGen_get_task_status(task_id.strip(), wait_ms))
 
     def get_chain_schema(chain_type: str = "") -> dict:
         """Get the complete parameter schema and usage examples for a specified chain/injector type."""
@@ -123,6 +134,7 @@ def register_high_level_mcp_apis(demo):
         get_feature_list,
         get_model_features,
         run_imagegen,
+        run_imagegen_batch,
         get_task_status,
         get_chain_schema,
     ]
@@ -134,4 +146,4 @@ def register_high_level_mcp_apis(demo):
         if getattr(fn, "api_name", None) in HIGH_LEVEL_MCP_API_NAMES:
             fn.show_api = True
 
-    print("[MCP Integration] Successfully registered 8 High-Level Abstract MCP APIs via gr.api().")
+    print("[MCP Integration] Successfully registered 9 High-Level Abstract MCP APIs via gr.api().")
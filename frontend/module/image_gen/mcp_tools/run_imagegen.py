@@ -3,21 +3,27 @@ MCP Tool: run_imagegen
 Unified image generation task submission and execution interface.
 """
 
-import time
 import uuid
-import threading
+from core import job_manager
+from ..shared.model_catalog import model_catalog
 from .common import (
-    _load_yaml,
-    _MODEL_LIST_PATH,
     _TASK_DEFINITIONS,
-    _TASKS_DB,
+    _check_callback_url,
+    _create_task,
+    _get_task,
     _execute_imagegen_pipeline,
+    _fail_task,
+    _update_task_preview,
 )
 from .error_schema import make_validation_error, make_not_found_error
 
 
-def ImageGen_run_imagegen(params: dict) -> dict:
-    """Unified image generation task execution interface."""
+def _get_all_model_names() -> set:
+    return set(model_catalog.model_names())
+
+
+def _validate_imagegen_params(params, all_models: set):
+    """Return an error dict for invalid params, or None."""
     if not isinstance(params, dict):
         return make_validation_error("Request params must be an object.")
 
@@ -39,38 +45,50 @@ def ImageGen_run_imagegen(params: dict) -> dict:
             invalid_fields={"task_type": f"Must be in {valid_tasks}"},
         )
 
-    model_list = _load_yaml(_MODEL_LIST_PATH)
-    checkpoints = model_list.get("Checkpoint", {}) or model_list.get("Checkpoints", {})
-    all_models = set()
-    for arch_name, arch_data in checkpoints.items():
-        if isinstance(arch_data, dict):
-            for m in arch_data.get("models", []):
-                all_models.add(m.get("display_name"))
-
     if params["model"] not in all_models:
         return make_not_found_error("model", params["model"])
 
+    callback_url = params.get("callback_url")
+    reason = _check_callback_url(callback_url) if callback_url else None
+    if reason:
+        return make_validation_error(
+            f"Parameter 'callback_url' is not allowed: {reason}.",
+            invalid_fields={"callback_url": reason},
+        )
+    return None
+
+
+def _submit_imagegen_task(params: dict) -> str:
+    """Queue a validated task on job_manager's shared job pool and return its task_id."""
     task_id = f"img_task_{uuid.uuid4().hex[:10]}"
-    created_at = int(time.time())
+    _create_task(task_id, params, callback_url=params.get("callback_url"))
+    job_manager.run_task_in_background(
+        task_id, _execute_imagegen_pipeline, task_id, params,
+        on_preview=lambda image_bytes, extension: _update_task_preview(task_id, image_bytes, extension),
+        on_error=lambda error: _fail_task(task_id, error),
+        module_name=ImageGen_run_imagegen.__name__,
+    )
+    return task_id
+
 
-    _TASKS_DB[task_id] = {
-        "task_id": task_id,
-        "status": "queued",
-        "progress": 0,
-        "created_at": created_at,
-    }
+def ImageGen_run_imagegen(params: dict) -> dict:
+    """Unified image generation task execution interface."""
+    error = _validate_imagegen_params(params, _get_all_model_names())
+    if error:
+        return error
 
-    async_exec = params.get("async_execution", False)
+    task_id = _submit_imagegen_task(params)
 
-    if async_exec:
-        t = threading.Thread(target=_execute_imagegen_pipeline, args=(task_id, params), daemon=True)
-        t.start()
+    if params.get("async_execution", False):
         return {
             "status": "queued",
             "task_id": task_id,
             "poll_interval_ms": 2000,
-            "message": "Task queued successfully. Poll get_task_status for results.",
+            "message": (
+                "Task queued successfully. Call get_task_status with wait_ms (e.g. 30000) to wait for the next state change"
+                + (", or wait for the result to be POSTed to callback_url." if params.get("callback_url") else ".")
+            ),
         }
-    else:
-        _execute_imagegen_pipeline(task_id, params)
-        return _TASKS_DB[task_id]
+
+    job_manager.wait_for_job(task_id, lambda job: False, timeout=None)
+    return _get_task(task_id)
@@ -0,0 +1,45 @@
+"""
+MCP Tool: run_imagegen_batch
+Submit many image generation tasks in one call.
+"""
+
+from .run_imagegen import _get_all_model_names, _validate_imagegen_params, _submit_imagegen_task
+from .error_schema import make_validation_error
+
+MAX_BATCH_SIZE = 64
+
+
+def ImageGen_run_imagegen_batch(params_list: list, shared_params: dict = None) -> dict:
+    """
+    Queue one async task per entry of params_list (each entry overrides shared_params) and return
+    their task_ids in the same order. Entries that fail validation get an error instead of a task_id;
+    the valid ones are still queued.
+    """
+    if not isinstance(params_list, list) or not params_list:
+        return make_validation_error("Parameter 'params_list' must be a non-empty list of param objects.")
+    if len(params_list) > MAX_BATCH_SIZE:
+        return make_validation_error(
+            f"A batch may contain at most {MAX_BATCH_SIZE} tasks; got {len(params_list)}.",
+            invalid_fields={"params_list": f"At most {MAX_BATCH_SIZE} entries"},
+        )
+    if shared_params is not None and not isinstance(shared_params, dict):
+        return make_validation_error("Parameter 'shared_params' must be an object.")
+
+    all_models = _get_all_model_names()
+    tasks = []
+    for index, item in enumerate(params_list):
+        params = {**(shared_params or {}), **item} if isinstance(item, dict) else item
+        error = _validate_imagegen_params(params, all_models)
+        if error:
+            tasks.append({"index": index, **error})
+            continue
+        params["async_execution"] = True
+        tasks.append({"index": index, "task_id": _submit_imagegen_task(params), "status": "queued"})
+
+    queued = sum(1 for t in tasks if "task_id" in t)
+    return {
+        "queued": queued,
+        "rejected": len(tasks) - queued,
+        "tasks": tasks,
+        "message": "Call get_task_status with wait_ms on each task_id, or pass callback_url to receive each result.",
+    }
@@ -1,6 +1,6 @@
 """
 MCP Tool Handlers — Backward-compatible aggregation entry point.
-Core logic has been split into individual files (get_*.py and run_imagegen.py).
+Core logic has been split into individual files (get_*.py, run_imagegen.py and run_imagegen_batch.py).
 """
 
 from .get_task_list import ImageGen_get_task_list
@@ -10,10 +10,10 @@ from .get_feature_list import ImageGen_get_feature_list
 from .get_model_features import ImageGen_get_model_features
 from .get_chain_schema import ImageGen_get_chain_schema
 from .run_imagegen import ImageGen_run_imagegen
+from .run_imagegen_batch import ImageGen_run_imagegen_batch
 from .get_task_status import ImageGen_get_task_status
 from .common import (
     _TASK_DEFINITIONS,
-    _TASKS_DB,
     _load_yaml,
     _execute_imagegen_pipeline,
 )
@@ -26,5 +26,6 @@ __all__ = [
     "ImageGen_get_model_features",
     "ImageGen_get_chain_schema",
     "ImageGen_run_imagegen",
+    "ImageGen_run_imagegen_batch",
     "ImageGen_get_task_status",
 ]
@@ -2,5 +2,5 @@ from .shared.config_loader import *
 from .shared.utils import *
 from .shared.ui_components import *
 from .shared.event_handlers import register_shared_events, update_model_list
-from .shared.generation import create_run_generation_logic
+from .shared.generation import create_run_generation_logic, create_tiled_run_generation_logic
 from .shared.vae_utils import create_vae_override_ui, process_vae_override_input
\ No newline at end of file
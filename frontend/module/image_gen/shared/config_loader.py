@@ -2,8 +2,6 @@ import os
 import yaml
 from core.yaml_loader import load_and_merge_yaml, deep_merge_dicts
 
-_model_config = None
-_model_defaults = None
 _controlnet_models_config = None
 _diffsynth_controlnet_models_config = None
 _anima_controlnet_lllite_models_config = None
@@ -14,13 +12,18 @@ _features_config = None
 _architectures_config = None
 _pid_config = None
 
-def _load_local_yaml(filename: str):
+def _local_yaml_paths(filename: str):
     base_dir = os.path.dirname(os.path.abspath(__file__))
     
     base_config_path = os.path.join(base_dir, "..", "yaml", filename)
     
     custom_config_path = os.path.join(base_dir, "..", "..", "..", "custom", "module", "image_gen", "yaml", filename)
     
+    return base_config_path, custom_config_path
+
+def _load_local_yaml(filename: str):
+    base_config_path, custom_config_path = _local_yaml_paths(filename)
+
     base_config = {}
     if os.path.exists(base_config_path):
         with open(base_config_path, 'r', encoding='utf-8') as f:
@@ -54,16 +57,12 @@ def load_architectures_config():
     return _architectures_config
 
 def load_model_config():
-    global _model_config
-    if _model_config is None:
-        _model_config = _load_local_yaml("model_list.yaml")
-    return _model_config
+    from .model_catalog import model_catalog
+    return model_catalog.model_config
 
 def load_model_defaults():
-    global _model_defaults
-    if _model_defaults is None:
-        _model_defaults = _load_local_yaml("model_defaults.yaml")
-    return _model_defaults
+    from .model_catalog import model_catalog
+    return model_catalog.model_defaults
 
 def load_controlnet_models():
     global _controlnet_models_config
@@ -4,29 +4,23 @@ import shutil
 from core.config import LORA_DIR, EMBEDDING_DIR
 from core.shared_ui import register_ui_chain_events
 from .utils import get_model_type, get_model_generation_defaults
-from .config_loader import load_model_config, load_model_defaults, load_controlnet_models, load_diffsynth_controlnet_models, load_anima_controlnet_lllite_models, load_krea2_controlnet_models, get_krea2_cn_defaults, load_ipadapter_presets, load_constants_config, load_features_config, load_architectures_config
+from .model_catalog import model_catalog
+from .config_loader import load_model_defaults, load_controlnet_models, load_diffsynth_controlnet_models, load_anima_controlnet_lllite_models, load_krea2_controlnet_models, get_krea2_cn_defaults, load_ipadapter_presets, load_constants_config, load_features_config, load_architectures_config
 
 constants = load_constants_config()
 
 def update_model_list(architecture_filter: str, category_filter: str):
-    model_config = load_model_config()
-    checkpoints = model_config.get("Checkpoints", {})
-    arch_config = load_architectures_config()
-    ordered_architectures = arch_config.get("architecture_order", [])
-
     if category_filter != "ALL" and architecture_filter == "SDXL":
-        sdxl_models_data = checkpoints.get("SDXL", {}).get("models", [])
-        choices = [m['display_name'] for m in sdxl_models_data if m.get("category") == category_filter]
+        choices = model_catalog.model_names("SDXL", category_filter)
         default_value = choices[0] if choices else None
         return gr.update(choices=choices, value=default_value)
 
     choices = []
-    architectures_to_load = ordered_architectures if architecture_filter == "ALL" else [architecture_filter]
+    arch_config = load_architectures_config()
+    architectures_to_load = arch_config.get("architecture_order", []) if architecture_filter == "ALL" else [architecture_filter]
 
     for arch_name in architectures_to_load:
-        if arch_name in checkpoints:
-            models_data = checkpoints[arch_name].get("models", [])
-            choices.extend([m['display_name'] for m in models_data])
+        choices.extend(model_catalog.model_names(arch_name))
     
     default_value = choices[0] if choices else None
     return gr.update(choices=choices, value=default_value)
@@ -141,7 +135,6 @@ def register_shared_events(components, prefix, sdxl_gallery_height, demo):
 
     def on_model_change(selected_model_name):
         updates = {}
-        model_config = load_model_config()
         model_defaults = load_model_defaults()
         ipadapter_presets_config = load_ipadapter_presets()
         features_config = load_features_config()
@@ -149,7 +142,7 @@ def register_shared_events(components, prefix, sdxl_gallery_height, demo):
         if not selected_model_name:
             model_type = "sdxl"
         else:
-            model_type = get_model_type(selected_model_name, model_config)
+            model_type = get_model_type(selected_model_name)
 
         updates[model_type_state] = model_type
         
@@ -1,6 +1,12 @@
+import os
+import tempfile
 import traceback
+from PIL import Image
 from core.comfy_api import run_workflow_and_get_output
 from core.workflow_utils import get_filename_prefix
+from core.utils import handle_seed
+from core.backend_scheduler import get_capable_backend_urls, run_workflows_across_backends
+from core.tiling import plan_tiles, crop_tiles, blend_tiles
 
 def create_run_generation_logic(process_inputs_func, ui_info, prefix):
     def run_generation(ui_values):
@@ -37,4 +43,83 @@ def create_run_generation_logic(process_inputs_func, ui_info, prefix):
 
         yield ("Status: Loaded successfully!", all_files)
             
-    return run_generation
\ No newline at end of file
+    return run_generation
+
+def _load_and_remove(path):
+    with Image.open(path) as img:
+        img.load()
+        loaded = img.copy()
+    os.remove(path)
+    return loaded
+
+def create_tiled_run_generation_logic(process_inputs_func, ui_info, prefix):
+    standard_run_generation = create_run_generation_logic(process_inputs_func, ui_info, prefix)
+
+    def run_generation(ui_values):
+        if not ui_values.get(f'{prefix}_tiled'):
+            yield from standard_run_generation(ui_values)
+            return
+
+        all_files = []
+        
+        try:
+            input_image = ui_values.get(f'{prefix}_input_image')
+            if input_image is None:
+                raise ValueError("An input image is required for tiled upscaling.")
+
+            scale_by = float(ui_values.get(f'{prefix}_hires_scale_by', 1.5))
+            tile_size = int(ui_values.get(f'{prefix}_tile_size', 1024))
+            overlap = int(ui_values.get(f'{prefix}_tile_overlap', 128))
+            target_width = max(8, int(input_image.width * scale_by) // 8 * 8)
+            target_height = max(8, int(input_image.height * scale_by) // 8 * 8)
+
+            upscaled_image = input_image.convert("RGB").resize((target_width, target_height), Image.LANCZOS)
+            boxes = plan_tiles(target_width, target_height, tile_size, overlap)
+            tiles = crop_tiles(upscaled_image, boxes)
+            print(f"[Tiled] {target_width}x{target_height} canvas split into {len(tiles)} tile(s) of up to {tile_size}px.")
+
+            batch_count = int(ui_values.get(f'{prefix}_batch_count', 1))
+            seed = int(ui_values.get(f'{prefix}_seed', -1))
+
+            for i in range(batch_count):
+                current_seed = seed + i if seed != -1 else handle_seed(-1)
+                base_filename_prefix = get_filename_prefix()
+
+                yield (f"Status: Preparing batch {i + 1}/{batch_count} ({len(tiles)} tiles)...", all_files)
+
+                workflow_packages = []
+                for tile_index, tile in enumerate(tiles):
+                    tile_values = ui_values.copy()
+                    tile_values[f'{prefix}_input_image'] = tile
+                    tile_values[f'{prefix}_hires_scale_by'] = 1.0
+                    tile_values[f'{prefix}_batch_size'] = 1
+                    tile_values[f'{prefix}_filename_prefix'] = f"{base_filename_prefix}_tile{tile_index:03d}"
+                    workflow_packages.append(process_inputs_func(tile_values, seed_override=current_seed))
+
+                class_types = {node['class_type'] for node in workflow_packages[0][0].values()}
+                backend_urls = get_capable_backend_urls(class_types)
+
+                results = {}
+                for status, results in run_workflows_across_backends(workflow_packages, backend_urls):
+                    yield (f"Status: [Batch {i+1}/{batch_count}] {status.replace('Status: ', '')}", all_files)
+
+                missing_tiles = [t for t in range(len(tiles)) if not results.get(t)]
+                if missing_tiles:
+                    raise RuntimeError(f"{len(missing_tiles)} of {len(tiles)} tiles did not produce an image.")
+
+                yield (f"Status: [Batch {i+1}/{batch_count}] Blending {len(tiles)} tiles...", all_files)
+                processed_tiles = [(boxes[t], _load_and_remove(results[t][0])) for t in range(len(tiles))]
+                blended_image = blend_tiles((target_width, target_height), processed_tiles, overlap)
+
+                output_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
+                blended_image.save(output_path, "PNG")
+                all_files.append(output_path)
+
+        except Exception as e:
+            traceback.print_exc()
+            yield (f"Error: {e}", all_files)
+            return
+
+        yield ("Status: Loaded successfully!", all_files)
+
+    return run_generation
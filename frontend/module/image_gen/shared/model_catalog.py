@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+
+from .config_loader import _load_local_yaml, _local_yaml_paths
+
+CATALOG_FILES = ("model_list.yaml", "model_defaults.yaml")
+RELOAD_CHECK_INTERVAL_SECONDS = 1.0
+
+
+def get_model_type_slug(arch_name: str) -> str:
+    return arch_name.lower().replace(" ", "-").replace(".", "")
+
+
+class _CatalogSnapshot:
+    def __init__(self, model_config: dict, model_defaults: dict):
+        self.model_config = model_config
+        self.model_defaults = model_defaults
+        self.models = {}
+        self.names_by_arch = {}
+
+        checkpoints = model_config.get("Checkpoints", {}) or model_config.get("Checkpoint", {})
+        defaults_by_slug = {get_model_type_slug(key): value for key, value in model_defaults.items() if isinstance(value, dict)}
+        global_defaults = model_defaults.get("Default", {}) or {}
+
+        for arch_name, arch_data in checkpoints.items():
+            if not isinstance(arch_data, dict):
+                continue
+            model_type = get_model_type_slug(arch_name)
+            arch_section = model_defaults.get(arch_name) or defaults_by_slug.get(model_type) or {}
+            arch_defaults = arch_section.get("_defaults", {}) or {}
+            names = self.names_by_arch.setdefault(arch_name, [])
+
+            for model in arch_data.get("models", []) or []:
+                display_name = model.get("display_name")
+                if not display_name:
+                    continue
+                names.append(display_name)
+                if display_name in self.models:
+                    continue
+                model_defaults_entry = arch_section.get(display_name, {}) or {}
+                self.models[display_name] = {
+                    "display_name": display_name,
+                    "arch": arch_name,
+                    "model_type": model_type,
+                    "category": model.get("category"),
+                    "path": model.get("path") or model.get("components"),
+                    "latent_type": arch_data.get("latent_type", "latent"),
+                    "arch_defaults": arch_defaults,
+                    "model_defaults": model_defaults_entry,
+                    "defaults": {**global_defaults, **arch_defaults, **model_defaults_entry},
+                }
+
+
+class ModelCatalog:
+    """
+    model_list.yaml and model_defaults.yaml (base merged with custom/) indexed by display_name.
+    The files' mtimes are checked at most once per RELOAD_CHECK_INTERVAL_SECONDS; a change rebuilds the
+    whole index and swaps it in at once, so readers never see a half-loaded catalog.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None
+        self._last_check = 0.0
+
+    def _current_signature(self):
+        signature = []
+        for filename in CATALOG_FILES:
+            for path in _local_yaml_paths(filename):
+                try:
+                    signature.append(os.stat(path).st_mtime_ns)
+                except OSError:
+                    signature.append(None)
+        return tuple(signature)
+
+    def _current(self) -> _CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._last_check < RELOAD_CHECK_INTERVAL_SECONDS:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._last_check < RELOAD_CHECK_INTERVAL_SECONDS:
+                return self._snapshot
+            signature = self._current_signature()
+            self._last_check = time.monotonic()
+            if signature == self._signature:
+                return self._snapshot
+
+            new_snapshot = _CatalogSnapshot(_load_local_yaml("model_list.yaml"), _load_local_yaml("model_defaults.yaml"))
+            if self._snapshot is not None and not new_snapshot.models and self._snapshot.models:
+                print("[ModelCatalog] Warning: model_list.yaml has no models after the change; keeping the previous catalog.")
+            else:
+                if self._snapshot is not None:
+                    print(f"[ModelCatalog] Model catalog changed on disk; reloaded {len(new_snapshot.models)} models.")
+                self._snapshot = new_snapshot
+            self._signature = signature
+            return self._snapshot
+
+    @property
+    def model_config(self) -> dict:
+        return self._current().model_config
+
+    @property
+    def model_defaults(self) -> dict:
+        return self._current().model_defaults
+
+    def get(self, display_name: str):
+        """Returns the indexed entry for a model (arch, model_type, path, latent_type, defaults, ...) or None."""
+        if not display_name:
+            return None
+        return self._current().models.get(display_name)
+
+    def architectures(self) -> list:
+        return list(self._current().names_by_arch)
+
+    def model_names(self, arch_name: str = None, category: str = None) -> list:
+        snapshot = self._current()
+        names = snapshot.names_by_arch.get(arch_name, []) if arch_name else list(snapshot.models)
+        if category:
+            names = [name for name in names if snapshot.models[name].get("category") == category]
+        return list(names)
+
+
+model_catalog = ModelCatalog()
@@ -5,7 +5,8 @@ import random
 from PIL import Image
 import numpy as np
 from core.config import LORA_DIR, COMFYUI_INPUT_PATH
-from .config_loader import load_model_config, load_constants_config
+from .config_loader import load_constants_config
+from .model_catalog import model_catalog
 
 _constants = None
 def get_constants():
@@ -14,41 +15,17 @@ def get_constants():
         _constants = load_constants_config()
     return _constants
 
-_model_path_cache = {}
 def get_model_path(display_name):
-    global _model_path_cache
-    if not display_name: return None
-    if display_name in _model_path_cache: return _model_path_cache[display_name]
-    
-    model_config = load_model_config()
-    checkpoints = model_config.get("Checkpoints", {})
+    entry = model_catalog.get(display_name)
+    return entry["path"] if entry else None
 
-    for arch_name, arch_data in checkpoints.items():
-        for model in arch_data.get("models", []):
-            if model.get("display_name") == display_name:
-                path_or_components = model.get("path") or model.get("components")
-                _model_path_cache[display_name] = path_or_components
-                return path_or_components
-            
-    return None
-
-def get_model_type(selected_model_name: str, model_config: dict) -> str:
-    checkpoints = model_config.get("Checkpoints", {})
-    for arch_name, arch_data in checkpoints.items():
-        for model in arch_data.get("models", []):
-            if model.get("display_name") == selected_model_name:
-                return arch_name.lower().replace(" ", "-").replace(".", "")
-        
-    return "sdxl"
+def get_model_type(selected_model_name: str) -> str:
+    entry = model_catalog.get(selected_model_name)
+    return entry["model_type"] if entry else "sdxl"
 
 def get_latent_type_for_model(selected_model_name: str) -> str:
-    model_config = load_model_config()
-    checkpoints = model_config.get("Checkpoints", {})
-    for arch_name, arch_data in checkpoints.items():
-        for model in arch_data.get("models", []):
-            if model.get("display_name") == selected_model_name:
-                return arch_data.get("latent_type", "latent")
-    return "latent"
+    entry = model_catalog.get(selected_model_name)
+    return entry["latent_type"] if entry else "latent"
 
 
 
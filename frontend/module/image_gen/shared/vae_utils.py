@@ -1,8 +1,8 @@
 import os
-import shutil
 import gradio as gr
 from core.config import COMFYUI_PATH, CIVITAI_API_KEY
-from core.download_utils import get_civitai_file_info, download_file
+from core.download_utils import get_civitai_file_info, find_local_civitai_file, download_file
+from core.ingest import ingest_file
 import hashlib
 from .config_loader import load_constants_config
 
@@ -65,6 +65,9 @@ def get_vae_path(source, id_or_url, civitai_key, progress=None):
         
     if source == "Civitai":
         subdir = "civitai"
+        existing_path = find_local_civitai_file(VAE_DIR, id_or_url, ('.safetensors', '.pt', '.bin'))
+        if existing_path:
+            return existing_path, "File already exists."
         file_info = get_civitai_file_info(id_or_url)
         if file_info and file_info['name'].lower().endswith(('.pt', '.bin')):
             file_ext = os.path.splitext(file_info['name'])[1]
@@ -107,7 +110,7 @@ def on_vae_upload(file_obj):
     
     basename = os.path.basename(file_obj.name)
     new_path = os.path.join(vae_upload_dir, basename)
-    shutil.copy(file_obj.name, new_path)
+    ingest_file(file_obj.name, new_path)
     
     relative_path = os.path.join(upload_subdir, basename)
     
@@ -38,4 +38,4 @@ def process_inputs(params):
     assembler = WorkflowAssembler(WORKFLOW_RECIPE_PATH, base_path=module_path)
     workflow = assembler.assemble(local_params)
     
-    return workflow, {"expected_text_file_path": expected_output_path}
\ No newline at end of file
+    return workflow, {"expected_text_file_path": expected_output_path, "result_cache": True}
\ No newline at end of file
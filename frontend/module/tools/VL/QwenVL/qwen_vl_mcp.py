@@ -1,18 +1,11 @@
 import gradio as gr
-import uuid
-import json
-import urllib.parse
-import websocket
-import os
 import requests
 from PIL import Image
 from io import BytesIO
 import base64
-import time
 
 from .qwen_vl_logic import process_inputs
-from core.comfy_api import queue_prompt
-from core.backend_manager import backend_manager
+from core.comfy_api import run_workflow_and_get_text_output
 from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
 
 def _download_and_decode_image(image_url: str = None, image_data: str = None) -> Image.Image:
@@ -65,48 +58,18 @@ def Vision_Query(
     }
 
     workflow, extra_data = process_inputs(params)
-    expected_text_file_path = extra_data.get("expected_text_file_path")
-    
-    client_id = uuid.uuid4().hex
-    
-    prompt_response = queue_prompt(workflow, client_id, extra_data)
-    if not prompt_response or 'prompt_id' not in prompt_response:
-        active_url = backend_manager.get_active_backend_url()
-        raise RuntimeError(f"Failed to queue prompt to ComfyUI backend at {active_url}.")
-        
-    prompt_id = prompt_response['prompt_id']
-
-    active_url = backend_manager.get_active_backend_url()
-    ws_url = f"ws://{urllib.parse.urlparse(active_url).netloc}/ws?clientId={client_id}"
-    ws = None
-    try:
-        ws = websocket.create_connection(ws_url)
-        while True:
-            out = ws.recv()
-            if not isinstance(out, str): continue
-            
-            message = json.loads(out)
-            if message.get('type') == 'status' and message.get('data', {}).get('status', {}).get('exec_info', {}).get('queue_remaining') == 0:
-                break
-    finally:
-        if ws: ws.close()
 
     text_content = None
-    try:
-        for _ in range(10): 
-            if expected_text_file_path and os.path.exists(expected_text_file_path):
-                with open(expected_text_file_path, 'r', encoding='utf-8') as file:
-                    text_content = file.read()
-                break
-            time.sleep(0.5)
+    for status, text in run_workflow_and_get_text_output((workflow, extra_data)):
+        if status.startswith("Error:"):
+            raise RuntimeError(f"Description generation failed. {status}")
+        if text is not None:
+            text_content = text
 
-        if text_content is None:
-            raise RuntimeError("Description generation failed; output text file was not found.")
+    if text_content is None:
+        raise RuntimeError("Description generation failed; no text output was received.")
 
-        print(f"[MCP Vision_Query] Generation complete.")
-        return text_content
-    finally:
-        if expected_text_file_path and os.path.exists(expected_text_file_path):
-            os.remove(expected_text_file_path)
+    print(f"[MCP Vision_Query] Generation complete.")
+    return text_content
 
 MCP_FUNCTIONS = [Vision_Query]
\ No newline at end of file
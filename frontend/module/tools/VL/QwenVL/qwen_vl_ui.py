@@ -1,14 +1,12 @@
 import gradio as gr
 import random
-import os
 import shutil
 import traceback
 import tempfile
-import time
 from PIL import Image
 
 from .qwen_vl_logic import process_inputs
-from core.comfy_api import run_workflow_and_get_output
+from core.comfy_api import run_workflow_and_get_text_output
 from core import node_info_manager
 
 UI_INFO = {
@@ -72,43 +70,30 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
 
 def run_generation(ui_values):
     final_text_content = "Processing..."
-    expected_text_file_path = None
+    final_status = "Status: Loaded successfully!"
     try:
         yield ("Status: Preparing...", "Processing...")
         
         workflow, extra_data = process_inputs(ui_values)
-        expected_text_file_path = extra_data.get("expected_text_file_path")
         workflow_package = (workflow, extra_data)
         
-        for status, _ in run_workflow_and_get_output(workflow_package):
-            yield (status, "Processing...")
-        
-        yield ("Status: Reading generated description...", "Processing...")
-        
-        text_file_found = False
-        for _ in range(10): 
-            if expected_text_file_path and os.path.exists(expected_text_file_path):
-                text_file_found = True
-                break
-            time.sleep(0.5)
+        text_content = None
+        for status, text in run_workflow_and_get_text_output(workflow_package):
+            if text is not None:
+                text_content = text
+                final_status = status
+            else:
+                yield (status, "Processing...")
 
-        if text_file_found:
-            with open(expected_text_file_path, 'r', encoding='utf-8') as file:
-                final_text_content = file.read()
+        if text_content is not None:
+            final_text_content = text_content
         else:
-            final_text_content = "Error: Could not find the generated description file after processing."
+            final_text_content = "Error: Could not receive the generated description after processing."
 
     except Exception as e:
         traceback.print_exc()
         final_text_content = f"An error occurred: {e}"
         yield (f"Error: {e}", final_text_content)
         return
-    finally:
-        if expected_text_file_path and os.path.exists(expected_text_file_path):
-            try:
-                os.remove(expected_text_file_path)
-                print(f"Cleaned up temporary description file: {expected_text_file_path}")
-            except Exception as e:
-                print(f"Error cleaning up temporary description file: {e}")
 
-    yield ("Status: Loaded successfully!", final_text_content)
\ No newline at end of file
+    yield (final_status, final_text_content)
\ No newline at end of file
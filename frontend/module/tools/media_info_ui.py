@@ -2,7 +2,6 @@ import gradio as gr
 import re
 import json
 from PIL import Image
-from pymediainfo import MediaInfo
 
 UI_INFO = {
     "main_tab": "Tools",
@@ -37,6 +36,7 @@ def _parse_a1111_parameters(params_text):
 
 def _get_video_metadata_pymediainfo(filepath):
     try:
+        from pymediainfo import MediaInfo
         media_info = MediaInfo.parse(filepath)
         for track in media_info.tracks:
             if hasattr(track, 'workflow') and track.workflow:
@@ -0,0 +1,112 @@
+import gradio as gr
+import os
+import shutil
+import tempfile
+import time
+
+from core import node_profiler
+
+UI_INFO = {
+    "main_tab": "Tools",
+    "sub_tab": "Node Profiler",
+}
+
+CATEGORY_COLUMNS = ["model_load", "text_encode", "sampling", "vae_decode", "vae_encode", "save", "input", "other"]
+SUMMARY_HEADERS = ["Recipe", "Model", "Resolution", "Runs", "Mean (s)"] + [f"{c} (s)" for c in CATEGORY_COLUMNS]
+NODE_HEADERS = ["Node", "Class", "Category", "Runs", "Cache Hits", "Mean (s)", "Total (s)", "Share"]
+RECENT_HEADERS = ["Finished", "Recipe", "Model", "Resolution", "Status", "Total (s)", "Nodes", "Cached"]
+
+
+def _group_label(entry):
+    return f"{entry['recipe']} | {entry['model']} | {entry['resolution']}"
+
+
+def _summary_rows(summary):
+    rows = []
+    for entry in summary:
+        runs = entry["runs"]
+        categories = entry["category_seconds"]
+        rows.append(
+            [entry["recipe"], entry["model"], entry["resolution"], runs, round(entry["mean_seconds"], 3)]
+            + [round(categories.get(c, 0.0) / runs, 3) for c in CATEGORY_COLUMNS]
+        )
+    return rows
+
+
+def _node_rows(entry):
+    if not entry:
+        return []
+    total = sum(node["seconds"] for node in entry["nodes"]) or 1.0
+    return [
+        [node["name"], node["class_type"], node["category"], node["runs"], node["cached"],
+         round(node["mean_seconds"], 3), round(node["seconds"], 3), f"{node['seconds'] / total:.1%}"]
+        for node in entry["nodes"]
+    ]
+
+
+def _recent_rows():
+    return [
+        [time.strftime("%H:%M:%S", time.localtime(p["finished_at"])), p["recipe"], p["model"], p["resolution"], p["status"],
+         round(p["total_seconds"], 3), len(p["nodes"]), sum(1 for n in p["nodes"] if n["cached"])]
+        for p in node_profiler.get_recent_profiles(50)
+    ]
+
+
+def refresh(selected_group):
+    summary = node_profiler.get_summary()
+    labels = [_group_label(entry) for entry in summary]
+    if selected_group not in labels:
+        selected_group = labels[0] if labels else None
+    selected = next((entry for entry in summary if _group_label(entry) == selected_group), None)
+    return (
+        _summary_rows(summary),
+        gr.update(choices=labels, value=selected_group),
+        _node_rows(selected),
+        _recent_rows(),
+    )
+
+
+def create_ui():
+    components = {}
+    with gr.Column():
+        gr.Markdown("## Node Profiler")
+        gr.Markdown("💡 **Tip:** Per-node ComfyUI execution times of the prompts run since startup, grouped by recipe, model and resolution. Cached nodes count as hits with no time.")
+
+        with gr.Row():
+            components['refresh_button'] = gr.Button("🔄 Refresh", variant="primary")
+            components['export_button'] = gr.Button("💾 Export JSON")
+            components['reset_button'] = gr.Button("🗑️ Reset")
+
+        components['summary_table'] = gr.Dataframe(headers=SUMMARY_HEADERS, label="Mean seconds per run by category", interactive=False, wrap=True)
+        components['group_dropdown'] = gr.Dropdown(label="Recipe | Model | Resolution", choices=[], interactive=True)
+        components['node_table'] = gr.Dataframe(headers=NODE_HEADERS, label="Nodes", interactive=False, wrap=True)
+        components['recent_table'] = gr.Dataframe(headers=RECENT_HEADERS, label="Recent prompts", interactive=False, wrap=True)
+        components['export_file'] = gr.File(label="Exported profile", visible=False, interactive=False)
+    return components
+
+
+def create_event_handlers(components: dict, all_components: dict, demo: gr.Blocks):
+    group_dropdown = components['group_dropdown']
+    outputs = [components['summary_table'], group_dropdown, components['node_table'], components['recent_table']]
+
+    components['refresh_button'].click(fn=refresh, inputs=[group_dropdown], outputs=outputs, show_api=False)
+    group_dropdown.input(fn=refresh, inputs=[group_dropdown], outputs=outputs, show_api=False)
+
+    def export_profile():
+        try:
+            path = node_profiler.export_json()
+            # cache_dir may be outside the paths Gradio serves, so offer a copy from the temp dir.
+            download_path = shutil.copy(path, os.path.join(tempfile.gettempdir(), os.path.basename(path)))
+        except OSError as e:
+            gr.Warning(f"Could not write the profile: {e}")
+            return gr.update(visible=False)
+        gr.Info(f"Profile saved to {path}")
+        return gr.update(value=download_path, visible=True)
+
+    components['export_button'].click(fn=export_profile, outputs=[components['export_file']], show_api=False)
+
+    def reset_profile(selected_group):
+        node_profiler.reset()
+        return refresh(selected_group)
+
+    components['reset_button'].click(fn=reset_profile, inputs=[group_dropdown], outputs=outputs, show_api=False)
@@ -1,10 +1,14 @@
 import os
+import re
+import shutil
+from PIL import Image
 from core.config import COMFYUI_INPUT_PATH
 from core.media_utils import get_media_metadata
 from core import node_info_manager
 from core.workflow_assembler import WorkflowAssembler
 from core.workflow_utils import get_filename_prefix
 from core.utils import save_temp_image, save_temp_video
+from core.batch_runner import run_directory_batch, sidecar_path
 
 WORKFLOW_RECIPE_PATH = "controlnet_base_recipe.yaml"
 MAX_DYNAMIC_CONTROLS = 8
@@ -100,4 +104,34 @@ def process_inputs(ui_values):
             save_id = assembler.node_map[f'save_image_{i+1}']
             workflow[save_id]['inputs'].update({'images': current_image_source, **save_node_params})
             
-    return workflow, None
\ No newline at end of file
+    return workflow, {"result_cache": True}
+
+def get_control_map_suffix(preprocessor_name, output_index=0):
+    slug = re.sub(r'[^a-z0-9]+', '_', re.sub(r'Preprocessor$', '', preprocessor_name).lower()).strip('_')
+    return f"_{slug}.png" if output_index == 0 else f"_{slug}_{output_index + 1}.png"
+
+def process_batch(ui_values):
+    preprocessor_name = ui_values.get('preprocessor_name')
+    if not preprocessor_name: raise ValueError("Please select a preprocessor.")
+    batch_values = dict(ui_values, input_type="Image")
+
+    def build_package(input_path):
+        with Image.open(input_path) as img:
+            return process_inputs(dict(batch_values, input_image=img.convert("RGB")))
+
+    def write_outputs(input_path, files):
+        written = []
+        for i in range(2):
+            source = next((f for f in files if f"_out{i+1}_" in os.path.basename(f)), None)
+            if source:
+                target = sidecar_path(input_path, get_control_map_suffix(preprocessor_name, i))
+                shutil.move(source, target)
+                written.append(target)
+        return written
+
+    yield from run_directory_batch(
+        ui_values['batch_input_path'], build_package, write_outputs,
+        expected_outputs=lambda input_path: [sidecar_path(input_path, get_control_map_suffix(preprocessor_name))],
+        possible_outputs=lambda input_path: [sidecar_path(input_path, get_control_map_suffix(preprocessor_name, i)) for i in range(2)],
+        overwrite=ui_values.get('batch_overwrite', False)
+    )
@@ -1,6 +1,8 @@
 import gradio as gr
-from .controlnet_auxiliary_preprocessor_logic import process_inputs, MAX_DYNAMIC_CONTROLS
+import traceback
+from .controlnet_auxiliary_preprocessor_logic import process_inputs, process_batch, MAX_DYNAMIC_CONTROLS
 from core.utils import create_simple_run_generation
+from core.shared_ui import create_batch_ui
 from core import node_info_manager
 
 UI_INFO = {
@@ -130,6 +132,8 @@ def create_ui():
                 components['param_combos_list'] = param_combos
                 components['param_checkboxes_list'] = param_checkboxes
 
+                create_batch_ui(components, "Control maps are written next to each image as `<name>_<preprocessor>.png`.")
+
             with gr.Column(scale=1):
                 components['output_gallery'] = gr.Gallery(label="Image Output", show_label=False, object_fit="contain", height=488, visible=True, interactive=False)
                 components['output_video'] = gr.Video(label="Video Output", show_label=False, height=488, visible=False, interactive=False)
@@ -172,7 +176,18 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
         show_api=False
     )
 
-run_generation = create_simple_run_generation(
+_run_single = create_simple_run_generation(
     process_inputs,
     lambda status, files: (status, files, files)
-)
\ No newline at end of file
+)
+
+def run_generation(ui_values):
+    if not ui_values.get('batch_input_path'):
+        yield from _run_single(ui_values)
+        return
+    try:
+        for status, recent_files in process_batch(ui_values):
+            yield (status, recent_files, recent_files)
+    except Exception as e:
+        traceback.print_exc()
+        yield (f"Error: {e}", [], [])
\ No newline at end of file
@@ -32,4 +32,4 @@ def process_inputs(ui_values):
     assembler = WorkflowAssembler(WORKFLOW_RECIPE_PATH, base_path=module_path)
     workflow = assembler.assemble(local_ui_values)
     
-    return workflow, None
\ No newline at end of file
+    return workflow, {"result_cache": True}
\ No newline at end of file
@@ -1,10 +1,8 @@
 import gradio as gr
-import os
 import traceback
-import time
 
 from .ernie_image_prompt_enhancer_logic import process_inputs
-from core.comfy_api import run_workflow_and_get_output
+from core.comfy_api import run_workflow_and_get_text_output
 
 UI_INFO = {
     "main_tab": "Tools",
@@ -79,31 +77,23 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
 
 def run_generation(ui_values):
     final_text_content = "Processing..."
-    expected_text_file_path = None
     try:
         yield ("Status: Preparing...", "Processing...")
         
         workflow, extra_data = process_inputs(ui_values)
-        expected_text_file_path = extra_data.get("expected_text_file_path")
         workflow_package = (workflow, extra_data)
         
-        for status, _ in run_workflow_and_get_output(workflow_package):
-            yield (status, "Processing...")
-        
-        yield ("Status: Reading enhanced prompt...", "Processing...")
-        
-        text_file_found = False
-        for _ in range(10): 
-            if expected_text_file_path and os.path.exists(expected_text_file_path):
-                text_file_found = True
-                break
-            time.sleep(0.5)
+        text_content = None
+        for status, text in run_workflow_and_get_text_output(workflow_package):
+            if text is not None:
+                text_content = text
+            else:
+                yield (status, "Processing...")
 
-        if text_file_found:
-            with open(expected_text_file_path, 'r', encoding='utf-8') as file:
-                final_text_content = file.read()
+        if text_content is not None:
+            final_text_content = text_content
         else:
-            final_text_content = "Error: Could not find the enhanced prompt file after processing."
+            final_text_content = "Error: Could not receive the enhanced prompt after processing."
 
     except Exception as e:
         import traceback
@@ -111,12 +101,5 @@ def run_generation(ui_values):
         final_text_content = f"An error occurred: {e}"
         yield (f"Error: {e}", final_text_content)
         return
-    finally:
-        if expected_text_file_path and os.path.exists(expected_text_file_path):
-            try:
-                os.remove(expected_text_file_path)
-                print(f"Cleaned up temporary prompt file: {expected_text_file_path}")
-            except Exception as e:
-                print(f"Error cleaning up temporary prompt file: {e}")
 
     yield ("Status: Loaded successfully!", final_text_content)
\ No newline at end of file
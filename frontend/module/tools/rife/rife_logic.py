@@ -7,8 +7,14 @@ from core.config import COMFYUI_INPUT_PATH
 from core.media_utils import get_media_metadata
 from core.workflow_utils import get_filename_prefix
 from core.utils import save_temp_video
+from core.backend_scheduler import get_capable_backend_urls
+from core.video_pipeline import (
+    MAX_SEGMENT_OUTPUT_FRAMES, plan_segment_seconds, should_segment,
+    split_video_segments, count_video_frames, remove_files
+)
 
 WORKFLOW_RECIPE_PATH = "rife_recipe.yaml"
+SEGMENT_RECIPE_PATH = "rife_segment_recipe.yaml"
 
 def extract_audio_ffmpeg(video_path):
     if not video_path:
@@ -32,6 +38,19 @@ def extract_audio_ffmpeg(video_path):
         print(f"An exception occurred during audio extraction: {e}")
         return None
 
+def build_slow_motion_audio_filter(multiplier):
+    audio_filter_parts = []
+    speed_factor = 1.0 / float(multiplier)
+    
+    while speed_factor < 0.5:
+        audio_filter_parts.append("atempo=0.5")
+        speed_factor *= 2.0
+    
+    if speed_factor < 1.0:
+        audio_filter_parts.append(f"atempo={speed_factor}")
+
+    return ",".join(audio_filter_parts)
+
 def merge_video_audio_ffmpeg(video_path, audio_path, multiplier, is_slow_motion):
     if not video_path or not audio_path:
         return video_path
@@ -41,17 +60,7 @@ def merge_video_audio_ffmpeg(video_path, audio_path, multiplier, is_slow_motion)
     command = ['ffmpeg', '-i', video_path, '-i', audio_path]
     
     if is_slow_motion:
-        audio_filter_parts = []
-        speed_factor = 1.0 / float(multiplier)
-        
-        while speed_factor < 0.5:
-            audio_filter_parts.append("atempo=0.5")
-            speed_factor *= 2.0
-        
-        if speed_factor < 1.0:
-            audio_filter_parts.append(f"atempo={speed_factor}")
-
-        audio_filter_str = ",".join(audio_filter_parts)
+        audio_filter_str = build_slow_motion_audio_filter(multiplier)
         print(f"[ffmpeg] Slow motion: Applying audio filter: '{audio_filter_str}'")
         command.extend(['-filter:a', audio_filter_str, '-c:v', 'copy', '-c:a', 'aac', '-shortest', '-y', output_file])
 
@@ -68,15 +77,13 @@ def merge_video_audio_ffmpeg(video_path, audio_path, multiplier, is_slow_motion)
         print(f"An exception occurred while running ffmpeg for merging: {e}")
         return video_path
 
-def process_inputs(ui_values):
+def _prepare_ui_values(ui_values):
     local_ui_values = ui_values.copy()
     
     input_video_path = local_ui_values.get('input_video')
     if not input_video_path:
         raise ValueError("Please upload an input video file.")
         
-    local_ui_values['input_video_filename'] = save_temp_video(input_video_path)
-    
     metadata = get_media_metadata(input_video_path, is_video=True)
     input_fps = metadata.get('fps', 24)
     multiplier = int(local_ui_values.get('multiplier', 2))
@@ -88,10 +95,59 @@ def process_inputs(ui_values):
         local_ui_values['output_fps'] = min(round(input_fps * multiplier), 240)
 
     local_ui_values['filename_prefix'] = get_filename_prefix()
-    
-    recipe_path = WORKFLOW_RECIPE_PATH
+    return local_ui_values, metadata
+
+def _assemble(recipe_path, ui_values):
     module_path = os.path.dirname(os.path.abspath(__file__))
     assembler = WorkflowAssembler(recipe_path, base_path=module_path)
-    workflow = assembler.assemble(local_ui_values)
+    return assembler.assemble(ui_values)
+
+def get_segment_backend_urls():
+    module_path = os.path.dirname(os.path.abspath(__file__))
+    recipe = WorkflowAssembler(SEGMENT_RECIPE_PATH, base_path=module_path).recipe
+    class_types = {details['class_type'] for details in recipe['nodes'].values()}
+    return get_capable_backend_urls(class_types)
+
+def process_segmented_inputs(ui_values, backend_count):
+    local_ui_values, metadata = _prepare_ui_values(ui_values)
+    multiplier = int(local_ui_values.get('multiplier', 2))
+    
+    segment_seconds = plan_segment_seconds(metadata.get('fps', 24), multiplier)
+    if not should_segment(metadata.get('duration', 0), backend_count, segment_seconds):
+        return None
+
+    segment_paths = split_video_segments(ui_values['input_video'], segment_seconds)
+    try:
+        segment_frames = [count_video_frames(path) for path in segment_paths]
+    except Exception as e:
+        print(f"Warning: Could not count segment frames ({e}). Processing the video as a whole.")
+        remove_files(segment_paths)
+        return None
+
+    if len(segment_paths) < 2 or max(segment_frames) * multiplier > MAX_SEGMENT_OUTPUT_FRAMES:
+        print("Info: Segments unsuitable for parallel interpolation. Processing the video as a whole.")
+        remove_files(segment_paths)
+        return None
+
+    base_prefix = local_ui_values['filename_prefix']
+    workflow_packages = []
+    for i, segment_path in enumerate(segment_paths):
+        segment_values = local_ui_values.copy()
+        segment_values['input_video_filename'] = os.path.basename(segment_path)
+        segment_values['filename_prefix'] = f"{base_prefix}_part{i:03d}"
+        recipe_path = WORKFLOW_RECIPE_PATH
+        if i < len(segment_paths) - 1:
+            segment_values['next_segment_filename'] = os.path.basename(segment_paths[i + 1])
+            segment_values['trim_length'] = segment_frames[i] * multiplier
+            recipe_path = SEGMENT_RECIPE_PATH
+        workflow_packages.append((_assemble(recipe_path, segment_values), None))
+
+    return workflow_packages, segment_paths
+
+def process_inputs(ui_values):
+    local_ui_values, _ = _prepare_ui_values(ui_values)
+    local_ui_values['input_video_filename'] = save_temp_video(local_ui_values['input_video'])
+    
+    workflow = _assemble(WORKFLOW_RECIPE_PATH, local_ui_values)
     
     return workflow, None
\ No newline at end of file
@@ -1,8 +1,12 @@
 import gradio as gr
-import os
 import tempfile
-from .rife_logic import process_inputs, extract_audio_ffmpeg, merge_video_audio_ffmpeg
+from .rife_logic import (
+    process_inputs, process_segmented_inputs, get_segment_backend_urls,
+    extract_audio_ffmpeg, merge_video_audio_ffmpeg, build_slow_motion_audio_filter
+)
 from core.comfy_api import run_workflow_and_get_output
+from core.backend_scheduler import run_workflows_across_backends
+from core.video_pipeline import start_background_task, concat_video_segments, remove_files
 
 UI_INFO = {
     "workflow_recipe": "rife_recipe.yaml",
@@ -61,28 +65,51 @@ def run_generation(ui_values):
     temp_audio_path = None
     silent_video_path = None
     final_video_path = None
+    audio_future = None
+    segment_paths = []
+    part_video_paths = []
+    is_slow_motion = "Slow Motion" in ui_values.get('fps_mode', "")
+    multiplier = int(ui_values.get('multiplier', 2))
     
     try:
         yield ("Status: Extracting audio...", None, gr.update())
-        temp_audio_path = extract_audio_ffmpeg(input_video_path)
+        audio_future = start_background_task(extract_audio_ffmpeg, input_video_path)
 
-        workflow, extra_data = process_inputs(ui_values)
-        workflow_package = (workflow, extra_data)
-        
-        for status, output_files in run_workflow_and_get_output(workflow_package):
-            if output_files and isinstance(output_files, list):
-                silent_video_path = output_files[0]
-            
-            yield (status, silent_video_path, gr.update())
+        backend_urls = get_segment_backend_urls()
+        segmented = process_segmented_inputs(ui_values, len(backend_urls)) if len(backend_urls) > 1 else None
+
+        if segmented:
+            workflow_packages, segment_paths = segmented
+            results = {}
+            for status, results in run_workflows_across_backends(workflow_packages, backend_urls):
+                yield (status, None, gr.update())
+
+            part_video_paths = [results[i][0] for i in sorted(results) if results[i]]
+            if len(part_video_paths) != len(workflow_packages):
+                raise RuntimeError(f"Only {len(part_video_paths)} of {len(workflow_packages)} segments were interpolated.")
 
-        if silent_video_path:
-            yield ("Status: Merging audio...", silent_video_path, gr.update())
-            is_slow_motion = "Slow Motion" in ui_values.get('fps_mode', "")
-            multiplier = int(ui_values.get('multiplier', 2))
-            final_video_path = merge_video_audio_ffmpeg(silent_video_path, temp_audio_path, multiplier, is_slow_motion)
+            temp_audio_path = audio_future.result()
+            yield ("Status: Joining segments...", None, gr.update())
+            audio_filter = build_slow_motion_audio_filter(multiplier) if is_slow_motion else None
+            final_video_path = concat_video_segments(part_video_paths, temp_audio_path, audio_filter)
             yield ("Status: Merging complete!", final_video_path, gr.update())
         else:
-             raise RuntimeError("RIFE workflow did not produce a video file.")
+            workflow, extra_data = process_inputs(ui_values)
+            workflow_package = (workflow, extra_data)
+            
+            for status, output_files in run_workflow_and_get_output(workflow_package):
+                if output_files and isinstance(output_files, list):
+                    silent_video_path = output_files[0]
+                
+                yield (status, silent_video_path, gr.update())
+
+            if silent_video_path:
+                temp_audio_path = audio_future.result()
+                yield ("Status: Merging audio...", silent_video_path, gr.update())
+                final_video_path = merge_video_audio_ffmpeg(silent_video_path, temp_audio_path, multiplier, is_slow_motion)
+                yield ("Status: Merging complete!", final_video_path, gr.update())
+            else:
+                 raise RuntimeError("RIFE workflow did not produce a video file.")
 
     except Exception as e:
         import traceback
@@ -95,14 +122,11 @@ def run_generation(ui_values):
 
     finally:
         print("RIFE generation task finished. Cleaning up temporary files...")
-        cleanup_paths = [temp_audio_path, silent_video_path]
-        for path in cleanup_paths:
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                    print(f"Removed temp file: {path}")
-                except Exception as e:
-                    print(f"Error removing temp file {path}: {e}")
+        if audio_future and temp_audio_path is None:
+            temp_audio_path = audio_future.result()
+        if silent_video_path == final_video_path:
+            silent_video_path = None
+        remove_files([temp_audio_path, silent_video_path] + segment_paths + part_video_paths)
 
         yield (
             "Status: Ready",
@@ -1,11 +1,15 @@
 import os
+import shutil
+from PIL import Image
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.media_utils import get_media_metadata
 from core.workflow_utils import get_filename_prefix
 from core.utils import save_temp_image, save_temp_video
+from core.batch_runner import run_directory_batch, sidecar_path
 
 WORKFLOW_RECIPE_PATH = "rmbg_recipe.yaml"
+SIDECAR_SUFFIXES = {"result": "_rmbg.png", "mask": "_mask.png"}
 
 def process_inputs(ui_values):
     local_ui_values = ui_values.copy()
@@ -36,4 +40,28 @@ def process_inputs(ui_values):
     else:
         workflow[assembler.node_map['rmbg_node']]['inputs']['image'] = [assembler.node_map['load_image'], 0]
         
-    return workflow, None
\ No newline at end of file
+    return workflow, None
+
+def process_batch(ui_values):
+    batch_values = dict(ui_values, input_type="Image")
+
+    def build_package(input_path):
+        with Image.open(input_path) as img:
+            img.load()
+            return process_inputs(dict(batch_values, input_image=img))
+
+    def write_outputs(input_path, files):
+        written = []
+        for marker, suffix in SIDECAR_SUFFIXES.items():
+            source = next((f for f in files if f"_{marker}_" in os.path.basename(f)), None)
+            if source:
+                target = sidecar_path(input_path, suffix)
+                shutil.move(source, target)
+                written.append(target)
+        return written
+
+    yield from run_directory_batch(
+        ui_values['batch_input_path'], build_package, write_outputs,
+        expected_outputs=lambda input_path: [sidecar_path(input_path, suffix) for suffix in SIDECAR_SUFFIXES.values()],
+        overwrite=ui_values.get('batch_overwrite', False)
+    )
@@ -1,6 +1,8 @@
 import gradio as gr
+import os
 import traceback
-from .rmbg_logic import process_inputs
+from .rmbg_logic import process_inputs, process_batch
+from core.shared_ui import create_batch_ui
 from core.comfy_api import run_workflow_and_get_output
 
 UI_INFO = {
@@ -41,6 +43,8 @@ def create_ui():
                     )
                     components['background_color'] = gr.ColorPicker(label="Background Color", value="#222222")
 
+                create_batch_ui(components, "The cut-out and mask are written next to each image as `<name>_rmbg.png` and `<name>_mask.png`.")
+
             with gr.Column(scale=1):
                 gr.Markdown("### Result")
                 components['output_gallery'] = gr.Gallery(label="Image Output", show_label=False, object_fit="contain", height=488, visible=True, interactive=False, columns=2, preview=True)
@@ -67,6 +71,15 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
     components['input_type'].change(fn=update_input_visibility, inputs=[components['input_type']], outputs=list(update_input_visibility("Image").keys()), show_api=False)
 
 def run_generation(ui_values):
+    if ui_values.get('batch_input_path'):
+        try:
+            for status, recent_files in process_batch(ui_values):
+                yield (status, recent_files or gr.update(), gr.update(), gr.update())
+        except Exception as e:
+            traceback.print_exc()
+            yield (f"Error: {e}", gr.update(), gr.update(), gr.update())
+        return
+
     final_files = []
     try:
         yield ("Status: Preparing...", gr.update(), gr.update(), gr.update())
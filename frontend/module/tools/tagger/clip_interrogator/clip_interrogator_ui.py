@@ -1,10 +1,9 @@
 import gradio as gr
-import os
 import traceback
-import time
 
-from .clip_interrogator_logic import process_inputs
-from core.comfy_api import run_workflow_and_get_output
+from .clip_interrogator_logic import process_inputs, process_batch
+from core.shared_ui import create_batch_ui
+from core.comfy_api import run_workflow_and_get_text_output
 
 UI_INFO = {
     "workflow_recipe": "clip_interrogator_recipe.yaml",
@@ -29,6 +28,8 @@ def create_ui():
                     label="Mode", choices=MODE_CHOICES, value="fast"
                 )
                 components['use_lowvram'] = gr.Checkbox(label="Use Low VRAM Mode", value=False)
+
+                create_batch_ui(components, "Each prompt is written next to its image as a `.caption` file.")
                 
                 components['run_button'] = gr.Button(UI_INFO["run_button_text"], variant="primary", elem_classes=["run-shortcut"])
             
@@ -46,44 +47,40 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
     pass
 
 def run_generation(ui_values):
+    if ui_values.get('batch_input_path'):
+        try:
+            for status, recent in process_batch(ui_values):
+                yield (status, "\n\n".join(recent) or "Processing...")
+        except Exception as e:
+            traceback.print_exc()
+            yield (f"Error: {e}", f"An error occurred: {e}")
+        return
+
     final_text_content = "Processing..."
-    expected_text_file_path = None
+    final_status = "Status: Loaded successfully!"
     try:
         yield ("Status: Preparing...", "Processing...")
         
         workflow, extra_data = process_inputs(ui_values)
-        expected_text_file_path = extra_data.get("expected_text_file_path")
         workflow_package = (workflow, extra_data)
         
-        for status, _ in run_workflow_and_get_output(workflow_package):
-            yield (status, "Processing...")
-        
-        yield ("Status: Reading generated prompt...", "Processing...")
-        
-        text_file_found = False
-        for _ in range(10): 
-            if expected_text_file_path and os.path.exists(expected_text_file_path):
-                text_file_found = True
-                break
-            time.sleep(0.5)
+        text_content = None
+        for status, text in run_workflow_and_get_text_output(workflow_package):
+            if text is not None:
+                text_content = text
+                final_status = status
+            else:
+                yield (status, "Processing...")
 
-        if text_file_found:
-            with open(expected_text_file_path, 'r', encoding='utf-8') as file:
-                final_text_content = file.read()
+        if text_content is not None:
+            final_text_content = text_content
         else:
-            final_text_content = "Error: Could not find the generated prompt file after processing."
+            final_text_content = "Error: Could not receive the generated prompt after processing."
 
     except Exception as e:
         traceback.print_exc()
         final_text_content = f"An error occurred: {e}"
         yield (f"Error: {e}", final_text_content)
         return
-    finally:
-        if expected_text_file_path and os.path.exists(expected_text_file_path):
-            try:
-                os.remove(expected_text_file_path)
-                print(f"Cleaned up temporary prompt file: {expected_text_file_path}")
-            except Exception as e:
-                print(f"Error cleaning up temporary prompt file: {e}")
 
-    yield ("Status: Loaded successfully!", final_text_content)
\ No newline at end of file
+    yield (final_status, final_text_content)
\ No newline at end of file
@@ -1,12 +1,15 @@
 import random
 import os
 import tempfile
+from PIL import Image
 
 from core.workflow_assembler import WorkflowAssembler
 from core.workflow_utils import get_filename_prefix
 from core.utils import save_temp_image
+from core.batch_runner import run_directory_batch, sidecar_path, write_text_sidecar
 
 WORKFLOW_RECIPE_PATH = "wd14_tagger_recipe.yaml"
+TAG_SIDECAR_SUFFIX = ".txt"
 
 def process_inputs(ui_values):
     local_ui_values = ui_values.copy()
@@ -30,4 +33,19 @@ def process_inputs(ui_values):
     assembler = WorkflowAssembler(WORKFLOW_RECIPE_PATH, base_path=module_path)
     workflow = assembler.assemble(local_ui_values)
     
-    return workflow, {"expected_text_file_path": expected_output_path}
\ No newline at end of file
+    return workflow, {"expected_text_file_path": expected_output_path, "result_cache": True}
+
+def process_batch(ui_values):
+    def build_package(input_path):
+        with Image.open(input_path) as img:
+            return process_inputs(dict(ui_values, input_image=img.convert("RGB")))
+
+    def write_outputs(input_path, text):
+        write_text_sidecar(sidecar_path(input_path, TAG_SIDECAR_SUFFIX), text)
+        return [f"{os.path.basename(input_path)}: {text}"]
+
+    yield from run_directory_batch(
+        ui_values['batch_input_path'], build_package, write_outputs,
+        expected_outputs=lambda input_path: [sidecar_path(input_path, TAG_SIDECAR_SUFFIX)],
+        output_kind="text", overwrite=ui_values.get('batch_overwrite', False)
+    )
@@ -1,14 +1,20 @@
 import os
 import tempfile
 import subprocess
+from PIL import Image
 from core.workflow_assembler import WorkflowAssembler
 from core.config import COMFYUI_INPUT_PATH
 from core.media_utils import get_media_metadata
 from core.workflow_utils import get_filename_prefix
 from core.utils import save_temp_image, save_temp_video
+from core.backend_scheduler import get_capable_backend_urls
+from core.video_pipeline import plan_segment_seconds, should_segment, split_video_segments, remove_files
+from core.tiling import plan_tiles, crop_tiles, scale_boxes, blend_tiles
 
 WORKFLOW_RECIPE_PATH = "Upscaler_Tensorrt_recipe.yaml"
 MAX_DIMENSION = 1920
+TILE_OVERLAP = 32
+RESIZE_PRESETS = {"HD": (1280, 720), "FHD": (1920, 1080), "2k": (2560, 1440), "4k": (3840, 2160)}
 
 def extract_audio_ffmpeg(video_path):
     if not video_path: return None
@@ -42,7 +48,7 @@ def merge_video_audio_ffmpeg(video_path, audio_path):
         print(f"An exception occurred while running ffmpeg for merging: {e}")
         return video_path
 
-def process_inputs(ui_values):
+def _prepare_ui_values(ui_values):
     local_ui_values = ui_values.copy()
     is_video = local_ui_values.get('input_type') == "Video"
     
@@ -71,15 +77,109 @@ def process_inputs(ui_values):
         local_ui_values['downscale_height'] = height
 
     if is_video:
-        local_ui_values['input_video_filename'] = save_temp_video(input_file_obj)
         local_ui_values['output_fps'] = metadata.get('fps', 24)
-    else:
-        local_ui_values['input_image_filename'] = save_temp_image(input_file_obj)
 
     local_ui_values['filename_prefix'] = get_filename_prefix()
-    
+    return local_ui_values, metadata
+
+def _assemble(ui_values):
     module_path = os.path.dirname(os.path.abspath(__file__))
     assembler = WorkflowAssembler(WORKFLOW_RECIPE_PATH, base_path=module_path)
-    workflow = assembler.assemble(local_ui_values)
+    return assembler.assemble(ui_values)
+
+def get_upscaler_backend_urls():
+    module_path = os.path.dirname(os.path.abspath(__file__))
+    recipe = WorkflowAssembler(WORKFLOW_RECIPE_PATH, base_path=module_path).recipe
+    class_types = {details['class_type'] for details in recipe['nodes'].values()}
+    return get_capable_backend_urls(class_types)
+
+def process_segmented_inputs(ui_values, backend_count):
+    if ui_values.get('input_type') != "Video":
+        return None
+
+    local_ui_values, metadata = _prepare_ui_values(ui_values)
+    segment_seconds = plan_segment_seconds(metadata.get('fps', 24))
+    if not should_segment(metadata.get('duration', 0), backend_count, segment_seconds):
+        return None
+
+    segment_paths = split_video_segments(ui_values['input_video'], segment_seconds)
+    if len(segment_paths) < 2:
+        remove_files(segment_paths)
+        return None
+
+    base_prefix = local_ui_values['filename_prefix']
+    workflow_packages = []
+    for i, segment_path in enumerate(segment_paths):
+        segment_values = local_ui_values.copy()
+        segment_values['input_video_filename'] = os.path.basename(segment_path)
+        segment_values['filename_prefix'] = f"{base_prefix}_part{i:03d}"
+        workflow_packages.append((_assemble(segment_values), None))
+
+    return workflow_packages, segment_paths
+
+def get_final_resolution(width, height, resize_to):
+    if resize_to in ("2x", "3x"):
+        factor = int(resize_to[0])
+        return width * factor, height * factor
+    if resize_to not in RESIZE_PRESETS:
+        return None
+    final_width, final_height = RESIZE_PRESETS[resize_to]
+    if width == height:
+        return final_height, final_height
+    if width < height:
+        return final_height, final_width
+    return final_width, final_height
+
+def process_tiled_inputs(ui_values):
+    input_image = ui_values.get('input_image')
+    if input_image is None:
+        raise ValueError("Please provide an input image.")
+
+    input_image = input_image.convert("RGB")
+    tile_size = min(int(ui_values.get('tile_size', 1024)), MAX_DIMENSION)
+    boxes = plan_tiles(input_image.width, input_image.height, tile_size, TILE_OVERLAP)
+    base_prefix = get_filename_prefix()
+
+    workflow_packages = []
+    for i, (tile, (_, _, w, h)) in enumerate(zip(crop_tiles(input_image, boxes), boxes)):
+        tile_values = ui_values.copy()
+        tile_values['input_image_filename'] = save_temp_image(tile)
+        tile_values['downscale_width'] = w
+        tile_values['downscale_height'] = h
+        tile_values['resize_to'] = "none"
+        tile_values['filename_prefix'] = f"{base_prefix}_tile{i:03d}"
+        workflow_packages.append((_assemble(tile_values), None))
+
+    print(f"[Tiled] {input_image.width}x{input_image.height} input split into {len(boxes)} tile(s) of up to {tile_size}px.")
+    return workflow_packages, boxes, input_image.size
+
+def blend_upscaled_tiles(boxes, input_size, tile_images, resize_to):
+    input_width, input_height = input_size
+    scale_x = tile_images[0].width / boxes[0][2]
+    scale_y = tile_images[0].height / boxes[0][3]
+    canvas_size = (round(input_width * scale_x), round(input_height * scale_y))
+    scaled_boxes = scale_boxes(boxes, scale_x, scale_y)
+    scaled_boxes = [
+        (x, y, min(w, canvas_size[0] - x), min(h, canvas_size[1] - y)) for x, y, w, h in scaled_boxes
+    ]
+
+    blended_image = blend_tiles(canvas_size, list(zip(scaled_boxes, tile_images)), round(TILE_OVERLAP * scale_x))
+
+    final_resolution = get_final_resolution(input_width, input_height, resize_to)
+    if final_resolution and final_resolution != blended_image.size:
+        blended_image = blended_image.resize(final_resolution, Image.LANCZOS)
+
+    output_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
+    blended_image.save(output_file, "PNG")
+    return output_file
+
+def process_inputs(ui_values):
+    local_ui_values, _ = _prepare_ui_values(ui_values)
+    if local_ui_values.get('input_type') == "Video":
+        local_ui_values['input_video_filename'] = save_temp_video(local_ui_values['input_video'])
+    else:
+        local_ui_values['input_image_filename'] = save_temp_image(local_ui_values['input_image'])
+    
+    workflow = _assemble(local_ui_values)
     
     return workflow, None
\ No newline at end of file
@@ -1,8 +1,13 @@
 import gradio as gr
-import os
 import tempfile
-from .ComfyUI_Upscaler_Tensorrt_logic import process_inputs, extract_audio_ffmpeg, merge_video_audio_ffmpeg
+from PIL import Image
+from .ComfyUI_Upscaler_Tensorrt_logic import (
+    process_inputs, process_segmented_inputs, process_tiled_inputs, get_upscaler_backend_urls,
+    blend_upscaled_tiles, extract_audio_ffmpeg, merge_video_audio_ffmpeg
+)
 from core.comfy_api import run_workflow_and_get_output
+from core.backend_scheduler import run_workflows_across_backends
+from core.video_pipeline import start_background_task, concat_video_segments, remove_files
 
 UI_INFO = {
     "main_tab": "Tools",
@@ -29,6 +34,12 @@ def create_ui():
                     info="Resize the final upscaled output to a specific size or multiplier."
                 )
                 components['precision'] = gr.State(value="fp16")
+                with gr.Row():
+                    components['tiled'] = gr.Checkbox(
+                        label="Tiled", value=False, scale=1,
+                        info="Upscale at full resolution in tiles spread over all available backends, instead of downscaling large inputs first."
+                    )
+                    components['tile_size'] = gr.Slider(label="Tile Size", minimum=256, maximum=1920, step=64, value=1024, scale=2)
                 
             with gr.Column(scale=1):
                 components['output_gallery'] = gr.Gallery(label="Image Output", show_label=False, object_fit="contain", height=508, visible=True, interactive=False)
@@ -48,6 +59,8 @@ def create_event_handlers(components: dict, all_components: dict, demo: gr.Block
         return {
             components['input_image']: gr.update(visible=is_image),
             components['input_video']: gr.update(visible=not is_image),
+            components['tiled']: gr.update(visible=is_image),
+            components['tile_size']: gr.update(visible=is_image),
             components['output_gallery']: gr.update(visible=is_image),
             components['output_video']: gr.update(visible=not is_image),
             components['resize_to']: gr.update(value=resize_to_default)
@@ -64,32 +77,75 @@ def run_generation(ui_values):
     temp_audio_path = None
     silent_output_path = None
     final_output_path = None
+    audio_future = None
+    segment_paths = []
+    part_video_paths = []
     
     try:
         yield ("Status: Preparing...", gr.update(), gr.update())
         
+        segmented = None
         if is_video:
             yield ("Status: Extracting audio...", gr.update(), gr.update())
-            temp_audio_path = extract_audio_ffmpeg(input_file_path)
+            audio_future = start_background_task(extract_audio_ffmpeg, input_file_path)
 
-        workflow, extra_data = process_inputs(ui_values)
-        workflow_package = (workflow, extra_data)
-        
-        for status, output_files in run_workflow_and_get_output(workflow_package):
-            if output_files and isinstance(output_files, list):
-                all_output_files = output_files
-            
-            gallery_update = all_output_files if not is_video and all_output_files else gr.update()
-            video_update = all_output_files[0] if is_video and all_output_files else gr.update()
-            yield (status, gallery_update, video_update)
-
-        if is_video and all_output_files:
-            silent_output_path = all_output_files[0]
-            yield ("Status: Merging audio...", gr.update(), silent_output_path)
-            final_output_path = merge_video_audio_ffmpeg(silent_output_path, temp_audio_path)
+            backend_urls = get_upscaler_backend_urls()
+            if len(backend_urls) > 1:
+                segmented = process_segmented_inputs(ui_values, len(backend_urls))
+
+        if not is_video and ui_values.get('tiled'):
+            workflow_packages, boxes, input_size = process_tiled_inputs(ui_values)
+            results = {}
+            for status, results in run_workflows_across_backends(workflow_packages, get_upscaler_backend_urls()):
+                yield (status, gr.update(), gr.update())
+
+            tile_paths = [results[i][0] for i in sorted(results) if results[i]]
+            if len(tile_paths) != len(workflow_packages):
+                remove_files(tile_paths)
+                raise RuntimeError(f"Only {len(tile_paths)} of {len(workflow_packages)} tiles were upscaled.")
+
+            yield (f"Status: Blending {len(tile_paths)} tiles...", gr.update(), gr.update())
+            tile_images = []
+            for path in tile_paths:
+                with Image.open(path) as img:
+                    tile_images.append(img.convert("RGB"))
+            remove_files(tile_paths)
+            final_output_path = blend_upscaled_tiles(boxes, input_size, tile_images, ui_values.get('resize_to', "none"))
+            all_output_files = [final_output_path]
+        elif segmented:
+            workflow_packages, segment_paths = segmented
+            results = {}
+            for status, results in run_workflows_across_backends(workflow_packages, backend_urls):
+                yield (status, gr.update(), gr.update())
+
+            part_video_paths = [results[i][0] for i in sorted(results) if results[i]]
+            if len(part_video_paths) != len(workflow_packages):
+                raise RuntimeError(f"Only {len(part_video_paths)} of {len(workflow_packages)} segments were upscaled.")
+
+            temp_audio_path = audio_future.result()
+            yield ("Status: Joining segments...", gr.update(), gr.update())
+            final_output_path = concat_video_segments(part_video_paths, temp_audio_path)
             yield ("Status: Merging complete!", gr.update(), final_output_path)
         else:
-            final_output_path = all_output_files[0] if all_output_files else None
+            workflow, extra_data = process_inputs(ui_values)
+            workflow_package = (workflow, extra_data)
+            
+            for status, output_files in run_workflow_and_get_output(workflow_package):
+                if output_files and isinstance(output_files, list):
+                    all_output_files = output_files
+                
+                gallery_update = all_output_files if not is_video and all_output_files else gr.update()
+                video_update = all_output_files[0] if is_video and all_output_files else gr.update()
+                yield (status, gallery_update, video_update)
+
+            if is_video and all_output_files:
+                silent_output_path = all_output_files[0]
+                temp_audio_path = audio_future.result()
+                yield ("Status: Merging audio...", gr.update(), silent_output_path)
+                final_output_path = merge_video_audio_ffmpeg(silent_output_path, temp_audio_path)
+                yield ("Status: Merging complete!", gr.update(), final_output_path)
+            else:
+                final_output_path = all_output_files[0] if all_output_files else None
 
     except Exception as e:
         import traceback
@@ -99,17 +155,12 @@ def run_generation(ui_values):
 
     finally:
         print("Upscale task finished. Cleaning up temporary files...")
-        cleanup_paths = [temp_audio_path]
+        if audio_future and temp_audio_path is None:
+            temp_audio_path = audio_future.result()
+        cleanup_paths = [temp_audio_path] + segment_paths + part_video_paths
         if is_video and temp_audio_path and silent_output_path != final_output_path:
             cleanup_paths.append(silent_output_path)
-            
-        for path in cleanup_paths:
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                    print(f"Removed temp file: {path}")
-                except Exception as e:
-                    print(f"Error removing temp file {path}: {e}")
+        remove_files(cleanup_paths)
 
         gallery_update = all_output_files if not is_video and all_output_files else gr.update()
         video_update = final_output_path if is_video else gr.update()
@@ -21,12 +21,12 @@ def process_inputs(ui_values, seed_override=None):
     start_image = local_ui_values.get('start_image')
     if start_image is None:
         raise ValueError("Start image is required.")
-    local_ui_values['start_image'] = save_temp_image(start_image)
 
     selected_ratio = local_ui_values.get('aspect_ratio', "16:9 (Widescreen)") 
     width, height = ASPECT_RATIO_PRESETS.get(selected_ratio, (896, 512))
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    local_ui_values['start_image'] = save_temp_image(start_image, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
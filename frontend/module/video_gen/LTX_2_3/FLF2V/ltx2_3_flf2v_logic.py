@@ -32,12 +32,10 @@ def process_inputs(ui_values, seed_override=None):
     start_image_pil = local_ui_values.get('start_image')
     if start_image_pil is None:
         raise ValueError("Start image is required.")
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
     
     end_image_pil = local_ui_values.get('end_image')
     if end_image_pil is None:
         raise ValueError("End image is required.")
-    local_ui_values['end_image'] = save_temp_image(end_image_pil)
     
     use_spatial = local_ui_values.get('use_spatial_upscaler', False)
     use_temporal = local_ui_values.get('use_temporal_upscaler', False)
@@ -58,6 +56,8 @@ def process_inputs(ui_values, seed_override=None):
     width, height = RESOLUTION_PRESETS[resolution][selected_ratio]
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
+    local_ui_values['end_image'] = save_temp_image(end_image_pil, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
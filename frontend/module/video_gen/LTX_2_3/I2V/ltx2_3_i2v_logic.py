@@ -45,14 +45,13 @@ def process_inputs(ui_values, seed_override=None):
         local_ui_values['upscaler_model_name'] = "ltx-2.3-temporal-upscaler-x2-1.0.safetensors"
     else:
         recipe_path = WORKFLOW_RECIPE_I2V
-
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
     
     resolution = local_ui_values.get('resolution', '480p')
     selected_ratio = local_ui_values.get('aspect_ratio', "16:9 (Widescreen)") 
     width, height = RESOLUTION_PRESETS[resolution][selected_ratio]
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
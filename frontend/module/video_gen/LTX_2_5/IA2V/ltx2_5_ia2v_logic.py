@@ -45,7 +45,6 @@ def process_inputs(ui_values, seed_override=None):
     start_image_pil = local_ui_values.get('start_image')
     if start_image_pil is None:
         raise ValueError("Start image is required for Image & Audio to Video generation.")
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
     
     audio_path = local_ui_values.get('audio_file')
     if audio_path is None:
@@ -94,6 +93,7 @@ def process_inputs(ui_values, seed_override=None):
     width, height = preset_dict.get(selected_ratio, (1344, 768))
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
@@ -27,7 +27,6 @@ def process_inputs(ui_values, seed_override=None):
     start_image_pil = local_ui_values.get('start_image')
     if start_image_pil is None:
         raise ValueError("Start image is required.")
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
     
     resolution_key = local_ui_values.get('resolution', '480p')
     aspect_ratio_key = local_ui_values.get('aspect_ratio', "16:9 (Landscape)")
@@ -52,6 +51,9 @@ def process_inputs(ui_values, seed_override=None):
         width_1080, height_1080 = RESOLUTION_PRESETS["1080p"][aspect_ratio_key]
         local_ui_values['width_1080p'] = width_1080
         local_ui_values['height_1080p'] = height_1080
+
+    final_width, final_height = RESOLUTION_PRESETS[resolution_key][aspect_ratio_key]
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(final_width, final_height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
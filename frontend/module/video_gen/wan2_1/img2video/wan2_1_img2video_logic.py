@@ -38,7 +38,6 @@ def process_inputs(ui_values, seed_override=None):
     start_image_pil = local_ui_values.get('start_image')
     if start_image_pil is None:
         raise ValueError("Start image is required.")
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
     
     resolution = local_ui_values.get('resolution', '720p')
     selected_ratio = local_ui_values.get('aspect_ratio', "16:9 (Landscape)")
@@ -46,6 +45,7 @@ def process_inputs(ui_values, seed_override=None):
     width, height = RESOLUTION_PRESETS.get(resolution, {}).get(selected_ratio, (1280, 720))
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
     
     local_ui_values['unet_name'] = MODEL_MAPPING.get(resolution, MODEL_MAPPING["720p"])
     
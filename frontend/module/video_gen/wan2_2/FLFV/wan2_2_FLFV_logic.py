@@ -41,8 +41,8 @@ def process_inputs(ui_values, seed_override=None):
 
     local_ui_values['width'] = width
     local_ui_values['height'] = height
-    local_ui_values['start_image'] = save_temp_image(start_image_pil)
-    local_ui_values['end_image'] = save_temp_image(end_image_pil)
+    local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
+    local_ui_values['end_image'] = save_temp_image(end_image_pil, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
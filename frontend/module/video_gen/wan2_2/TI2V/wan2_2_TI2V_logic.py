@@ -34,7 +34,6 @@ def process_inputs(ui_values, seed_override=None):
 
     if start_image_pil:
         recipe_path = WORKFLOW_RECIPE_I2V
-        local_ui_values['start_image'] = save_temp_image(start_image_pil)
     else:
         recipe_path = WORKFLOW_RECIPE_T2V
     
@@ -43,6 +42,8 @@ def process_inputs(ui_values, seed_override=None):
     width, height = RESOLUTION_PRESETS[resolution][selected_ratio]
     local_ui_values['width'] = width
     local_ui_values['height'] = height
+    if start_image_pil:
+        local_ui_values['start_image'] = save_temp_image(start_image_pil, target_size=(width, height))
     
     seed = seed_override if seed_override is not None else int(local_ui_values.get('seed', -1))
     local_ui_values['seed'] = handle_seed(seed)
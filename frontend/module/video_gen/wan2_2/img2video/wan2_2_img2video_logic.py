@@ -35,13 +35,12 @@ def process_inputs(params, seed_override=None):
     if start_image_pil is None:
         raise ValueError("Input image is required for Img2Video generation.")
 
-    local_params['start_image'] = save_temp_image(start_image_pil.copy())
-    
     resolution = local_params.get('resolution', '720p')
     selected_ratio = local_params.get('aspect_ratio', "16:9 (Landscape)")
     width, height = RESOLUTION_PRESETS[resolution][selected_ratio]
     local_params['width'] = width
     local_params['height'] = height
+    local_params['start_image'] = save_temp_image(start_image_pil.copy(), target_size=(width, height))
 
     seed = seed_override if seed_override is not None else int(local_params.get('seed', -1))
     local_params['seed'] = handle_seed(seed)
@@ -13,7 +13,7 @@ import base64
 from .wan2_2_img2video_logic import process_inputs
 from core.comfy_api import queue_prompt
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 from core.workflow_utils import get_filename_prefix
 
 def _download_and_save_image(image_url: str) -> Image.Image:
@@ -120,7 +120,7 @@ def VideoGen_img2video(
                             
                             absolute_path = os.path.join(COMFYUI_OUTPUT_PATH, subfolder, filename)
                             
-                            base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+                            base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
                             final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
                             
                             print(f"[MCP Img2Video] Generation complete. Returning URL: {final_url}")
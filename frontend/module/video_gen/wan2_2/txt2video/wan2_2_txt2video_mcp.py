@@ -10,7 +10,7 @@ import websocket
 from .wan2_2_txt2video_logic import process_inputs
 from core.comfy_api import queue_prompt
 from core.backend_manager import backend_manager
-from core.config import SERVER_PORT, GRADIO_SERVER_NAME, COMFYUI_OUTPUT_PATH
+from core.config import PUBLIC_SERVER_PORT, PUBLIC_SERVER_NAME, COMFYUI_OUTPUT_PATH
 
 
 def VideoGen_txt2video(
@@ -90,7 +90,7 @@ def VideoGen_txt2video(
                             
                             absolute_path = os.path.join(COMFYUI_OUTPUT_PATH, subfolder, filename)
                             
-                            base_url = f"http://{GRADIO_SERVER_NAME}:{SERVER_PORT}"
+                            base_url = f"http://{PUBLIC_SERVER_NAME}:{PUBLIC_SERVER_PORT}"
                             final_url = f"{base_url}/gradio_api/file={urllib.parse.quote(absolute_path)}"
                             
                             print(f"[MCP T2V Tool] Generation complete. Returning URL: {final_url}")
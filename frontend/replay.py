@@ -0,0 +1,201 @@
+"""
+Replays prompts recorded by the workflow journal against a set of ComfyUI backends.
+
+    python -m replay --last 60 --speedup 4
+    python -m replay --since 2026-10-19T09:00 --until 2026-10-19T10:00 --backend http://127.0.0.1:8188 --backend http://127.0.0.1:8189
+
+Prompts are re-submitted straight to /prompt with their recorded workflow and extra_data, spaced as
+they were originally divided by --speedup, and spread round-robin over the backends (the configured
+comfyui_backends by default). Completion is read from /history. The report compares the replayed
+end-to-end latency with the recorded queue wait + execution time. Input files referenced by the
+workflows (LoadImage and friends) must exist in each target backend's input directory.
+"""
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from core.config import COMFYUI_BACKENDS, WORKFLOW_JOURNAL_DIR
+from core import workflow_journal
+
+HISTORY_POLL_INTERVAL_SECONDS = 0.5
+
+_print_lock = threading.Lock()
+
+
+def _log(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+def _parse_time(value):
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def load_window(journal_dir, since=None, until=None):
+    records = [
+        record for record in workflow_journal.read_records(journal_dir)
+        if (since is None or record["submitted_at"] >= since) and (until is None or record["submitted_at"] <= until)
+    ]
+    records.sort(key=lambda record: record["submitted_at"])
+    return records
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+def _latency_summary(values):
+    return {"p50": _percentile(values, 0.5), "p95": _percentile(values, 0.95), "max": _percentile(values, 1.0)}
+
+
+def submit(backend_url, record):
+    payload = {"prompt": record["workflow"], "client_id": uuid.uuid4().hex}
+    payload.update(record.get("extra_data") or {})
+    response = requests.post(f"{backend_url}/prompt", json=payload, timeout=30)
+    response.raise_for_status()
+    return response.json()["prompt_id"]
+
+
+def _poll_history(pending, results, lock, stop, abandon):
+    """Marks submitted prompts finished once they show up in their backend's /history."""
+    while not abandon.is_set() and (not stop.is_set() or pending):
+        with lock:
+            items = list(pending.items())
+        for prompt_id, (backend_url, submitted, index) in items:
+            try:
+                response = requests.get(f"{backend_url}/history/{prompt_id}", timeout=10)
+                response.raise_for_status()
+                entry = response.json().get(prompt_id)
+            except (requests.exceptions.RequestException, ValueError):
+                continue
+            if not entry:
+                continue
+            status = (entry.get("status") or {}).get("status_str", "success")
+            with lock:
+                pending.pop(prompt_id, None)
+                results[index].update(status=status, latency_seconds=time.monotonic() - submitted)
+        time.sleep(HISTORY_POLL_INTERVAL_SECONDS)
+
+
+def replay(records, backend_urls, speedup=1.0, timeout=600.0, dry_run=False):
+    if not records:
+        _log("[Replay] No journal records in the selected window.")
+        return {"total": 0}
+
+    first_at = records[0]["submitted_at"]
+    span = records[-1]["submitted_at"] - first_at
+    _log(f"[Replay] {len(records)} prompt(s) spanning {span:.1f}s, replayed over ~{span / speedup:.1f}s "
+         f"across {len(backend_urls)} backend(s) at {speedup:g}x.")
+
+    results = [
+        {"recorded_prompt_id": r["prompt_id"], "module": r.get("module"), "recorded_backend": r.get("backend_name"),
+         "recorded_seconds": (r.get("queue_wait_seconds") or 0) + (r.get("execution_seconds") or 0),
+         "recorded_status": r.get("status"), "status": "not_submitted"}
+        for r in records
+    ]
+    if dry_run:
+        return {"total": len(records), "dry_run": True, "prompts": results}
+
+    pending, lock, stop, abandon = {}, threading.Lock(), threading.Event(), threading.Event()
+    poller = threading.Thread(target=_poll_history, args=(pending, results, lock, stop, abandon), daemon=True)
+    poller.start()
+    backends = itertools.cycle(backend_urls)
+    started = time.monotonic()
+
+    def send(index, record, backend_url):
+        try:
+            prompt_id = submit(backend_url, record)
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            results[index].update(status="submit_failed", error=str(e), backend=backend_url)
+            _log(f"[Replay] Submitting {record['prompt_id']} to {backend_url} failed: {e}")
+            return
+        results[index].update(status="submitted", backend=backend_url, prompt_id=prompt_id)
+        with lock:
+            pending[prompt_id] = (backend_url, time.monotonic(), index)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for index, record in enumerate(records):
+            delay = started + (record["submitted_at"] - first_at) / speedup - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, index, record, next(backends))
+
+    stop.set()
+    poller.join(timeout=timeout)
+    abandon.set()
+    with lock:
+        for _, _, index in pending.values():
+            results[index]["status"] = "timed_out"
+        pending.clear()
+    elapsed = time.monotonic() - started
+
+    finished = [r for r in results if "latency_seconds" in r]
+    report = {
+        "total": len(records),
+        "speedup": speedup,
+        "backends": backend_urls,
+        "elapsed_seconds": round(elapsed, 3),
+        "statuses": {status: sum(1 for r in results if r["status"] == status) for status in {r["status"] for r in results}},
+        "replayed_latency": _latency_summary([r["latency_seconds"] for r in finished]),
+        "recorded_latency": _latency_summary([r["recorded_seconds"] for r in finished]),
+        "prompts": results,
+    }
+    _log(f"[Replay] {len(finished)}/{len(records)} finished in {elapsed:.1f}s. "
+         f"Latency p50/p95: replayed {report['replayed_latency']['p50']}/{report['replayed_latency']['p95']}s, "
+         f"recorded {report['recorded_latency']['p50']}/{report['recorded_latency']['p95']}s.")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m replay", description="Re-submit journaled prompts to ComfyUI backends.")
+    parser.add_argument("--journal-dir", default=WORKFLOW_JOURNAL_DIR, help="Directory of journal segments.")
+    parser.add_argument("--since", help="Start of the window (ISO time or epoch seconds).")
+    parser.add_argument("--until", help="End of the window (ISO time or epoch seconds).")
+    parser.add_argument("--last", type=float, help="Window of the last N minutes of the journal instead of --since.")
+    parser.add_argument("--limit", type=int, help="Replay at most this many prompts.")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Compress the recorded spacing by this factor (default: 1).")
+    parser.add_argument("--backend", action="append", help="Backend URL to replay against; repeat for several. Defaults to comfyui_backends.")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds to wait for outstanding prompts after the last submit.")
+    parser.add_argument("--report", help="Write the JSON report here.")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be replayed.")
+    args = parser.parse_args(argv)
+
+    since = _parse_time(args.since) if args.since else None
+    until = _parse_time(args.until) if args.until else None
+    records = load_window(args.journal_dir, since, until)
+    if args.last is not None and records:
+        cutoff = records[-1]["submitted_at"] - args.last * 60
+        records = [record for record in records if record["submitted_at"] >= cutoff]
+    if args.limit:
+        records = records[:args.limit]
+
+    backend_urls = [url.rstrip("/") for url in (args.backend or list(COMFYUI_BACKENDS.values()))]
+    report = replay(records, backend_urls, max(args.speedup, 1e-6), args.timeout, args.dry_run)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        _log(f"[Replay] Report: {args.report}")
+    elif args.dry_run:
+        for prompt in report.get("prompts", []):
+            print(json.dumps(prompt, ensure_ascii=False))
+    failed = sum(1 for r in report.get("prompts", []) if r["status"] in ("submit_failed", "timed_out", "error"))
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())